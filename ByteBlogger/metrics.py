@@ -0,0 +1,424 @@
+import atexit
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic, perf_counter, sleep
+
+from asgiref.sync import (iscoroutinefunction, markcoroutinefunction,
+                          sync_to_async)
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+# Upper bounds in seconds; +Inf is implicit
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                    10.0)
+
+METRICS = {
+    "http_requests_total": ("counter", "Requests by route, method and status."),
+    "http_request_duration_seconds":
+    ("histogram", "Wall time spent handling the request."),
+    "http_request_db_seconds":
+    ("histogram", "Time spent executing SQL per request."),
+    "http_request_db_queries_total": ("counter", "SQL queries executed."),
+    "http_request_serialize_seconds":
+    ("histogram", "Time spent serializing responses per request."),
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_dir():
+    return getattr(settings, "METRICS_DIR", None)
+
+
+def flush_seconds():
+    return getattr(settings, "METRICS_FLUSH_SECONDS", 5)
+
+
+# REGISTRY
+class Registry:
+    """
+    In-process counters and histograms keyed by (name, sorted labels).
+    Histograms hold per-bucket counts plus the sum and count.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        index = next((i for i, bound in enumerate(DURATION_BUCKETS)
+                      if value <= bound), len(DURATION_BUCKETS))
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = {
+                    "buckets": [0] * (len(DURATION_BUCKETS) + 1),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def snapshot(self):
+        """
+        JSON-friendly copy, as written to the shared directory.
+        """
+        with self._lock:
+            return {
+                "counters": [[name, dict(labels), value]
+                             for (name, labels), value in self.counters.items()],
+                "histograms": [[name, dict(labels), dict(series,
+                                                         buckets=list(
+                                                             series["buckets"]))]
+                               for (name, labels), series in
+                               self.histograms.items()],
+            }
+
+
+registry = Registry()
+
+
+# PER-WORKER AGGREGATION
+_worker = {"pid": None, "file": None, "flushed": 0.0}
+
+
+def _worker_file():
+    """
+    One file per worker process. Forked workers start with a fresh
+    registry and file, so nothing is counted twice.
+    """
+    global registry
+    if _worker["pid"] != os.getpid():
+        if _worker["pid"] is not None:
+            registry = Registry()
+        _worker.update(pid=os.getpid(),
+                       file=f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json",
+                       flushed=0.0)
+    return _worker["file"]
+
+
+def flush(force=False):
+    """
+    Writes this worker's snapshot to METRICS_DIR, at most once per
+    METRICS_FLUSH_SECONDS unless forced. Runs on the flusher thread and
+    for /metrics, never on the request path.
+    """
+    directory = metrics_dir()
+    if not directory:
+        return
+
+    filename = _worker_file()
+    now = monotonic()
+    if not force and now - _worker["flushed"] < flush_seconds():
+        return
+    _worker["flushed"] = now
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, filename)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(tmp_path, path)  # Readers never see a partial file
+
+
+_flusher = {"pid": None}
+
+
+def _flush_forever():
+    while True:
+        sleep(flush_seconds())
+        try:
+            flush(force=True)
+        except OSError:
+            pass  # Directory unavailable; try again next period
+
+
+def start_flusher():
+    """
+    Starts this process's flusher thread once METRICS_DIR is set. Checked
+    per request because forked workers do not inherit threads.
+    """
+    if _flusher["pid"] == os.getpid() or not metrics_dir():
+        return
+    _flusher["pid"] = os.getpid()
+    threading.Thread(target=_flush_forever,
+                     name="metrics-flush",
+                     daemon=True).start()
+
+
+@atexit.register
+def _flush_at_exit():
+    if _flusher["pid"] == os.getpid():
+        flush(force=True)
+
+
+def collect():
+    """
+    Snapshots for this worker (live) and every other worker in METRICS_DIR.
+    Files of exited workers are kept so counters never go backwards.
+    """
+    own_file = _worker_file()
+    snapshots = [registry.snapshot()]
+
+    directory = metrics_dir()
+    if directory and os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            if not filename.endswith(".json") or filename == own_file:
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Worker mid-write or file removed
+
+    return snapshots
+
+
+def merge(snapshots):
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(sorted(labels.items())))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, series in snapshot["histograms"]:
+            key = (name, tuple(sorted(labels.items())))
+            total = histograms.setdefault(key, {
+                "buckets": [0] * (len(DURATION_BUCKETS) + 1),
+                "sum": 0.0,
+                "count": 0,
+            })
+            total["buckets"] = [
+                a + b for a, b in zip(total["buckets"], series["buckets"])
+            ]
+            total["sum"] += series["sum"]
+            total["count"] += series["count"]
+    return counters, histograms
+
+
+# PROMETHEUS TEXT FORMAT
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"',
+                                                    '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def render(snapshots):
+    counters, histograms = merge(snapshots)
+    lines = []
+
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+        if kind == "counter":
+            for (series_name, labels), value in sorted(counters.items()):
+                if series_name == name:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+            continue
+
+        for (series_name, labels), series in sorted(histograms.items()):
+            if series_name != name:
+                continue
+            cumulative = 0
+            bounds = [str(b) for b in DURATION_BUCKETS] + ["+Inf"]
+            for bound, count in zip(bounds, series["buckets"]):
+                cumulative += count
+                lines.append(f"{name}_bucket"
+                             f"{_labels(labels + (('le', bound),))} "
+                             f"{cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {series['sum']}")
+            lines.append(f"{name}_count{_labels(labels)} {series['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+# REQUEST TIMING
+# Timings of the request being handled; a ContextVar so the database and
+# serializer hooks find it from sync_to_async threads too. Concurrent
+# requests sharing a thread (and its connection) each see their own.
+_timings = ContextVar("request_timings", default=None)
+
+
+def _time_query(execute, sql, params, many, context):
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings["db"] += perf_counter() - start
+        timings["queries"] += 1
+
+
+def _install_query_timer(connection, **kwargs):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+def install_query_timer():
+    """
+    Adds _time_query, once and for good, to this thread's open connections.
+    Connections opened later get it from connection_created. It only times
+    queries made while a request's timings are set.
+    """
+    for connection in connections.all(initialized_only=True):
+        _install_query_timer(connection)
+
+
+connection_created.connect(_install_query_timer,
+                           dispatch_uid="metrics_query_timer")
+
+
+@contextmanager
+def serializing():
+    """
+    Counts the block as serializer time for the current request. Nested
+    blocks are only counted once.
+    """
+    timings = _timings.get()
+    if timings is None or timings["serialize_depth"]:
+        yield
+        return
+
+    timings["serialize_depth"] += 1
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings["serialize"] += perf_counter() - start
+        timings["serialize_depth"] -= 1
+
+
+class TimedSerializerMixin:
+    """
+    Counts .data, where DRF runs to_representation, as serializer time.
+    Mixed into the project's serializers rather than patched into DRF.
+    """
+
+    @property
+    def data(self):
+        with serializing():
+            return super().data
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None else "unmatched"
+
+
+def server_timing(timings, total):
+    return (f'total;dur={total * 1000:.2f}, '
+            f'db;dur={timings["db"] * 1000:.2f};'
+            f'desc="{timings["queries"]} queries", '
+            f'serialize;dur={timings["serialize"] * 1000:.2f}')
+
+
+class MetricsMiddleware:
+    """
+    Records wall time, SQL time and query count, and serializer time per
+    route name. Adds a Server-Timing header and feeds the /metrics
+    histograms. SQL run inside a serializer counts towards both.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        # The async ORM runs on sync_to_async's shared thread; its open
+        # connections are hooked on the first async request
+        self.executor_hooked = False
+
+    def _start(self):
+        timings = {
+            "db": 0.0,
+            "queries": 0,
+            "serialize": 0.0,
+            "serialize_depth": 0
+        }
+        return timings, _timings.set(timings), perf_counter()
+
+    def _finish(self, request, response, timings, start):
+        total = perf_counter() - start
+        route = _route(request)
+
+        registry.inc("http_requests_total", {
+            "route": route,
+            "method": request.method,
+            "status": response.status_code
+        })
+        registry.observe("http_request_duration_seconds", {"route": route},
+                         total)
+        registry.observe("http_request_db_seconds", {"route": route},
+                         timings["db"])
+        registry.inc("http_request_db_queries_total", {"route": route},
+                     timings["queries"])
+        registry.observe("http_request_serialize_seconds", {"route": route},
+                         timings["serialize"])
+        start_flusher()
+
+        response["Server-Timing"] = server_timing(timings, total)
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        install_query_timer()  # Connections opened before the first request
+        timings, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._finish(request, response, timings, start)
+
+    async def __acall__(self, request):
+        if not self.executor_hooked:
+            await sync_to_async(install_query_timer)()
+            self.executor_hooked = True
+
+        timings, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._finish(request, response, timings, start)
+
+
+# ENDPOINT
+class MetricsView(APIView):
+    """
+    Route: /metrics
+    Request metrics in Prometheus text format, summed over every worker
+    sharing METRICS_DIR (staff only).
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        flush(force=True)
+        return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
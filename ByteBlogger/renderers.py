@@ -0,0 +1,80 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Declared in requirements; DRF's encoder otherwise
+    orjson = None
+
+# Same output as DRF's defaults: UTF-8, compact, "Z" for UTC, non-string
+# keys (srcset widths) turned into strings
+ORJSON_OPTIONS = ((orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+                  if orjson else 0)
+
+# DRF escapes these so JSON stays valid inside <script> tags
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9",
+                                                   b"\\u2029"))
+
+# Decimal, lazy strings, querysets, timedelta...: whatever DRF's encoder
+# knows beyond orjson's native datetime/UUID support
+_default = JSONEncoder().default
+
+
+def json_dumps(data):
+    """
+    Encodes data to UTF-8 JSON bytes like DRF's JSONRenderer, using orjson
+    when installed.
+    """
+    if orjson is None:
+        return JSONRenderer().render(data)
+
+    try:
+        content = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        # e.g. integers past 64 bits; the stdlib encoder copes or raises
+        return JSONRenderer().render(data)
+
+    for raw, escaped in LINE_SEPARATORS:
+        if raw in content:
+            content = content.replace(raw, escaped)
+    return content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson. Falls back to the stdlib encoder when
+    orjson is missing or the client asks for indented output.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return json_dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson, which like DRF's strict mode rejects
+    NaN and Infinity.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            raw = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                raw = raw.decode(encoding)
+            return orjson.loads(raw)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,194 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+PRIMARY = "default"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+PIN_COOKIE = "db_pin"
+
+# Set per request by ReplicaMiddleware; a ContextVar so it follows the
+# request into sync_to_async threads and async views alike.
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_aliases():
+    return getattr(settings, "REPLICA_DATABASES", [])
+
+
+def pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """
+    Routes reads in the block to a replica (or, with enabled=False, to the
+    primary). Writes always go to the primary.
+    """
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+# ROUTER
+class ReplicaRouter:
+    """
+    Sends reads to a random REPLICA_DATABASES alias inside use_replica(),
+    and everything else to the primary. All aliases hold the same data, so
+    relations across them are allowed.
+    """
+
+    def db_for_read(self, model, **hints):
+        aliases = replica_aliases()
+        if aliases and _use_replica.get():
+            return random.choice(aliases)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+# READ-YOUR-WRITES PINNING
+def _pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def _token_user_id(request):
+    """
+    User id from a valid bearer token, without touching the database.
+    """
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    raw_token = authenticator.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+
+    try:
+        validated_token = authenticator.get_validated_token(raw_token)
+    except InvalidToken:
+        return None
+    return validated_token.get(api_settings.USER_ID_CLAIM)
+
+
+def _pinned_by_cookie(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def is_pinned(request):
+    if _pinned_by_cookie(request):
+        return True
+
+    user_id = _token_user_id(request)
+    return user_id is not None and cache.get(_pin_key(user_id)) is not None
+
+
+async def ais_pinned(request):
+    if _pinned_by_cookie(request):
+        return True
+
+    user_id = _token_user_id(request)
+    return (user_id is not None
+            and await cache.aget(_pin_key(user_id)) is not None)
+
+
+def _set_pin_cookie(request, response, seconds):
+    """
+    Sets the cookie and returns the user id to mark in the cache, if any.
+    """
+    response.set_cookie(PIN_COOKIE,
+                        str(time.time() + seconds),
+                        max_age=seconds,
+                        httponly=True,
+                        samesite="Lax")
+
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+def pin_to_primary(request, response):
+    """
+    Keeps the client on the primary for REPLICA_PIN_SECONDS after a write:
+    a cookie for browsers, plus a cache marker per user for API clients
+    that drop cookies.
+    """
+    seconds = pin_seconds()
+    if seconds <= 0:
+        return
+
+    user_id = _set_pin_cookie(request, response, seconds)
+    if user_id is not None:
+        cache.set(_pin_key(user_id), True, seconds)
+
+
+async def apin_to_primary(request, response):
+    seconds = pin_seconds()
+    if seconds <= 0:
+        return
+
+    user_id = _set_pin_cookie(request, response, seconds)
+    if user_id is not None:
+        await cache.aset(_pin_key(user_id), True, seconds)
+
+
+class ReplicaMiddleware:
+    """
+    Serves safe-method requests from a replica unless the client wrote
+    within the pin window. Successful writes pin the client to the primary.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _may_use_replica(self, request):
+        return bool(replica_aliases()) and request.method in SAFE_METHODS
+
+    def _should_pin(self, request, response):
+        # request.user is the DRF-authenticated user by now
+        return (request.method not in SAFE_METHODS
+                and response.status_code < 400)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        replica = self._may_use_replica(request) and not is_pinned(request)
+        with use_replica(replica):
+            response = self.get_response(request)
+
+        if self._should_pin(request, response):
+            pin_to_primary(request, response)
+        return response
+
+    async def __acall__(self, request):
+        replica = (self._may_use_replica(request)
+                   and not await ais_pinned(request))
+        with use_replica(replica):
+            response = await self.get_response(request)
+
+        if self._should_pin(request, response):
+            await apin_to_primary(request, response)
+        return response
@@ -4,5 +4,7 @@ ENV = os.getenv("ENV", "development").lower()
 
 if ENV == "production":
     from .prod import *
+elif ENV == "test":
+    from .test import *
 else:
     from .dev import *
\ No newline at end of file
@@ -12,6 +12,9 @@ load_dotenv(BASE_DIR / ".env")
 # SECRET KEY
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-insecure-key")
 
+# Key for OTP hashing; falls back to a key derived from SECRET_KEY
+OTP_HMAC_KEY = os.getenv("OTP_HMAC_KEY")
+
 # INSTALLED APPS
 INSTALLED_APPS = [
     "jazzmin",
@@ -27,16 +30,19 @@ INSTALLED_APPS = [
     "corsheaders",
     "users",
     "blog",
+    "jobs",
 ]
 
 # MIDDLEWARE
 MIDDLEWARE = [
+    "ByteBlogger.metrics.MetricsMiddleware",  # First, to time everything
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "ByteBlogger.replicas.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -63,6 +69,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "ByteBlogger.wsgi.application"
 
+# Native async blog/profile read views; asgi.py turns this on by default
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "False") == "True"
+
 # PASSWORD VALIDATORS
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -100,19 +109,95 @@ if (BASE_DIR / "static").exists():
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# IMAGE DERIVATIVES
+# Resized copies of uploads, generated in a process pool (0 = inline)
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+IMAGE_DERIVATIVE_FORMATS = ("webp", "jpeg")
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", 2))
+
+# READ REPLICAS
+# Aliases in DATABASES that serve safe-method reads (see prod.py). Clients
+# stay on the primary for REPLICA_PIN_SECONDS after a write.
+DATABASE_ROUTERS = ["ByteBlogger.replicas.ReplicaRouter"]
+REPLICA_DATABASES = []
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+# METRICS
+# Workers write their request metrics here so /metrics can sum them;
+# unset to report only the worker that answers the scrape.
+METRICS_DIR = os.getenv("METRICS_DIR") or None
+METRICS_FLUSH_SECONDS = 5
+
 # DEFAULT FIELD TYPE
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # AUTH
 AUTH_USER_MODEL = "users.User"
 
+# CACHE
+# Local memory by default; prod.py switches to Redis.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "byteblogger",
+    }
+}
+
+BLOG_DETAIL_CACHE_TIMEOUT = 60 * 60
+# Feeds are re-rendered when a post in them changes; see blog/feeds.py
+BLOG_FEED_SIZE = 20
+BLOG_FEED_CACHE_TIMEOUT = 24 * 60 * 60
+# Public origin for feed links; unset, feeds use the request's host
+SITE_URL = os.getenv("SITE_URL") or None
+ROLES_CACHE_TIMEOUT = 60 * 60
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# Embed group names in JWTs so permission checks skip the role cache
+JWT_ROLES_CLAIM = os.getenv("JWT_ROLES_CLAIM", "False") == "True"
+
+# BACKGROUND JOBS
+# Run workers with `python manage.py run_workers`
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 10
+# run_workers purges finished jobs older than these
+JOB_RETENTION_DAYS = 7
+JOB_FAILED_RETENTION_DAYS = 30
+
+# TOKEN BLACKLIST
+# Skip the blacklist query on filter misses. Only safe with a cache shared
+# by every worker process (not LocMemCache).
+TOKEN_BLACKLIST_FAST_NEGATIVES = os.getenv("TOKEN_BLACKLIST_FAST_NEGATIVES",
+                                           "False") == "True"
+TOKEN_BLACKLIST_BLOOM_CAPACITY = 100_000
+# How often each process picks up the filter rebuilt by the purge job
+TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS = 30
+
+# RATE LIMITS
+# scope: (requests, window seconds); counters live in the cache
+RATE_LIMITS = {
+    "login": (10, 60),
+    "otp-verify": (5, 60),
+    "otp-resend": (3, 60),
+    "comment": (10, 60),
+}
+
 # REST FRAMEWORK
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
+    ],
+    # orjson-backed JSON when installed (pip install orjson), else stdlib
+    "DEFAULT_RENDERER_CLASSES": [
+        "ByteBlogger.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "ByteBlogger.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
 
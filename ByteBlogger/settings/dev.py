@@ -4,6 +4,9 @@ import os
 DEBUG = True
 ALLOWED_HOSTS = []
 
+# Seeding and load-test commands; never installed in production
+INSTALLED_APPS = [*INSTALLED_APPS, "benchmarks"]
+
 CORS_ALLOW_ALL_ORIGINS = True
 
 DATABASES = {
@@ -27,6 +27,31 @@ DATABASES = {
     }
 }
 
+# Read replicas: comma-separated hosts sharing the primary's credentials
+for index, host in enumerate(
+        filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), 1):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != "default"]
+
+# Cache: rate limits, OTP cooldowns and cache versions must be shared by
+# every worker, and the limiters rely on an atomic incr, so production
+# uses Redis rather than the per-process LocMemCache.
+REDIS_URL = os.getenv("REDIS_URL")
+if not REDIS_URL:
+    raise ValueError("REDIS_URL must be set in production")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+}
+
 # Security Hardening
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
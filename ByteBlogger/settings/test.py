@@ -0,0 +1,23 @@
+from .dev import *
+
+# Separate SQLite files stand in for the primary and a read replica, so
+# tests can tell which one served a query. manage.py test selects these
+# settings unless ENV says otherwise.
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "TEST": {"NAME": BASE_DIR / "test_primary.sqlite3"},
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "TEST": {"NAME": BASE_DIR / "test_replica.sqlite3"},
+    },
+}
+
+REPLICA_DATABASES = ["replica"]
+
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+IMAGE_WORKERS = 0
@@ -0,0 +1,175 @@
+import json
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Statements worth planning; INSERTs and transaction control never scan
+PLANNED_STATEMENTS = ("SELECT", "UPDATE", "DELETE")
+
+# Django aliases subquery tables ("blog_comment" U0); plans name the alias
+ALIAS_PATTERN = re.compile(r'"(\w+)" ([A-Z]\d+)\b')
+
+# SQLite: "SCAN blog_blog", but not "SCAN ... USING [COVERING] INDEX",
+# "SCAN ... VIRTUAL TABLE" (FTS5) or "SCAN CONSTANT ROW"
+SQLITE_SCAN_PATTERN = re.compile(r"^SCAN (\w+)$")
+
+
+class QueryBudget:
+    """
+    What one request to a route may cost: at most max_queries statements
+    (savepoints included, they are round trips too), and no full table
+    scans except on tables listed in allow_scans.
+
+    args are the URL args; data is the request body (None for GET);
+    auth is None, "user" or "staff". With warm=True the request is sent
+    once first, so the budget applies to the cached path.
+    """
+
+    def __init__(self,
+                 route,
+                 max_queries,
+                 method="GET",
+                 args=(),
+                 query="",
+                 data=None,
+                 auth="user",
+                 status=200,
+                 allow_scans=(),
+                 warm=False):
+        self.route = route
+        self.max_queries = max_queries
+        self.method = method
+        self.args = args
+        self.query = query
+        self.data = data
+        self.auth = auth
+        self.status = status
+        self.allow_scans = set(allow_scans)
+        self.warm = warm
+
+    @property
+    def name(self):
+        return f"{self.method} {self.route}{' (warm)' if self.warm else ''}"
+
+    def url(self):
+        return reverse(self.route, args=self.args) + self.query
+
+
+# QUERY PLANS
+def _aliases(sql):
+    return dict((alias, table) for table, alias in ALIAS_PATTERN.findall(sql))
+
+
+def sqlite_scans(sql):
+    aliases = _aliases(sql)
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        details = [row[-1] for row in cursor.fetchall()]
+
+    scans = set()
+    for detail in details:
+        match = SQLITE_SCAN_PATTERN.match(detail)
+        if match:
+            scans.add(aliases.get(match.group(1), match.group(1)))
+    return scans
+
+
+def _seq_scans(node):
+    if node.get("Node Type") == "Seq Scan":
+        yield node["Relation Name"]
+    for child in node.get("Plans", ()):
+        yield from _seq_scans(child)
+
+
+def postgresql_scans(sql):
+    """
+    Plans with sequential scans disabled, so a Seq Scan that remains means
+    no index can serve the query, however small the test tables are.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+        cursor.execute("RESET enable_seqscan")
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return set(_seq_scans(plan[0]["Plan"]))
+
+
+def table_scans(sql):
+    """
+    Tables the statement reads in full, or an empty set if this database
+    cannot be checked.
+    """
+    if not sql.lstrip().upper().startswith(PLANNED_STATEMENTS):
+        return set()
+    if connection.vendor == "sqlite":
+        return sqlite_scans(sql)
+    if connection.vendor == "postgresql":
+        return postgresql_scans(sql)
+    return set()
+
+
+# ASSERTIONS
+class QueryBudgetMixin:
+    """
+    TestCase mixin. Subclasses set self.tokens ({"user": ..., "staff": ...})
+    and call assertWithinBudget for each QueryBudget.
+    """
+
+    def _request(self, budget, body):
+        headers = {}
+        if budget.auth:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {self.tokens[budget.auth]}"
+        return self.client.generic(budget.method,
+                                   budget.url(),
+                                   body,
+                                   content_type="application/json",
+                                   **headers)
+
+    def _body(self, budget):
+        # Built before capturing: fixtures like fresh tokens hit the DB
+        data = budget.data() if callable(budget.data) else budget.data
+        return json.dumps(data) if data else ""
+
+    def capture(self, budget):
+        """
+        Sends the budgeted request with cold caches (except what warm asks
+        for). Returns the response and the SQL it ran, including SQL run
+        while streaming the body.
+        """
+        cache.clear()
+        if budget.warm:
+            self._request(budget, self._body(budget))
+
+        body = self._body(budget)
+        with CaptureQueriesContext(connection) as captured:
+            response = self._request(budget, body)
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        return response, [query["sql"] for query in captured.captured_queries]
+
+    def count_queries(self, budget):
+        return len(self.capture(budget)[1])
+
+    def assertWithinBudget(self, budget):
+        response, sql = self.capture(budget)
+
+        self.assertEqual(response.status_code, budget.status,
+                         f"{budget.name}: unexpected status")
+
+        self.assertLessEqual(
+            len(sql), budget.max_queries,
+            f"{budget.name}: {len(sql)} queries, budget is "
+            f"{budget.max_queries}:\n" + "\n".join(sql))
+
+        for statement in sql:
+            scans = table_scans(statement) - budget.allow_scans
+            self.assertFalse(
+                scans, f"{budget.name}: full scan of {', '.join(sorted(scans))}"
+                f" in:\n{statement}")
@@ -0,0 +1,122 @@
+import asyncio
+import importlib
+import sys
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from blog.models import Blog, Category, Comment
+from users.models import UserProfile
+from users.views import UserProfileView, async_profile
+
+User = get_user_model()
+
+
+def reload_urls():
+    for name in ("users.urls", "blog.urls", settings.ROOT_URLCONF):
+        importlib.reload(sys.modules[name])
+    clear_url_caches()
+
+
+def on_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@override_settings(REPLICA_DATABASES=[])
+class AsyncReadViewTests(TestCase):
+    """
+    The URLconfs pick the async views at import time, so they are reloaded
+    with ASYNC_READ_VIEWS on for this class and restored afterwards.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.async_views = override_settings(ASYNC_READ_VIEWS=True)
+        cls.async_views.enable()
+        reload_urls()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.async_views.disable()
+        reload_urls()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader",
+                                             email="reader@example.com",
+                                             password="pass12345")
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+        self.client = AsyncClient()
+
+    async def test_profile_is_serialized_off_the_event_loop(self):
+        self.assertIs(resolve(reverse("user-profile")).func, async_profile)
+
+        with mock.patch("users.serializers.srcset",
+                        side_effect=lambda *args: {"loop": on_event_loop()}):
+            response = await self.client.get(reverse("user-profile"),
+                                             headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"], str(self.user.pk))
+        self.assertEqual(response.json()["avatar_srcset"], {"loop": False})
+
+    async def test_profile_requires_a_token(self):
+        response = await self.client.get(reverse("user-profile"))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("WWW-Authenticate", response)
+
+    async def test_profile_writes_go_to_the_sync_view(self):
+        response = await self.client.put(reverse("user-profile"),
+                                         {"full_name": "Async Reader"},
+                                         content_type="application/json",
+                                         headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        profile = await UserProfile.objects.aget(user=self.user)
+        self.assertEqual(profile.full_name, "Async Reader")
+
+    async def test_blog_detail(self):
+        blog = await Blog.objects.acreate(
+            title="Async detail",
+            short_description="s",
+            body="b",
+            author=self.user,
+            category=await Category.objects.acreate(name="Tech"))
+        await Comment.objects.acreate(blog=blog, user=self.user, content="Hi")
+
+        response = await self.client.get(
+            reverse("blog-detail", args=[blog.slug]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["comment_count"], 1)
+        self.assertEqual(len(response.json()["comments"]), 1)
+
+
+@override_settings(REPLICA_DATABASES=[])
+class SyncFallbackTests(TestCase):
+
+    def test_sync_views_are_served_when_async_reads_are_off(self):
+        self.assertFalse(settings.ASYNC_READ_VIEWS)
+        self.assertIs(resolve(reverse("user-profile")).func.view_class,
+                      UserProfileView)
+
+        user = User.objects.create_user(username="reader",
+                                        email="reader@example.com",
+                                        password="pass12345")
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(reverse("user-profile"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"], str(user.pk))
@@ -0,0 +1,114 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Blog, Category, Comment
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=[])
+class CacheInvalidationTests(TestCase):
+    """
+    Runs on the default LocMemCache: every write must move a version once
+    it commits, so the next GET misses the cache and reads the new state.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer",
+                                             email="writer@example.com",
+                                             password="pass12345")
+        self.category = Category.objects.create(name="Tech")
+        self.blog = self.post("Versioned caches")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Blog.objects.create(title=title,
+                                       short_description="s",
+                                       body="b",
+                                       author=self.user,
+                                       category=self.category)
+
+    def comment(self, blog, n=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(n):
+                Comment.objects.create(blog=blog, user=self.user,
+                                       content="Hi")
+
+    def test_versions_move_only_on_commit(self):
+        url = reverse("blog-detail", args=[self.blog.slug])
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.blog.title = "Uncommitted"
+            self.blog.save()
+            self.assertEqual(self.client.get(url).json()["title"],
+                             "Versioned caches")
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(self.client.get(url).json()["title"], "Uncommitted")
+
+    def test_comment_refreshes_cached_detail(self):
+        url = reverse("blog-detail", args=[self.blog.slug])
+        first = self.client.get(url)
+        self.assertEqual(first.json()["comment_count"], 0)
+
+        self.comment(self.blog)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["comment_count"], 1)
+        self.assertEqual(len(response.json()["comments"]), 1)
+
+    def test_edit_refreshes_cached_list(self):
+        url = reverse("blog-list")
+        first = self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog.title = "Versioned caches, revised"
+            self.blog.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["title"],
+                         "Versioned caches, revised")
+
+    def test_rebuilt_counters_refresh_cached_detail(self):
+        url = reverse("blog-detail", args=[self.blog.slug])
+        self.comment(self.blog, 2)
+        Blog.objects.filter(pk=self.blog.pk).update(comment_count=0)
+        self.assertEqual(self.client.get(url).json()["comment_count"], 0)
+
+        call_command("rebuild_counters", stdout=io.StringIO())
+
+        self.assertEqual(self.client.get(url).json()["comment_count"], 2)
+
+    def test_blog_delete_skips_per_comment_receivers(self):
+
+        def delete_queries(n_comments):
+            blog = self.post(f"{n_comments} comments")
+            self.comment(blog, n_comments)
+            with CaptureQueriesContext(connection) as queries:
+                blog.delete()
+            return len(queries)
+
+        self.assertEqual(delete_queries(2), delete_queries(20))
+
+        url = reverse("blog-detail", args=[self.blog.slug])
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(
+            Category.objects.get(pk=self.category.pk).blog_count, 0)
@@ -0,0 +1,131 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+from xml.dom import minidom
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from blog import feeds
+from blog.models import Blog, Category
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=[])
+class BlogFeedTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer",
+                                             email="writer@example.com",
+                                             password="pass12345")
+        self.tech = Category.objects.create(name="Tech")
+        self.food = Category.objects.create(name="Food")
+        self.blog = self.post("Caching feeds", self.tech)
+        self.post("Sourdough", self.food)
+
+    def post(self, title, category):
+        return Blog.objects.create(title=title,
+                                   short_description="s",
+                                   body="b",
+                                   author=self.user,
+                                   category=category)
+
+    def feed_url(self, feed_format="json", category=None):
+        if category is None:
+            return reverse("blog-feed", args=[feed_format])
+        return reverse("category-feed", args=[category.slug, feed_format])
+
+    def titles(self, url):
+        items = json.loads(self.client.get(url).content)["items"]
+        return [item["title"] for item in items]
+
+    def test_formats(self):
+        for feed_format in ("rss", "atom"):
+            response = self.client.get(self.feed_url(feed_format))
+            self.assertEqual(response.status_code, 200)
+            minidom.parseString(response.content)
+
+        self.assertEqual(self.titles(self.feed_url()),
+                         ["Sourdough", "Caching feeds"])
+        self.assertEqual(self.titles(self.feed_url(category=self.tech)),
+                         ["Caching feeds"])
+        self.assertEqual(self.client.get(self.feed_url("xml")).status_code,
+                         404)
+
+    def test_repeat_requests_are_served_from_cache(self):
+        first = self.client.get(self.feed_url())
+        with self.assertNumQueries(0):
+            second = self.client.get(self.feed_url())
+            not_modified = self.client.get(
+                self.feed_url(), HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+
+    @override_settings(ALLOWED_HOSTS=["a.example", "b.example"])
+    def test_each_host_gets_its_own_links(self):
+        for host in ("a.example", "b.example"):
+            feed = json.loads(
+                self.client.get(self.feed_url(), HTTP_HOST=host).content)
+            self.assertEqual(feed["feed_url"],
+                             f"http://{host}{self.feed_url()}")
+            self.assertTrue(feed["items"][0]["url"].startswith(
+                f"http://{host}/"))
+
+    @override_settings(ALLOWED_HOSTS=["a.example", "b.example"])
+    def test_site_url_is_used_for_every_host(self):
+        with mock.patch.object(feeds, "SITE_URL", "https://blog.example/"):
+            first = self.client.get(self.feed_url(), HTTP_HOST="a.example")
+            with self.assertNumQueries(0):
+                second = self.client.get(self.feed_url(),
+                                         HTTP_HOST="b.example")
+
+        self.assertEqual(second.content, first.content)
+        feed = json.loads(first.content)
+        self.assertEqual(feed["home_page_url"],
+                         "https://blog.example" + reverse("blog-list"))
+        self.assertTrue(
+            feed["items"][0]["url"].startswith("https://blog.example/"))
+
+    def test_edit_invalidates_site_and_own_category_feeds(self):
+        self.titles(self.feed_url())
+        self.titles(self.feed_url(category=self.tech))
+        food = self.client.get(self.feed_url(category=self.food))["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog.title = "Caching feeds, revised"
+            self.blog.save()
+
+        self.assertIn("Caching feeds, revised", self.titles(self.feed_url()))
+        self.assertEqual(self.titles(self.feed_url(category=self.tech)),
+                         ["Caching feeds, revised"])
+        self.assertEqual(
+            self.client.get(self.feed_url(category=self.food))["ETag"], food)
+
+    def test_bulk_import_invalidates_feeds(self):
+        self.titles(self.feed_url())
+        self.titles(self.feed_url(category=self.food))
+
+        record = {
+            "title": "Rye starter",
+            "short_description": "s",
+            "body": "b",
+            "category": "Food",
+            "author": "writer@example.com",
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson",
+                                         delete=False) as f:
+            f.write(json.dumps(record) + "\n")
+        self.addCleanup(os.remove, f.name)
+        call_command("import_blogs", f.name, stdout=io.StringIO())
+
+        self.assertEqual(self.titles(self.feed_url())[0], "Rye starter")
+        self.assertEqual(self.titles(self.feed_url(category=self.food))[0],
+                         "Rye starter")
@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Blog, Category
+from blog.slugs import SlugAllocator
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=[])
+class ImportBlogsTests(TestCase):
+
+    def setUp(self):
+        User.objects.create_user(username="writer",
+                                 email="writer@example.com",
+                                 password="pass12345")
+        Category.objects.create(name="Tech")
+
+    def run_import(self, records, batch_size=1000):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson",
+                                         delete=False) as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        self.addCleanup(os.remove, f.name)
+        call_command("import_blogs",
+                     f.name,
+                     batch_size=batch_size,
+                     stdout=io.StringIO(),
+                     stderr=io.StringIO())
+
+    def record(self, title, **extra):
+        return {
+            "title": title,
+            "short_description": "s",
+            "body": "b",
+            "category": "Tech",
+            "author": "Writer@example.com",
+            **extra
+        }
+
+    def slugs(self):
+        return list(
+            Blog.objects.order_by("id").values_list("slug", flat=True))
+
+    def test_slugs_stay_unique_across_batches(self):
+        self.run_import([self.record("Hello")])
+        self.run_import([self.record("Hello")] * 3, batch_size=2)
+        self.assertEqual(self.slugs(),
+                         ["hello", "hello-1", "hello-2", "hello-3"])
+
+    def test_given_slugs_are_normalized_and_deduplicated(self):
+        self.run_import([self.record("Hello")])
+        self.run_import([
+            self.record("Other", slug="hello"),
+            self.record("Other", slug="Hello World"),
+            self.record("Other", slug="hello-world"),
+        ])
+        self.assertEqual(self.slugs(),
+                         ["hello", "hello-1", "hello-world", "hello-world-1"])
+
+    def test_slug_taken_concurrently_is_retried_with_next_suffix(self):
+        assign = SlugAllocator.assign
+        user = User.objects.get()
+
+        def assign_then_race(allocator, instances):
+            assign(allocator, instances)
+            if not Blog.objects.filter(slug="hello").exists():
+                # Another writer saves the slug between assign and insert
+                Blog.objects.create(title="Racer",
+                                    slug="hello",
+                                    short_description="s",
+                                    body="b",
+                                    author=user,
+                                    category=Category.objects.get())
+            return instances
+
+        with mock.patch.object(SlugAllocator, "assign", autospec=True,
+                               side_effect=assign_then_race):
+            self.run_import([self.record("Hello"), self.record("World")])
+
+        self.assertEqual(self.slugs(), ["hello", "hello-1", "world"])
+        self.assertEqual(Category.objects.get().blog_count, 3)
+
+    def test_unknown_categories_are_looked_up_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.run_import([self.record("Hello", category="Nope")] * 3,
+                            batch_size=1)
+
+        lookups = [
+            q["sql"] for q in queries
+            if 'FROM "blog_category"' in q["sql"] and "Nope" in q["sql"]
+        ]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(self.slugs(), [])
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Blog, Category, Comment
+from blog.serializers import CategorySerializer
+from ByteBlogger import metrics
+from ByteBlogger.metrics import Registry, merge, render
+
+User = get_user_model()
+
+
+class RegistryTests(TestCase):
+
+    def test_render_counters_and_cumulative_buckets(self):
+        registry = Registry()
+        registry.inc("http_requests_total", {"route": "a", "status": 200})
+        registry.inc("http_requests_total", {"status": 200, "route": "a"})
+        for value in (0.001, 0.02, 20):
+            registry.observe("http_request_duration_seconds", {"route": "a"},
+                             value)
+
+        text = render([registry.snapshot()])
+        self.assertIn('http_requests_total{route="a",status="200"} 2', text)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="a",le="0.005"} 1',
+            text)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="a",le="0.025"} 2',
+            text)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="a",le="+Inf"} 3',
+            text)
+        self.assertIn('http_request_duration_seconds_count{route="a"} 3',
+                      text)
+
+    def test_merge_sums_workers(self):
+        snapshots = []
+        for value in (0.1, 0.3):
+            registry = Registry()
+            registry.inc("http_request_db_queries_total", {"route": "a"}, 2)
+            registry.observe("http_request_db_seconds", {"route": "a"}, value)
+            snapshots.append(json.loads(json.dumps(registry.snapshot())))
+
+        counters, histograms = merge(snapshots)
+        key = ("http_request_db_queries_total", (("route", "a"), ))
+        self.assertEqual(counters[key], 4)
+        series = histograms[("http_request_db_seconds", (("route", "a"), ))]
+        self.assertEqual(series["count"], 2)
+        self.assertAlmostEqual(series["sum"], 0.4)
+
+    def test_collect_reads_other_workers_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            other = Registry()
+            other.inc("http_requests_total", {"route": "other"})
+            with open(os.path.join(directory, "1-other.json"), "w") as f:
+                json.dump(other.snapshot(), f)
+            with open(os.path.join(directory, "2-partial.json"), "w") as f:
+                f.write("{")
+
+            with override_settings(METRICS_DIR=directory):
+                metrics.flush(force=True)
+                snapshots = metrics.collect()
+                own_files = [
+                    name for name in os.listdir(directory)
+                    if name == metrics._worker_file()
+                ]
+
+        self.assertEqual(len(own_files), 1)
+        self.assertEqual(len(snapshots), 2)  # Own live registry and other
+        self.assertIn('route="other"', render(snapshots))
+
+
+@override_settings(REPLICA_DATABASES=[], METRICS_DIR=None)
+class MetricsMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff",
+                                              email="staff@example.com",
+                                              password="pass12345",
+                                              is_staff=True)
+
+    def test_requests_get_server_timing_and_are_counted(self):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+
+        response = client.get(reverse("blog-list"))
+        self.assertRegex(response["Server-Timing"],
+                         r'total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"')
+
+        text = client.get(reverse("metrics")).content.decode()
+        self.assertIn('http_requests_total{method="GET",route="blog-list",'
+                      'status="200"}', text)
+        self.assertIn('http_request_db_queries_total{route="blog-list"}',
+                      text)
+
+    def test_endpoint_is_staff_only(self):
+        self.assertIn(APIClient().get(reverse("metrics")).status_code,
+                      (401, 403))
+
+    def test_project_serializers_are_timed_not_drf(self):
+        from rest_framework.serializers import BaseSerializer
+
+        self.assertIs(type(BaseSerializer.__dict__["data"].fget),
+                      type(lambda: None))
+        self.assertNotIn("metrics", BaseSerializer.data.fget.__module__)
+
+        timings = {"db": 0.0, "queries": 0, "serialize": 0.0,
+                   "serialize_depth": 0}
+        token = metrics._timings.set(timings)
+        try:
+            CategorySerializer(Category(name="Tech")).data
+        finally:
+            metrics._timings.reset(token)
+        self.assertGreater(timings["serialize"], 0)
+
+
+def _queries(response):
+    return int(re.search(r'desc="(\d+) queries"',
+                         response["Server-Timing"]).group(1))
+
+
+@override_settings(REPLICA_DATABASES=[], METRICS_DIR=None)
+class ConcurrentASGIMetricsTests(TestCase):
+    """
+    Concurrent async requests share the executor thread and its
+    connection; each must count only its own queries.
+    """
+
+    def setUp(self):
+        user = User.objects.create_user(username="writer",
+                                        email="writer@example.com",
+                                        password="pass12345")
+        blog = Blog.objects.create(title="Counted",
+                                   short_description="s",
+                                   body="b",
+                                   author=user,
+                                   category=Category.objects.create(
+                                       name="Tech"))
+        Comment.objects.create(blog=blog, user=user, content="Hi")
+        self.url = reverse("blog-comments", args=[blog.slug])
+
+    async def test_queries_are_attributed_per_request(self):
+        client = AsyncClient()
+        expected = _queries(await client.get(self.url))
+        self.assertGreater(expected, 0)
+
+        responses = await asyncio.gather(
+            *(client.get(self.url) for _ in range(8)))
+        self.assertEqual([_queries(r) for r in responses], [expected] * 8)
+
+    async def test_requests_leave_flushing_to_the_flusher(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(METRICS_DIR=directory):
+                response = await AsyncClient().get(self.url)
+                self.assertEqual(os.listdir(directory), [])
+        self.assertEqual(response.status_code, 200)
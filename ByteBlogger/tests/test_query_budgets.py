@@ -0,0 +1,166 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks.dataset import BENCH_PASSWORD, DatasetGenerator
+from blog.models import Blog
+from users.models import OTPRequest
+from users.tokens import RefreshToken
+from users.utils.otp_hash import hash_otp
+from .query_budget import QueryBudget, QueryBudgetMixin
+
+User = get_user_model()
+
+HOT_SLUG = "bench-post-0"  # Gets the most comments
+BUDGET_OTP = "123456"
+
+
+def _refresh_token():
+    reader = User.objects.get(username="bench1")
+    return {"refresh_token": str(RefreshToken.for_user(reader))}
+
+
+def _new_user_data():
+    name = f"budget-{uuid.uuid4().hex[:12]}"
+    return {
+        "username": name,
+        "email": f"{name}@example.com",
+        "password": BENCH_PASSWORD
+    }
+
+
+def _unverified_user():
+    # Fresh each time, so no OTP cooldown is running
+    return User.objects.create_user(**_new_user_data())
+
+
+def _otp_to_verify():
+    user = _unverified_user()
+    OTPRequest.objects.create(user=user, otp_hash=hash_otp(BUDGET_OTP))
+    return {"user_id": str(user.pk), "otp": BUDGET_OTP}
+
+
+# Per-route budgets. Raising one should be a deliberate, reviewed change.
+BUDGETS = [
+    # blog/urls.py
+    QueryBudget("blog-list", 2),
+    QueryBudget("blog-list", 1, query="?limit=5&cursor=bogus", status=400),
+    QueryBudget("blog-search", 3, query="?q=django+cache"),
+    QueryBudget("blogs-by-category", 3, args=["bench-category-0"]),
+    QueryBudget("blog-detail", 4, args=[HOT_SLUG], auth=None),
+    QueryBudget("blog-detail", 0, args=[HOT_SLUG], auth=None, warm=True),
+    QueryBudget("blog-comments", 2, args=[HOT_SLUG], auth=None),
+    QueryBudget("add-comment",
+                8,
+                method="POST",
+                args=[HOT_SLUG],
+                data=lambda: {
+                    "content": "Within budget",
+                    "blog": Blog.objects.get(slug=HOT_SLUG).pk
+                },
+                status=201),
+    # Polling a feed is a cache read until a post in it changes
+    QueryBudget("blog-feed", 1, args=["rss"], auth=None),
+    QueryBudget("blog-feed", 0, args=["rss"], auth=None, warm=True),
+    QueryBudget("category-feed",
+                2,
+                args=["bench-category-0", "atom"],
+                auth=None),
+    QueryBudget("category-feed",
+                0,
+                args=["bench-category-0", "json"],
+                auth=None,
+                warm=True),
+    QueryBudget("blog-export",
+                6,
+                query="?type=blog&type=comment",
+                auth="staff",
+                allow_scans={"blog_blog", "blog_comment"}),
+    # users/urls.py
+    # Email and username are each checked by the model's unique validator
+    # and the case-insensitive one; the OTP job is queued on commit
+    QueryBudget("user-register",
+                12,
+                method="POST",
+                data=_new_user_data,
+                auth=None,
+                status=201),
+    QueryBudget("otp-verify",
+                8,
+                method="POST",
+                data=_otp_to_verify,
+                auth=None),
+    QueryBudget("resend-otp",
+                5,
+                method="POST",
+                data=lambda: {"user_id": str(_unverified_user().pk)},
+                auth=None),
+    QueryBudget("user-login",
+                3,
+                method="POST",
+                data={
+                    "email": "bench1@example.com",
+                    "password": BENCH_PASSWORD
+                },
+                auth=None),
+    QueryBudget("user-profile", 2),
+    QueryBudget("user-profile",
+                5,
+                method="PUT",
+                data={"full_name": "Budget Reader"}),
+    QueryBudget("token-refresh",
+                4,
+                method="POST",
+                data=_refresh_token,
+                auth=None),
+    # simplejwt's blacklist() fetches the user again and get_or_creates
+    QueryBudget("logout", 8, method="POST", data=_refresh_token),
+]
+
+
+@override_settings(REPLICA_DATABASES=[])
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Runs every budgeted route against a seeded dataset and fails when a
+    route needs more queries than budgeted or scans a table in full.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        DatasetGenerator(batch_size=500, seed=1).generate(users=20,
+                                                          categories=3,
+                                                          blogs=300,
+                                                          comments=2000)
+
+    def setUp(self):
+        self.tokens = {
+            "user": str(AccessToken.for_user(User.objects.get(
+                username="bench1"))),
+            "staff": str(AccessToken.for_user(User.objects.get(
+                username="bench0"))),
+        }
+
+    def test_routes_within_budget(self):
+        for budget in BUDGETS:
+            with self.subTest(budget.name):
+                self.assertWithinBudget(budget)
+
+    def test_query_count_does_not_grow_with_data(self):
+        # Export reads in chunks, so it grows with the data by design
+        budgets = [
+            b for b in BUDGETS
+            if b.method == "GET" and not b.warm and b.route != "blog-export"
+        ]
+        before = {b.name + b.query: self.count_queries(b) for b in budgets}
+
+        DatasetGenerator(batch_size=500, seed=2).generate(users=5,
+                                                          categories=0,
+                                                          blogs=300,
+                                                          comments=2000)
+
+        for budget in budgets:
+            with self.subTest(budget.name):
+                self.assertEqual(self.count_queries(budget),
+                                 before[budget.name + budget.query])
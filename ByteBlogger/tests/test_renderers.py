@@ -0,0 +1,74 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from ByteBlogger import renderers
+from ByteBlogger.renderers import FastJSONParser, FastJSONRenderer, json_dumps
+
+
+@skipIf(renderers.orjson is None, "orjson is not installed")
+class RendererParityTests(SimpleTestCase):
+    """
+    The orjson paths must produce the same bytes as DRF's defaults.
+    """
+
+    def assertSameAsDRF(self, data):
+        self.assertEqual(json_dumps(data), JSONRenderer().render(data))
+
+    def test_plain_values(self):
+        self.assertSameAsDRF({
+            "text": "café ☃",
+            "int": 2**40,
+            "float": 1.5,
+            "bool": True,
+            "none": None,
+            "list": [1, "a", {"nested": []}],
+        })
+
+    def test_datetimes_and_other_types(self):
+        utc = datetime.datetime(2024, 5, 1, 12, 30, 5, 123456,
+                                datetime.timezone.utc)
+        self.assertSameAsDRF({
+            "utc": utc,
+            "local": timezone.localtime(utc,
+                                        datetime.timezone(
+                                            datetime.timedelta(hours=2))),
+            "naive": datetime.datetime(2024, 5, 1, 12, 30),
+            "date": datetime.date(2024, 5, 1),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "decimal": Decimal("1.10"),
+            "lazy": gettext_lazy("Not found."),
+        })
+
+    def test_non_string_keys_and_line_separators(self):
+        self.assertSameAsDRF({320: "a.webp", 640: "b.webp"})
+        self.assertSameAsDRF({"body": "one\u2028two\u2029three"})
+
+    def test_integers_past_64_bits_fall_back(self):
+        self.assertSameAsDRF({"big": 2**70})
+
+    def test_indented_output_uses_drf(self):
+        data = {"a": [1, 2]}
+        context = {"indent": 2}
+        self.assertEqual(
+            FastJSONRenderer().render(data, renderer_context=context),
+            JSONRenderer().render(data, renderer_context=context))
+
+    def test_parser_matches_drf(self):
+        raw = b'{"title": "caf\\u00e9", "n": [1, 2.5, null]}'
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(raw)),
+            JSONParser().parse(io.BytesIO(raw)))
+
+        for parser in (FastJSONParser(), JSONParser()):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(b'{"n": NaN}'))
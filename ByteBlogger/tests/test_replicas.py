@@ -0,0 +1,158 @@
+import copy
+import time
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connections
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from blog.models import Blog, Category
+from blog.search import clear_index, index_blog, search_blog_ids
+from ByteBlogger.replicas import PIN_COOKIE, ReplicaRouter, use_replica
+
+User = get_user_model()
+
+HAS_REPLICA = "replica" in settings.DATABASES
+
+
+@skipUnless(HAS_REPLICA, "needs the replica alias from settings/test.py")
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Runs against two SQLite files (see settings/test.py). Rows created
+    through the ORM land on the primary only, so a 404 means the request
+    was served by the replica.
+    """
+
+    # Django sets up every listed alias, skipped or not
+    databases = {"default", "replica"} if HAS_REPLICA else {"default"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader",
+                                             email="reader@example.com",
+                                             password="pass12345")
+        self.category = Category.objects.create(name="Tech")
+        self.blog = Blog.objects.create(title="Primary only",
+                                        short_description="s",
+                                        body="b",
+                                        author=self.user,
+                                        category=self.category)
+        self.detail_url = reverse("blog-detail", args=[self.blog.slug])
+        self.comments_url = reverse("blog-comments", args=[self.blog.slug])
+        self.comment_url = reverse("add-comment", args=[self.blog.slug])
+        self.token = str(AccessToken.for_user(self.user))
+
+    def mirror(self, *objs):
+        """
+        Copies rows to the replica without firing signals.
+        """
+        for obj in objs:
+            type(obj).objects.using("replica").bulk_create([copy.copy(obj)])
+
+    def authed_client(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        return client
+
+    def comment(self, client, content="Nice post"):
+        return client.post(self.comment_url, {
+            "content": content,
+            "blog": self.blog.pk
+        },
+                           format="json")
+
+    def test_router_reads_from_replica_only_when_enabled(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Blog), "default")
+        with use_replica():
+            self.assertEqual(router.db_for_read(Blog), "replica")
+            self.assertEqual(router.db_for_write(Blog), "default")
+            with use_replica(False):
+                self.assertEqual(router.db_for_read(Blog), "default")
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_router_without_replicas_uses_primary(self):
+        with use_replica():
+            self.assertEqual(ReplicaRouter().db_for_read(Blog), "default")
+
+    def test_safe_requests_read_from_replica(self):
+        self.assertEqual(APIClient().get(self.comments_url).status_code, 404)
+
+        self.mirror(self.user, self.category, self.blog)
+        response = APIClient().get(self.comments_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_search_reads_from_replica(self):
+        replica = connections["replica"]
+        self.addCleanup(clear_index, replica)
+        with use_replica():
+            self.assertEqual(search_blog_ids("primary", 10), [])
+
+            index_blog(self.blog, replica)
+            self.assertEqual(search_blog_ids("primary", 10), [self.blog.pk])
+
+    def test_write_pins_client_to_primary_with_cookie(self):
+        client = self.authed_client()
+        response = self.comment(client)
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        response = client.get(self.comments_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_token_user_is_read_from_primary(self):
+        # The user row is missing on the replica; a replica lookup would
+        # reject the token
+        response = self.authed_client().get(self.comments_url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_write_pins_token_via_cache_marker(self):
+        self.assertEqual(
+            self.authed_client().get(self.comments_url).status_code, 404)
+        self.assertEqual(self.comment(self.authed_client()).status_code, 201)
+
+        # Fresh client, same token, no cookie
+        self.assertEqual(
+            self.authed_client().get(self.comments_url).status_code, 200)
+        self.assertEqual(APIClient().get(self.comments_url).status_code, 404)
+
+    def test_detail_cache_is_filled_from_primary(self):
+        # The replica lags: it has the blog, but not the comment below
+        self.mirror(self.user, self.category, self.blog)
+        writer = self.authed_client()
+        self.assertEqual(writer.get(self.detail_url).json()["comment_count"],
+                         0)
+        self.assertEqual(self.comment(writer).status_code, 201)
+
+        # An unpinned reader fills the cache for the new blog version. It
+        # must not cache the replica's stale copy for the writer to read.
+        self.assertEqual(
+            APIClient().get(self.detail_url).json()["comment_count"], 1)
+        response = writer.get(self.detail_url)
+        self.assertEqual(response.json()["comment_count"], 1)
+        self.assertEqual(len(response.json()["comments"]), 1)
+
+    def test_expired_pin_reads_from_replica(self):
+        client = APIClient()
+        client.cookies[PIN_COOKIE] = str(time.time() - 1)
+        self.assertEqual(client.get(self.comments_url).status_code, 404)
+
+    def test_failed_write_does_not_pin(self):
+        response = self.comment(self.authed_client(), content="")
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(
+            self.authed_client().get(self.comments_url).status_code, 404)
+
+    @override_settings(REPLICA_PIN_SECONDS=0)
+    def test_pinning_can_be_disabled(self):
+        response = self.comment(self.authed_client())
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
@@ -0,0 +1,90 @@
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from blog.models import Blog, Category
+from blog.search import clear_index, search_blog_ids
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=[])
+class SearchTests(TestCase):
+
+    def setUp(self):
+        # TransactionTestCase flushes leave rows in the shadow table, and
+        # new blogs may reuse their ids
+        clear_index()
+        self.user = User.objects.create_user(username="writer",
+                                             email="writer@example.com",
+                                             password="pass12345")
+        self.category = Category.objects.create(name="Tech")
+
+    def post(self, title, short_description="s", body="b"):
+        return Blog.objects.create(title=title,
+                                   short_description=short_description,
+                                   body=body,
+                                   author=self.user,
+                                   category=self.category)
+
+    @skipUnless(connection.vendor in ("sqlite", "postgresql"),
+                "needs the full-text index")
+    def test_title_matches_rank_first(self):
+        in_body = self.post("Other", body="Notes on caching layers")
+        in_title = self.post("Caching layers")
+        in_summary = self.post("Another", short_description="Caching")
+        self.post("Unrelated")
+
+        self.assertEqual(search_blog_ids("caching", 10),
+                         [in_title.pk, in_summary.pk, in_body.pk])
+        self.assertEqual(search_blog_ids("caching", 1, offset=1),
+                         [in_summary.pk])
+
+    @skipUnless(connection.vendor in ("sqlite", "postgresql"),
+                "needs the full-text index")
+    def test_index_follows_edits_and_deletes(self):
+        blog = self.post("Caching")
+        blog.title = "Sourdough"
+        blog.save()
+        self.assertEqual(search_blog_ids("caching", 10), [])
+        self.assertEqual(search_blog_ids("sourdough", 10), [blog.pk])
+
+        blog.delete()
+        self.assertEqual(search_blog_ids("sourdough", 10), [])
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 query syntax")
+    def test_query_syntax_is_escaped(self):
+        blog = self.post('Say "hello" to caching')
+        for query in ('"hello', 'title:hello', 'hello*', 'NEAR(hello',
+                      'hello OR', '-hello', '"'):
+            with self.subTest(query):
+                self.assertIn(search_blog_ids(query, 10), ([blog.pk], []))
+
+        self.assertEqual(search_blog_ids("hello OR sourdough", 10), [])
+        self.assertEqual(search_blog_ids('"hello"', 10), [blog.pk])
+
+    def test_other_databases_fall_back_to_icontains(self):
+        older = self.post("Caching basics")
+        newer = self.post("Other", body="More CACHING")
+        self.post("Unrelated")
+        unsupported = mock.Mock(vendor="mysql", alias="default")
+
+        self.assertEqual(
+            search_blog_ids("caching", 10, connection=unsupported),
+            [newer.pk, older.pk])
+        self.assertEqual(
+            search_blog_ids("caching", 1, offset=1, connection=unsupported),
+            [older.pk])
+
+    def test_view(self):
+        blog = self.post("Caching layers")
+        url = reverse("blog-search")
+
+        self.assertEqual(self.client.get(url).status_code, 400)
+        response = self.client.get(url, {"q": "caching"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["slug"] for row in response.json()["results"]],
+                         [blog.slug])
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from blog.models import Blog, Category
+from blog.slugs import next_suffix
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=[])
+class SlugTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="writer",
+                                             email="writer@example.com",
+                                             password="pass12345")
+        self.category = Category.objects.create(name="Tech")
+
+    def post(self, title, slug=""):
+        return Blog.objects.create(title=title,
+                                   slug=slug,
+                                   short_description="s",
+                                   body="b",
+                                   author=self.user,
+                                   category=self.category)
+
+    def test_colliding_titles_get_numbered_slugs(self):
+        slugs = [self.post("Hello").slug for _ in range(3)]
+        self.assertEqual(slugs, ["hello", "hello-1", "hello-2"])
+
+    def test_suffix_is_one_query_over_numeric_suffixes_only(self):
+        for slug in ("hello", "hello-2", "hello-10", "hello-world",
+                     "hello-3b", "hello-1-2"):
+            self.post("Other", slug=slug)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(next_suffix(Blog, "hello"), 11)
+        self.assertEqual(next_suffix(Blog, "other"), 1)
+        self.assertEqual(self.post("Hello").slug, "hello-11")
@@ -1,7 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from .metrics import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls), 
     path('api/user/', include('users.urls')), 
+    path('api/', include('blog.urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),  # Staff only
 ]
@@ -0,0 +1,163 @@
+import io
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import transaction
+
+from blog.cache import bump_feed_versions, bump_list_version
+from blog.models import Blog, Category, Comment
+from blog.search import index_blogs
+from users.models import UserProfile
+
+User = get_user_model()
+
+# Every generated user can log in with this password
+BENCH_PASSWORD = "bench-password-1"
+BENCH_PREFIX = "bench"
+
+# Authors and commenters are drawn from the first users of a run, so the
+# generator's memory does not grow with the user count
+USER_POOL = 10_000
+
+# Share of comments that land on the hottest 1% of blogs
+HOT_COMMENT_SHARE = 0.5
+
+WORDS = ("django", "python", "async", "cache", "query", "index", "replica",
+         "latency", "database", "postgres", "sqlite", "token", "worker",
+         "queue", "search", "vector", "backend", "frontend", "deploy",
+         "docker", "server", "client", "request", "response", "stream",
+         "profile", "image", "upload", "signal", "model", "serializer",
+         "router", "metrics", "throughput", "budget", "feed", "travel",
+         "health", "science", "sports", "food", "music", "garden", "coffee")
+
+
+def _batches(start, count, batch_size):
+    end = start + count
+    while start < end:
+        yield start, min(batch_size, end - start)
+        start += batch_size
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+class DatasetGenerator:
+    """
+    Bulk-inserts a synthetic dataset for benchmarks. Rows are numbered
+    after any existing bench rows, so runs can be repeated to grow it.
+    Signals do not fire for bulk inserts, so the search index is written
+    per batch and counters are rebuilt once at the end.
+    """
+
+    def __init__(self, batch_size=5000, seed=0, log=None):
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.log = log or (lambda message: None)
+
+    def generate(self, users, categories, blogs, comments):
+        user_ids = self.create_users(users)
+        category_ids = self.create_categories(categories)
+        blog_ids = self.create_blogs(blogs, user_ids, category_ids)
+        self.create_comments(comments, user_ids, blog_ids)
+
+        self.log("Rebuilding counters...")
+        call_command("rebuild_counters", stdout=io.StringIO())
+        # Bulk inserts send no post_save
+        bump_list_version()
+        bump_feed_versions(*Category.objects.filter(
+            pk__in=category_ids).values_list("slug", flat=True))
+
+    def _offset(self, queryset):
+        return queryset.count()
+
+    def create_users(self, count):
+        bench = User.objects.filter(username__startswith=BENCH_PREFIX)
+        offset = self._offset(bench)
+        password = make_password(BENCH_PASSWORD)  # Hash once, share it
+
+        pool = []
+        for start, size in _batches(offset, count, self.batch_size):
+            users = [
+                User(email=f"{BENCH_PREFIX}{n}@example.com",
+                     username=f"{BENCH_PREFIX}{n}",
+                     password=password,
+                     is_verified=True,
+                     is_staff=(n == 0)) for n in range(start, start + size)
+            ]
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                UserProfile.objects.bulk_create(
+                    [UserProfile(user=user) for user in users])
+            pool.extend(user.pk for user in users[:USER_POOL - len(pool)])
+            self.log(f"Users: {start + size - offset}/{count}")
+
+        if offset == 0 and count:
+            # bench0 is staff and an author, for admin-only and write routes
+            author_group, _ = Group.objects.get_or_create(name="Author")
+            author_group.user_set.add(User.objects.get(
+                username=f"{BENCH_PREFIX}0"))
+
+        if not pool:
+            pool = list(
+                bench.values_list("pk", flat=True).order_by("pk")[:USER_POOL])
+        return pool
+
+    def create_categories(self, count):
+        offset = self._offset(
+            Category.objects.filter(slug__startswith=BENCH_PREFIX))
+        Category.objects.bulk_create([
+            Category(name=f"Bench Category {n}",
+                     slug=f"{BENCH_PREFIX}-category-{n}")
+            for n in range(offset, offset + count)
+        ])
+        return list(
+            Category.objects.filter(slug__startswith=BENCH_PREFIX).values_list(
+                "pk", flat=True))
+
+    def create_blogs(self, count, user_ids, category_ids):
+        offset = self._offset(Blog.objects.filter(slug__startswith=BENCH_PREFIX))
+        rng = self.rng
+
+        blog_ids = []
+        for start, size in _batches(offset, count, self.batch_size):
+            blogs = [
+                Blog(title=_sentence(rng, 6).title(),
+                     short_description=_sentence(rng, 15),
+                     body=_sentence(rng, 120),
+                     slug=f"{BENCH_PREFIX}-post-{n}",
+                     author_id=rng.choice(user_ids),
+                     category_id=rng.choice(category_ids))
+                for n in range(start, start + size)
+            ]
+            with transaction.atomic():
+                Blog.objects.bulk_create(blogs)
+                index_blogs((blog.pk, blog.title, blog.short_description,
+                             blog.body) for blog in blogs)
+            blog_ids.extend(blog.pk for blog in blogs)
+            self.log(f"Blogs: {start + size - offset}/{count}")
+
+        if not blog_ids:
+            blog_ids = list(
+                Blog.objects.filter(slug__startswith=BENCH_PREFIX).values_list(
+                    "pk", flat=True))
+        return blog_ids
+
+    def create_comments(self, count, user_ids, blog_ids):
+        if not blog_ids:
+            return
+
+        rng = self.rng
+        hot = blog_ids[:max(1, len(blog_ids) // 100)]
+
+        for start, size in _batches(0, count, self.batch_size):
+            Comment.objects.bulk_create([
+                Comment(blog_id=rng.choice(
+                    hot if rng.random() < HOT_COMMENT_SHARE else blog_ids),
+                        user_id=rng.choice(user_ids),
+                        content=_sentence(rng, 20)) for _ in range(size)
+            ])
+            self.log(f"Comments: {start + size}/{count}")
@@ -0,0 +1,71 @@
+import io
+import itertools
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from blog.models import Blog
+from blog.views import LIST_FIELDS
+from ByteBlogger.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    help = ("Compare DRF's stdlib JSON renderer/parser with the orjson ones "
+            "on blog list payloads (the rows BlogListView returns).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows",
+                            type=int,
+                            nargs="+",
+                            default=[100, 1000, 10_000])
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed; the fast renderer "
+                               "falls back to the stdlib encoder.")
+
+        largest = max(options["rows"])
+        source = list(
+            Blog.objects.values("id", "created_at",
+                                *LIST_FIELDS)[:largest])
+        if not source:
+            raise CommandError("No blogs found; run seed_benchmark first.")
+
+        n = options["iterations"]
+        for rows in options["rows"]:
+            # Repeat rows when the table is smaller than the page
+            data = {
+                "results": list(itertools.islice(itertools.cycle(source),
+                                                 rows)),
+                "next": None
+            }
+            self.stdout.write(f"\n{rows} rows")
+
+            renders = {}
+            for name, renderer in (("stdlib", JSONRenderer()),
+                                   ("orjson", FastJSONRenderer())):
+                content = renderer.render(data)
+                renders[name] = timeit.timeit(lambda: renderer.render(data),
+                                              number=n) / n
+                self._line(f"render {name}", renders[name], len(content))
+
+            parses = {}
+            for name, parser in (("stdlib", JSONParser()),
+                                 ("orjson", FastJSONParser())):
+                parses[name] = timeit.timeit(
+                    lambda: parser.parse(io.BytesIO(content)), number=n) / n
+                self._line(f"parse {name}", parses[name], len(content))
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"orjson renders {renders['stdlib'] / renders['orjson']:.1f}x "
+                    f"and parses {parses['stdlib'] / parses['orjson']:.1f}x "
+                    f"faster."))
+
+    def _line(self, label, seconds, size):
+        self.stdout.write(f"{label:<16}{seconds * 1e3:>10.2f} ms"
+                          f"{size / seconds / 1e6:>10.1f} MB/s "
+                          f"({size:,} bytes)")
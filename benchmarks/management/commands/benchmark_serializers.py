@@ -0,0 +1,62 @@
+import itertools
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Comment
+from blog.read_serializers import CommentReadSerializer
+from blog.serializers import CommentSerializer
+from blog.views import COMMENT_FIELDS
+
+
+class Command(BaseCommand):
+    help = ("Compare DRF's CommentSerializer with CommentReadSerializer on "
+            "comment pages, from model instances and from values() rows.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows",
+                            type=int,
+                            nargs="+",
+                            default=[100, 1000, 10_000])
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        largest = max(options["rows"])
+        queryset = Comment.objects.order_by("-created_at", "-id")
+        instances = list(queryset.select_related("user")[:largest])
+        rows = list(queryset.values("id", "created_at",
+                                    *COMMENT_FIELDS)[:largest])
+        if not instances:
+            raise CommandError("No comments found; run seed_benchmark first.")
+
+        n = options["iterations"]
+        for count in options["rows"]:
+            # Repeat comments when the table is smaller than the page
+            page = list(itertools.islice(itertools.cycle(instances), count))
+            page_rows = list(itertools.islice(itertools.cycle(rows), count))
+
+            expected = CommentSerializer(page, many=True).data
+            if CommentReadSerializer.many(page_rows) != [
+                    dict(item) for item in expected
+            ]:
+                raise CommandError("CommentReadSerializer output differs "
+                                   "from CommentSerializer.")
+
+            self.stdout.write(f"\n{count} rows")
+            timings = {}
+            for name, serialize in (
+                ("drf", lambda: CommentSerializer(page, many=True).data),
+                ("read instances", lambda: CommentReadSerializer.many(page)),
+                ("read rows", lambda: CommentReadSerializer.many(page_rows)),
+            ):
+                seconds = timings[name] = timeit.timeit(serialize,
+                                                        number=n) / n
+                self.stdout.write(f"{name:<16}{seconds * 1e3:>10.2f} ms"
+                                  f"{seconds / count * 1e6:>10.2f} us/row")
+
+            drf = timings["drf"]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Read serializer is {drf / timings['read rows']:.1f}x "
+                    f"faster on rows and "
+                    f"{drf / timings['read instances']:.1f}x on instances."))
@@ -0,0 +1,138 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.test.utils import override_settings, setup_test_environment
+from django.urls import get_resolver
+
+from benchmarks.runner import (HTTPTransport, TestClientTransport,
+                               compare_results, run_scenario, save_results)
+from benchmarks.scenarios import SCENARIOS, BenchContext
+from blog.models import Blog, Category, Comment
+from users.models import User
+
+RESULTS_DIR = "benchmarks/results"
+
+# Apps whose every route must have a scenario
+COVERED_URLCONFS = ("blog.urls", "users.urls")
+
+
+class Command(BaseCommand):
+    help = ("Measure p50/p95/p99 latency, throughput and queries per request "
+            "for every blog and user route, and save the results as JSON. "
+            "Seed data with seed_benchmark first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency",
+                            type=int,
+                            nargs="+",
+                            default=[1, 8],
+                            help="Concurrency levels to run.")
+        parser.add_argument("--requests",
+                            type=int,
+                            default=200,
+                            help="Timed requests per scenario and level.")
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--only",
+                            nargs="+",
+                            help="Route names to run (default: all).")
+        parser.add_argument("--base-url",
+                            help="Benchmark a running server instead of "
+                            "the in-process test client.")
+        parser.add_argument("--keep-throttles",
+                            action="store_true",
+                            help="Leave rate limits on (test client only).")
+        parser.add_argument("--output", help="Results file (JSON).")
+        parser.add_argument("--compare",
+                            help="Earlier results file to compare against.")
+
+    def handle(self, *args, **options):
+        self._check_coverage()
+
+        scenarios = [
+            s for s in SCENARIOS
+            if not options["only"] or s.route in options["only"]
+        ]
+        if not scenarios:
+            raise CommandError("No scenarios match --only.")
+
+        base_url = options["base_url"]
+        if base_url:
+            make_transport = lambda: HTTPTransport(base_url)
+        else:
+            # Allows the test client's host; DEBUG off stops query logging
+            setup_test_environment(debug=False)
+            if not options["keep_throttles"]:
+                self._lift_rate_limits()
+            make_transport = TestClientTransport
+
+        try:
+            ctx = BenchContext()
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        results = []
+        for concurrency in options["concurrency"]:
+            for scenario in scenarios:
+                result = run_scenario(scenario, ctx, make_transport,
+                                      concurrency, options["requests"],
+                                      options["warmup"])
+                results.append(result)
+                self._report(result)
+
+        started_at = datetime.now(timezone.utc)
+        output = options["output"] or os.path.join(
+            RESULTS_DIR, f"{started_at:%Y%m%dT%H%M%SZ}.json")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        save_results(
+            output, results, {
+                "started_at": started_at.isoformat(),
+                "target": base_url or "test-client",
+                "command": " ".join(sys.argv),
+                "dataset": {
+                    "users": User.objects.count(),
+                    "categories": Category.objects.count(),
+                    "blogs": Blog.objects.count(),
+                    "comments": Comment.objects.count(),
+                },
+            })
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {output}"))
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                self._print_comparison(json.load(f), results)
+
+    def _check_coverage(self):
+        covered = {s.route for s in SCENARIOS}
+        for urlconf in COVERED_URLCONFS:
+            for pattern in get_resolver(urlconf).url_patterns:
+                if pattern.name and pattern.name not in covered:
+                    self.stderr.write(
+                        self.style.WARNING(
+                            f"No benchmark scenario for route "
+                            f"'{pattern.name}'."))
+
+    def _lift_rate_limits(self):
+        override_settings(RATE_LIMITS={
+            scope: (sys.maxsize, window)
+            for scope, (_, window) in settings.RATE_LIMITS.items()
+        }).enable()
+
+    def _report(self, result):
+        self.stdout.write(
+            f"{result['scenario']:<28} c={result['concurrency']:<3} "
+            f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms "
+            f"p99={result['p99_ms']}ms {result['throughput_rps']} req/s "
+            f"q/req={result['queries_per_request']} "
+            f"errors={result['errors']}")
+
+    def _print_comparison(self, baseline, results):
+        self.stdout.write("\nChange vs baseline (p95, throughput):")
+        for name, concurrency, old_p95, p95, old_rps, rps in compare_results(
+                baseline, results):
+            self.stdout.write(f"{name:<28} c={concurrency:<3} "
+                              f"p95 {old_p95} -> {p95}ms, "
+                              f"{old_rps} -> {rps} req/s")
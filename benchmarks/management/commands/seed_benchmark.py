@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.dataset import DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = ("Bulk-insert a synthetic dataset for benchmarks. Repeated runs "
+            "add to it.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--blogs", type=int, default=10_000)
+        parser.add_argument("--comments", type=int, default=50_000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        generator = DatasetGenerator(batch_size=options["batch_size"],
+                                     seed=options["seed"],
+                                     log=self.stdout.write)
+
+        started = time.monotonic()
+        generator.generate(users=options["users"],
+                           categories=options["categories"],
+                           blogs=options["blogs"],
+                           comments=options["comments"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {options['users']} users, {options['categories']} "
+                f"categories, {options['blogs']} blogs and "
+                f"{options['comments']} comments in "
+                f"{time.monotonic() - started:.1f}s."))
@@ -0,0 +1,187 @@
+import http.client
+import json
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.db import connections
+
+# Query count reported by the metrics middleware's Server-Timing header
+QUERIES_PATTERN = re.compile(r'desc="(\d+) queries"')
+
+
+# TRANSPORTS
+class TestClientTransport:
+    """
+    Drives the URLconf in-process through Django's test client. One per
+    thread; each thread gets its own database connection.
+    """
+
+    def __init__(self):
+        from django.test import Client
+        self.client = Client(raise_request_exception=False)  # 500s are data
+
+    def request(self, method, path, body, headers):
+        extra = {
+            f"HTTP_{name.upper().replace('-', '_')}": value
+            for name, value in headers.items()
+        }
+        response = self.client.generic(method,
+                                       path,
+                                       body or "",
+                                       content_type="application/json",
+                                       **extra)
+        if response.streaming:
+            b"".join(response.streaming_content)  # Time the whole export
+        return response.status_code, response.get("Server-Timing", "")
+
+    def close(self):
+        connections.close_all()
+
+
+class HTTPTransport:
+    """
+    Sends requests to a running server over one keep-alive connection.
+    """
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        connection_class = (http.client.HTTPSConnection
+                            if parts.scheme == "https" else
+                            http.client.HTTPConnection)
+        self.prefix = parts.path.rstrip("/")
+        self.connection = connection_class(parts.netloc, timeout=60)
+
+    def request(self, method, path, body, headers):
+        headers = dict(headers, **{"Content-Type": "application/json"})
+        try:
+            self.connection.request(method, self.prefix + path, body, headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, ConnectionError):
+            self.connection.close()  # Reconnect once
+            self.connection.request(method, self.prefix + path, body, headers)
+            response = self.connection.getresponse()
+        response.read()
+        return response.status, response.getheader("Server-Timing", "")
+
+    def close(self):
+        self.connection.close()
+
+
+# STATISTICS
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(scenario, concurrency, samples, elapsed):
+    latencies = sorted(latency for latency, _, _ in samples)
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    queries = [count for _, _, count in samples if count is not None]
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "scenario": scenario.name,
+        "route": scenario.route,
+        "method": scenario.method,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": sum(1 for _, status, _ in samples
+                      if status not in scenario.expect),
+        "statuses": statuses,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "queries_per_request":
+        round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+# RUNNER
+def _build(scenario, ctx):
+    headers = {}
+    if scenario.auth:
+        headers["Authorization"] = f"Bearer {ctx.tokens[scenario.auth]}"
+    body = json.dumps(scenario.data(ctx)) if scenario.data else None
+    return scenario.path(ctx), body, headers
+
+
+def _worker(scenario, ctx, make_transport, count):
+    transport = make_transport()
+    samples = []
+    try:
+        for _ in range(count):
+            path, body, headers = _build(scenario, ctx)
+            start = time.perf_counter()
+            status, timing = transport.request(scenario.method, path, body,
+                                               headers)
+            latency = time.perf_counter() - start
+            match = QUERIES_PATTERN.search(timing)
+            samples.append(
+                (latency, status, int(match.group(1)) if match else None))
+    finally:
+        transport.close()
+    return samples
+
+
+def run_scenario(scenario, ctx, make_transport, concurrency, requests,
+                 warmup=0):
+    """
+    Sends warmup untimed requests, then requests spread over concurrency
+    threads. Returns the summary dict.
+    """
+    if warmup:
+        _worker(scenario, ctx, make_transport, warmup)
+
+    per_worker = [
+        requests // concurrency + (1 if i < requests % concurrency else 0)
+        for i in range(concurrency)
+    ]
+    barrier = threading.Barrier(concurrency)
+
+    def work(count):
+        barrier.wait()  # Start together so throughput is measured fairly
+        return _worker(scenario, ctx, make_transport, count)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(work, per_worker))
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for result in results for sample in result]
+    return summarize(scenario, concurrency, samples, elapsed)
+
+
+# RESULTS
+def save_results(path, results, meta):
+    with open(path, "w") as f:
+        json.dump(dict(meta, results=results), f, indent=2)
+
+
+def compare_results(baseline, results):
+    """
+    Yields (scenario, concurrency, baseline p95, p95, baseline rps, rps)
+    for every entry present in both runs.
+    """
+    previous = {(r["scenario"], r["concurrency"]): r
+                for r in baseline["results"]}
+    for result in results:
+        old = previous.get((result["scenario"], result["concurrency"]))
+        if old is not None:
+            yield (result["scenario"], result["concurrency"], old["p95_ms"],
+                   result["p95_ms"], old["throughput_rps"],
+                   result["throughput_rps"])
@@ -0,0 +1,195 @@
+import itertools
+import random
+import threading
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from blog.models import Blog, Category
+from users.tokens import RefreshToken
+from .dataset import BENCH_PASSWORD, BENCH_PREFIX
+
+User = get_user_model()
+
+# Slugs sampled from the dataset for detail/comment routes
+SAMPLE_SIZE = 1000
+
+
+class BenchContext:
+    """
+    Fixtures shared by every scenario: a reader and a staff author with
+    access tokens, and sampled blog and category slugs. Token minting and
+    payload building happen outside the timed request.
+    """
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self.run_id = uuid.uuid4().hex[:8]  # Keeps registrations unique
+
+        bench = User.objects.filter(username__startswith=BENCH_PREFIX)
+        self.staff = bench.filter(is_staff=True).order_by("username").first()
+        self.reader = bench.filter(is_staff=False).order_by("username").first()
+        if self.staff is None or self.reader is None:
+            raise LookupError(
+                "No benchmark users found; run seed_benchmark first.")
+
+        self.tokens = {
+            "user": str(AccessToken.for_user(self.reader)),
+            "staff": str(AccessToken.for_user(self.staff)),
+        }
+
+        blogs = Blog.objects.filter(slug__startswith=BENCH_PREFIX)
+        self.slugs = list(
+            blogs.order_by("-created_at", "-id").values_list(
+                "slug", flat=True)[:SAMPLE_SIZE])
+        # Most commented blog, to exercise the first page of comments
+        hot = blogs.order_by("-comment_count").values("pk", "slug").first()
+        self.hot_slug = hot["slug"] if hot else None
+        self.hot_blog_id = hot["pk"] if hot else None
+        self.category_slugs = list(
+            Category.objects.filter(slug__startswith=BENCH_PREFIX).values_list(
+                "slug", flat=True))
+        if not self.slugs or not self.category_slugs:
+            raise LookupError(
+                "No benchmark blogs found; run seed_benchmark first.")
+
+    def next_id(self):
+        with self._lock:
+            return next(self._counter)
+
+    def choice(self, values):
+        with self._lock:
+            return self.rng.choice(values)
+
+    def refresh_token(self):
+        # Rotation blacklists used refresh tokens, so mint one per request
+        return str(RefreshToken.for_user(self.reader))
+
+
+class Scenario:
+    """
+    One request shape against a named route. path and data are callables
+    taking the BenchContext, so every request can vary. auth is None,
+    "user" or "staff". Statuses outside expect count as errors.
+    """
+
+    def __init__(self,
+                 route,
+                 method,
+                 path,
+                 data=None,
+                 auth=None,
+                 expect=(200, )):
+        self.route = route
+        self.method = method
+        self.path = path
+        self.data = data
+        self.auth = auth
+        self.expect = expect
+
+    @property
+    def name(self):
+        return f"{self.method} {self.route}"
+
+
+def _url(name, *args):
+    return lambda ctx: reverse(name, args=args)
+
+
+SCENARIOS = [
+    # blog/urls.py
+    Scenario("blog-list", "GET", _url("blog-list"), auth="user"),
+    # BlogSerializer's nested category is read-only in practice, so this
+    # times the role check and validation path
+    Scenario("blog-list",
+             "POST",
+             _url("blog-list"),
+             data=lambda ctx: {
+                 "title": f"Benchmark post {ctx.next_id()}",
+                 "short_description": "Written by the benchmark runner",
+                 "body": "Benchmark body " * 50,
+             },
+             auth="staff",
+             expect=(201, 400)),
+    Scenario("blog-search",
+             "GET",
+             lambda ctx: reverse("blog-search") + "?q=" + ctx.choice(
+                 ("django cache", "postgres index", "async worker",
+                  "travel coffee"))),
+    Scenario("blog-export",
+             "GET",
+             lambda ctx: reverse("blog-export") + "?type=blog",
+             auth="staff"),
+    Scenario("blog-feed", "GET",
+             lambda ctx: reverse("blog-feed", args=[ctx.choice(
+                 ("rss", "atom", "json"))])),
+    Scenario(
+        "category-feed", "GET", lambda ctx: reverse(
+            "category-feed", args=[ctx.choice(ctx.category_slugs), "rss"])),
+    Scenario(
+        "blogs-by-category", "GET", lambda ctx: reverse(
+            "blogs-by-category", args=[ctx.choice(ctx.category_slugs)])),
+    Scenario("blog-detail", "GET",
+             lambda ctx: reverse("blog-detail", args=[ctx.choice(ctx.slugs)])),
+    Scenario("blog-comments", "GET",
+             lambda ctx: reverse("blog-comments", args=[ctx.hot_slug])),
+    Scenario("add-comment",
+             "POST",
+             lambda ctx: reverse("add-comment", args=[ctx.hot_slug]),
+             data=lambda ctx: {
+                 "content": "Benchmark comment",
+                 "blog": ctx.hot_blog_id
+             },
+             auth="user",
+             expect=(201, 429)),
+    # users/urls.py
+    Scenario("user-register",
+             "POST",
+             _url("user-register"),
+             data=lambda ctx: {
+                 "email":
+                 f"bench-register-{ctx.run_id}-{ctx.next_id()}@example.com",
+                 "password": BENCH_PASSWORD,
+             },
+             expect=(201, )),
+    Scenario("user-login",
+             "POST",
+             _url("user-login"),
+             data=lambda ctx: {
+                 "email": ctx.reader.email,
+                 "password": BENCH_PASSWORD
+             }),
+    Scenario("otp-verify",
+             "POST",
+             _url("otp-verify"),
+             data=lambda ctx: {
+                 "user_id": str(ctx.reader.pk),
+                 "otp": "000000"
+             },
+             expect=(200, 400)),
+    Scenario("resend-otp",
+             "POST",
+             _url("resend-otp"),
+             data=lambda ctx: {"user_id": str(ctx.reader.pk)},
+             expect=(200, 400, 429)),
+    Scenario("user-profile", "GET", _url("user-profile"), auth="user"),
+    Scenario("user-profile",
+             "PUT",
+             _url("user-profile"),
+             data=lambda ctx: {"full_name": f"Reader {ctx.next_id()}"},
+             auth="user"),
+    Scenario("token-refresh",
+             "POST",
+             _url("token-refresh"),
+             data=lambda ctx: {"refresh_token": ctx.refresh_token()}),
+    Scenario("logout",
+             "POST",
+             _url("logout"),
+             data=lambda ctx: {"refresh_token": ctx.refresh_token()},
+             auth="user",
+             expect=(200, 205)),
+]
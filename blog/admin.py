@@ -4,13 +4,13 @@ from .models import Blog, Category
 
 class BlogAdmin(admin.ModelAdmin):
     list_display = ('title', 'author', 'slug', 'short_description', 'category',
-                    'body', 'image')
+                    'body', 'image', 'comment_count')
     search_fields = ('title', 'category__name', 'author__username')
     prepopulated_fields = {'slug': ('title', )}
 
 
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'slug', 'description')
+    list_display = ('name', 'slug', 'description', 'blog_count')
     search_fields = ('name', )
 
 
@@ -0,0 +1,137 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+
+from ByteBlogger.replicas import use_replica
+from users.utils.async_views import (async_authenticated, async_read_view,
+                                     json_response, not_found)
+from .cache import (aget_blog_version, aget_cached_detail, aset_cached_detail,
+                    aget_cached_validators, aset_cached_validators,
+                    aget_list_version)
+from .conditional import (list_validators, ablog_validators,
+                          not_modified, set_validators)
+from .models import Blog, Category
+from .pagination import apaginate_keyset, akeyset_page, InvalidCursor
+from .read_serializers import CommentReadSerializer
+from .views import (BlogListView, BlogDetailView, BlogByCategoryView,
+                    BlogCommentListView, LIST_FIELDS, CATEGORY_LIST_FIELDS,
+                    COMMENT_FIELDS, blog_detail_data, comments_for_blog)
+
+# Native async GET handlers for the blog read routes, served in place of
+# the sync views when ASYNC_READ_VIEWS is on (the ASGI entry point turns it
+# on). Responses match the sync views; other methods go to the sync views.
+
+
+@async_authenticated(required=True)
+async def blog_list_get(request):
+    etag, last_modified = list_validators(request, await aget_list_version())
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    try:
+        blogs, next_url = await apaginate_keyset(request, Blog.objects.all(),
+                                                 *LIST_FIELDS)
+    except InvalidCursor as exc:
+        return json_response({'error': str(exc)},
+                             status=status.HTTP_400_BAD_REQUEST)
+
+    response = json_response({'results': blogs, 'next': next_url})
+    return set_validators(response, etag, last_modified)
+
+
+@async_authenticated()
+async def blog_detail_get(request, slug):
+    version = await aget_blog_version(slug)
+
+    validators = await aget_cached_validators(slug, version)
+    if validators is None:
+        # Cache fills read the primary, as in BlogDetailView
+        with use_replica(False):
+            validators = await ablog_validators(
+                Blog.objects.filter(slug=slug))
+        if validators is None:
+            return not_found()
+        await aset_cached_validators(slug, version, validators)
+
+    etag, last_modified = validators
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    blog_data = await aget_cached_detail(slug, version)
+    if blog_data is None:
+        with use_replica(False):
+            try:
+                blog = await Blog.objects.select_related(
+                    'category', 'author').aget(slug=slug)
+            except Blog.DoesNotExist:
+                return not_found()
+            comments, next_cursor = await akeyset_page(
+                comments_for_blog(blog.id), fields=COMMENT_FIELDS)
+
+        # Remote storage backends may sign or look up the image URLs,
+        # which is blocking I/O
+        blog_data = await sync_to_async(blog_detail_data)(request, blog,
+                                                          comments,
+                                                          next_cursor)
+        await aset_cached_detail(slug, version, blog_data)
+
+    response = json_response(blog_data)
+    return set_validators(response, etag, last_modified)
+
+
+@async_authenticated()
+async def blog_by_category_get(request, category_slug):
+    list_version = await aget_list_version()
+    try:
+        category = await Category.objects.aget(slug=category_slug)
+    except Category.DoesNotExist:
+        return not_found()
+
+    queryset = Blog.objects.filter(category=category)
+    etag, last_modified = list_validators(request, list_version)
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    try:
+        blogs, next_url = await apaginate_keyset(request, queryset,
+                                                 *CATEGORY_LIST_FIELDS)
+    except InvalidCursor as exc:
+        return json_response({'error': str(exc)},
+                             status=status.HTTP_400_BAD_REQUEST)
+
+    response = json_response({
+        'count': category.blog_count,
+        'results': blogs,
+        'next': next_url
+    })
+    return set_validators(response, etag, last_modified)
+
+
+@async_authenticated()
+async def blog_comments_get(request, slug):
+    blog_id = await Blog.objects.filter(slug=slug).values_list(
+        'id', flat=True).afirst()
+    if blog_id is None:
+        return not_found()
+
+    try:
+        comments, next_url = await apaginate_keyset(
+            request, comments_for_blog(blog_id), *COMMENT_FIELDS)
+    except InvalidCursor as exc:
+        return json_response({'error': str(exc)},
+                             status=status.HTTP_400_BAD_REQUEST)
+
+    return json_response({
+        'results': CommentReadSerializer.many(comments),
+        'next': next_url
+    })
+
+
+blog_list = async_read_view(blog_list_get, BlogListView.as_view())
+blog_detail = async_read_view(blog_detail_get, BlogDetailView.as_view())
+blog_by_category = async_read_view(blog_by_category_get,
+                                   BlogByCategoryView.as_view())
+blog_comments = async_read_view(blog_comments_get,
+                                BlogCommentListView.as_view())
@@ -0,0 +1,173 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+DETAIL_CACHE_TIMEOUT = getattr(settings, "BLOG_DETAIL_CACHE_TIMEOUT", 60 * 60)
+FEED_CACHE_TIMEOUT = getattr(settings, "BLOG_FEED_CACHE_TIMEOUT",
+                             24 * 60 * 60)
+
+
+# VERSION KEYS
+def _version_key(slug):
+    return f"blog:version:{slug}"
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def _aget_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, uuid.uuid4().hex, timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def get_blog_version(slug):
+    """
+    Returns the current cache version for a blog, creating one if missing.
+    """
+    return _get_version(_version_key(slug))
+
+
+async def aget_blog_version(slug):
+    return await _aget_version(_version_key(slug))
+
+
+def bump_blog_version(slug):
+    """
+    Moves a blog to a fresh version so every cached entry for it is orphaned.
+    Random versions avoid serving stale data if the version key is evicted.
+    """
+    if slug:
+        cache.set(_version_key(slug), uuid.uuid4().hex, timeout=None)
+
+
+# LIST VERSION
+# One version for every list route. Any write that can change a list row
+# moves it, so list validators never need a whole-table aggregate.
+LIST_VERSION_KEY = "blog:list-version"
+
+
+def _new_list_version():
+    return uuid.uuid4().hex, timezone.now()
+
+
+def get_list_version():
+    """
+    Returns (version, changed_at), creating it if missing. A recreated
+    version starts at now, which only makes clients refetch once.
+    """
+    version = cache.get(LIST_VERSION_KEY)
+    if version is None:
+        cache.add(LIST_VERSION_KEY, _new_list_version(), timeout=None)
+        version = cache.get(LIST_VERSION_KEY)
+    return version
+
+
+async def aget_list_version():
+    version = await cache.aget(LIST_VERSION_KEY)
+    if version is None:
+        await cache.aadd(LIST_VERSION_KEY, _new_list_version(), timeout=None)
+        version = await cache.aget(LIST_VERSION_KEY)
+    return version
+
+
+def bump_list_version():
+    cache.set(LIST_VERSION_KEY, _new_list_version(), timeout=None)
+
+
+# DETAIL RESPONSE CACHE
+def _detail_key(slug, version):
+    return f"blog:detail:{slug}:{version}"
+
+
+def get_cached_detail(slug, version):
+    return cache.get(_detail_key(slug, version))
+
+
+async def aget_cached_detail(slug, version):
+    return await cache.aget(_detail_key(slug, version))
+
+
+def set_cached_detail(slug, version, data):
+    """
+    Stores under the version read before the DB load, so a write that
+    lands mid-request cannot publish stale data under the new version.
+    """
+    cache.set(_detail_key(slug, version), data, DETAIL_CACHE_TIMEOUT)
+
+
+async def aset_cached_detail(slug, version, data):
+    await cache.aset(_detail_key(slug, version), data, DETAIL_CACHE_TIMEOUT)
+
+
+# CONDITIONAL GET VALIDATORS
+def _validators_key(slug, version):
+    return f"blog:validators:{slug}:{version}"
+
+
+def get_cached_validators(slug, version):
+    return cache.get(_validators_key(slug, version))
+
+
+async def aget_cached_validators(slug, version):
+    return await cache.aget(_validators_key(slug, version))
+
+
+def set_cached_validators(slug, version, validators):
+    cache.set(_validators_key(slug, version), validators,
+              DETAIL_CACHE_TIMEOUT)
+
+
+async def aset_cached_validators(slug, version, validators):
+    await cache.aset(_validators_key(slug, version), validators,
+                     DETAIL_CACHE_TIMEOUT)
+
+
+# FEEDS
+def feed_scope(category_slug=None):
+    """
+    Site-wide feed, or one category's. Kept apart from category slugs so a
+    category can be called anything.
+    """
+    return "site" if category_slug is None else f"category:{category_slug}"
+
+
+def _feed_version_key(scope):
+    return f"blog:feed-version:{scope}"
+
+
+def get_feed_version(scope):
+    return _get_version(_feed_version_key(scope))
+
+
+def bump_feed_versions(*category_slugs):
+    """
+    Orphans the site-wide feeds and those of the given categories.
+    """
+    scopes = {feed_scope()}
+    scopes.update(feed_scope(slug) for slug in category_slugs if slug)
+    versions = {_feed_version_key(scope): uuid.uuid4().hex for scope in scopes}
+    cache.set_many(versions, timeout=None)
+
+
+def _feed_key(scope, version, feed_format, site_url):
+    # Feeds hold absolute links, so each site URL gets its own copy
+    return f"blog:feed:{scope}:{version}:{feed_format}:{site_url}"
+
+
+def get_cached_feed(scope, version, feed_format, site_url):
+    return cache.get(_feed_key(scope, version, feed_format, site_url))
+
+
+def set_cached_feed(scope, version, feed_format, site_url, feed):
+    cache.set(_feed_key(scope, version, feed_format, site_url), feed,
+              FEED_CACHE_TIMEOUT)
@@ -0,0 +1,78 @@
+import hashlib
+
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+# VALIDATORS
+def make_etag(*parts):
+    """
+    Strong ETag over the given parts (timestamps, counts, request path).
+    """
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def latest(*timestamps):
+    timestamps = [ts for ts in timestamps if ts is not None]
+    return max(timestamps) if timestamps else None
+
+
+def list_validators(request, list_version):
+    """
+    Validators for a list route from the list version (see blog/cache.py),
+    without a query. The full path is part of the ETag so each cursor page
+    gets its own.
+    """
+    version, changed_at = list_version
+    return make_etag(request.get_full_path(), version), changed_at
+
+
+def _blog_stats(queryset):
+    return queryset.annotate(
+        last_comment=Max("comments__created_at")).values(
+            "slug", "updated_at", "last_comment", "comment_count")
+
+
+def _blog_validators(stats):
+    if stats is None:
+        return None
+
+    etag = make_etag(stats["slug"], stats["updated_at"],
+                     stats["last_comment"], stats["comment_count"])
+    return etag, latest(stats["updated_at"], stats["last_comment"])
+
+
+def blog_validators(queryset):
+    """
+    Validators for a single blog, covering its comments.
+    Returns None if the blog does not exist.
+    """
+    return _blog_validators(_blog_stats(queryset).first())
+
+
+async def ablog_validators(queryset):
+    return _blog_validators(await _blog_stats(queryset).afirst())
+
+
+# RESPONSES
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Returns a 304 (or 412) response if the client's copy is current.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp())
+        if last_modified else None)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,101 @@
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Blog, Comment
+
+EXPORT_CHUNK_SIZE = 2000
+
+BLOG_FIELDS = ("id", "title", "slug", "short_description", "body", "image",
+               "category_id", "category__name", "author_id",
+               "author__email", "created_at", "updated_at")
+COMMENT_FIELDS = ("id", "blog_id", "user_id", "content", "created_at")
+
+EXPORT_TYPES = ("blog", "comment")
+
+
+def parse_since(value):
+    """
+    Parses an ISO timestamp lower bound. Naive values use the current zone.
+    Raises ValueError if the value is not a timestamp.
+    """
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+# ROW ITERATION
+def _keyset_rows(queryset, fields, chunk_size):
+    """
+    Walks a queryset in id order, one bounded batch per query.
+    """
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id).order_by("id").values(
+                *fields)[:chunk_size])
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1]["id"]
+
+
+def iter_records(types=EXPORT_TYPES, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields (type, row) for blogs changed since `since`, then comments
+    created since `since` (comments are never edited).
+    """
+    if "blog" in types:
+        blogs = Blog.objects.all()
+        if since:
+            blogs = blogs.filter(updated_at__gte=since)
+        for row in _keyset_rows(blogs, BLOG_FIELDS, chunk_size):
+            yield "blog", row
+
+    if "comment" in types:
+        comments = Comment.objects.all()
+        if since:
+            comments = comments.filter(created_at__gte=since)
+        for row in _keyset_rows(comments, COMMENT_FIELDS, chunk_size):
+            yield "comment", row
+
+
+# ENCODING
+def iter_ndjson(records):
+    for record_type, row in records:
+        yield (json.dumps({
+            "type": record_type,
+            **row
+        }, cls=DjangoJSONEncoder) + "\n").encode()
+
+
+def iter_gzip(chunks, flush_bytes=64 * 1024):
+    """
+    Gzip-compresses a byte stream on the fly, emitting roughly every
+    flush_bytes of input so memory stays bounded.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    pending = 0
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        pending += len(chunk)
+        if pending >= flush_bytes:
+            out += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_stream(types=EXPORT_TYPES,
+                  since=None,
+                  compress=False,
+                  chunk_size=EXPORT_CHUNK_SIZE):
+    stream = iter_ndjson(iter_records(types, since, chunk_size))
+    return iter_gzip(stream) if compress else stream
@@ -0,0 +1,132 @@
+import hashlib
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+from ByteBlogger.renderers import json_dumps
+from ByteBlogger.replicas import use_replica
+from .models import Blog
+
+FEED_SIZE = getattr(settings, "BLOG_FEED_SIZE", 20)
+FEED_TITLE = getattr(settings, "BLOG_FEED_TITLE", "ByteBlogger")
+# Scheme and host for feed links, e.g. "https://byteblogger.example"
+SITE_URL = getattr(settings, "SITE_URL", None)
+
+FEED_FORMATS = {
+    "rss": "application/rss+xml; charset=utf-8",
+    "atom": "application/atom+xml; charset=utf-8",
+    "json": "application/feed+json",
+}
+
+SYNDICATION_FEEDS = {"rss": Rss201rev2Feed, "atom": Atom1Feed}
+
+JSON_FEED_VERSION = "https://jsonfeed.org/version/1.1"
+
+FEED_FIELDS = ("title", "slug", "short_description", "created_at",
+               "updated_at", "author__username", "category__name")
+
+
+def latest_posts(category=None):
+    """
+    The newest FEED_SIZE posts, site-wide or in one category.
+    """
+    queryset = Blog.objects.all()
+    if category is not None:
+        queryset = queryset.filter(category=category)
+
+    # Read the primary: the result is cached until the next change, so a
+    # lagging replica would be served for that long
+    with use_replica(False):
+        return list(
+            queryset.order_by("-created_at",
+                              "-id").values(*FEED_FIELDS)[:FEED_SIZE])
+
+
+def site_url(request):
+    """
+    Scheme and host that feed links start with: SITE_URL when configured,
+    else the request's. Cached feeds are keyed on it, so a feed rendered
+    for one host is never served to another.
+    """
+    return (SITE_URL or f"{request.scheme}://{request.get_host()}").rstrip("/")
+
+
+# RENDERING
+def _syndication_feed(feed_class, meta, posts):
+    feed = feed_class(title=meta["title"],
+                      link=meta["link"],
+                      description=meta["description"],
+                      feed_url=meta["feed_url"],
+                      language=settings.LANGUAGE_CODE)
+    for post in posts:
+        feed.add_item(title=post["title"],
+                      link=post["url"],
+                      description=post["short_description"],
+                      unique_id=post["url"],
+                      pubdate=post["created_at"],
+                      updateddate=post["updated_at"],
+                      author_name=post["author__username"],
+                      categories=[post["category__name"]])
+    return feed.writeString("utf-8").encode()
+
+
+def _json_feed(meta, posts):
+    return json_dumps({
+        "version": JSON_FEED_VERSION,
+        "title": meta["title"],
+        "home_page_url": meta["link"],
+        "feed_url": meta["feed_url"],
+        "description": meta["description"],
+        "language": settings.LANGUAGE_CODE,
+        "items": [{
+            "id": post["url"],
+            "url": post["url"],
+            "title": post["title"],
+            "summary": post["short_description"],
+            "date_published": post["created_at"],
+            "date_modified": post["updated_at"],
+            "authors": [{
+                "name": post["author__username"]
+            }],
+            "tags": [post["category__name"]],
+        } for post in posts],
+    })
+
+
+def build_feed(request, feed_format, category=None):
+    """
+    Renders a feed of the latest posts. Returns (content, content_type,
+    etag, last_modified), ready to cache. Links are absolute URLs on
+    site_url(request).
+    """
+    base = site_url(request)
+    posts = latest_posts(category)
+    for post in posts:
+        post["url"] = base + reverse("blog-detail", args=[post["slug"]])
+
+    if category is None:
+        meta = {
+            "title": FEED_TITLE,
+            "description": f"Latest posts on {FEED_TITLE}",
+            "link": base + reverse("blog-list"),
+        }
+    else:
+        meta = {
+            "title": f"{FEED_TITLE}: {category.name}",
+            "description": category.description
+            or f"Latest {category.name} posts on {FEED_TITLE}",
+            "link": base + reverse("blogs-by-category",
+                                   args=[category.slug]),
+        }
+    meta["feed_url"] = base + request.path
+
+    if feed_format == "json":
+        content = _json_feed(meta, posts)
+    else:
+        content = _syndication_feed(SYNDICATION_FEEDS[feed_format], meta,
+                                    posts)
+
+    etag = f'"{hashlib.sha1(content).hexdigest()}"'
+    last_modified = max((post["updated_at"] for post in posts), default=None)
+    return content, FEED_FORMATS[feed_format], etag, last_modified
@@ -0,0 +1,54 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.export import (EXPORT_CHUNK_SIZE, EXPORT_TYPES, export_stream,
+                         parse_since)
+
+
+class Command(BaseCommand):
+    help = "Stream blogs and comments as NDJSON, optionally gzip-compressed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output",
+                            default="-",
+                            help="Output file, or '-' for stdout.")
+        parser.add_argument("--since",
+                            help="Only rows changed at or after this "
+                            "ISO timestamp.")
+        parser.add_argument("--type",
+                            choices=EXPORT_TYPES,
+                            action="append",
+                            dest="types",
+                            help="Record type to export (repeatable).")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--chunk-size",
+                            type=int,
+                            default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_since(
+                options["since"]) if options["since"] else None
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        stream = export_stream(options["types"] or EXPORT_TYPES, since,
+                               options["gzip"], options["chunk_size"])
+
+        output = (sys.stdout.buffer if options["output"] == "-" else open(
+            options["output"], "wb"))
+
+        started = time.monotonic()
+        written = 0
+        try:
+            for chunk in stream:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if options["output"] != "-":
+                output.close()
+
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stderr.write(f"Wrote {written} bytes in {elapsed:.1f}s.")
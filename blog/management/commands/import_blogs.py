@@ -0,0 +1,200 @@
+import csv
+import io
+import json
+import sys
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from blog.cache import bump_feed_versions, bump_list_version
+from blog.models import SLUG_RETRIES, Blog, Category
+from blog.search import INDEXED_FIELDS, index_blogs
+from blog.slugs import SlugAllocator
+
+User = get_user_model()
+
+REQUIRED_FIELDS = ("title", "short_description", "body", "category",
+                   "author")
+
+
+class Command(BaseCommand):
+    help = ("Bulk import blogs from NDJSON or CSV (file or '-' for stdin). "
+            "Each record needs title, short_description, body, category "
+            "(name) and author (email).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or '-' for stdin.")
+        parser.add_argument("--format", choices=["ndjson", "csv"])
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--create-categories",
+                            action="store_true",
+                            help="Create categories that do not exist.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else
+                                    "ndjson")
+        batch_size = options["batch_size"]
+        self.create_categories = options["create_categories"]
+
+        self.categories = dict(Category.objects.values_list("name", "id"))
+        # Names looked up and not found, so later batches don't ask again
+        self.missing_categories = set()
+        self.slugs = SlugAllocator(Blog, fallback="blog")
+        self.skipped = 0
+        self.touched_categories = set()
+
+        stream = (io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+                  if path == "-" else open(path, encoding="utf-8",
+                                           newline=""))
+
+        started = time.monotonic()
+        imported = 0
+        try:
+            batch = []
+            for record in self._records(stream, fmt):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    imported += self._import_batch(batch)
+                    batch = []
+                    self._report(imported, started)
+            imported += self._import_batch(batch)
+        finally:
+            if path != "-":
+                stream.close()
+            if imported:
+                self._invalidate_caches()
+
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} blogs in {elapsed:.1f}s "
+                f"({imported / elapsed:.0f} rows/s), skipped {self.skipped}."
+            ))
+
+    # INPUT
+    def _records(self, stream, fmt):
+        if fmt == "csv":
+            yield from csv.DictReader(stream)
+            return
+
+        for line_no, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                self._skip(f"line {line_no}: invalid JSON")
+
+    def _skip(self, reason):
+        self.skipped += 1
+        self.stderr.write(f"Skipped {reason}")
+
+    # LOOKUPS
+    def _resolve_authors(self, batch):
+        """
+        Maps the batch's author emails to ids. Not kept across batches, so
+        memory does not grow with the number of distinct authors.
+        """
+        emails = {(r.get("author") or "").lower() for r in batch} - {""}
+        return dict(
+            User.objects.filter(email__in=emails).values_list("email", "id"))
+
+    def _resolve_categories(self, batch):
+        names = ({r.get("category") for r in batch} - set(self.categories) -
+                 self.missing_categories)
+        names.discard(None)
+        names.discard("")
+        if not names:
+            return
+
+        if self.create_categories:
+            new = [Category(name=name) for name in names]
+            SlugAllocator(Category, source_field="name",
+                          fallback="category").assign(new)
+            Category.objects.bulk_create(new, ignore_conflicts=True)
+
+        self.categories.update(
+            Category.objects.filter(name__in=names).values_list("name", "id"))
+        if not self.create_categories:
+            self.missing_categories.update(names - set(self.categories))
+
+    # WRITE
+    def _import_batch(self, batch):
+        if not batch:
+            return 0
+
+        authors = self._resolve_authors(batch)
+        self._resolve_categories(batch)
+
+        blogs = []
+        for record in batch:
+            missing = [f for f in REQUIRED_FIELDS if not record.get(f)]
+            if missing:
+                self._skip(f"{record.get('title')!r}: missing "
+                           f"{', '.join(missing)}")
+                continue
+
+            author_id = authors.get(record["author"].lower())
+            category_id = self.categories.get(record["category"])
+            if author_id is None or category_id is None:
+                self._skip(f"{record['title']!r}: unknown author or category")
+                continue
+
+            blogs.append(
+                Blog(title=record["title"],
+                     short_description=record["short_description"],
+                     body=record["body"],
+                     category_id=category_id,
+                     author_id=author_id,
+                     slug=record.get("slug") or ""))
+
+        requested = [b.slug for b in blogs]
+        for attempt in range(SLUG_RETRIES):
+            # Also de-duplicates slugs given in records
+            self.slugs.assign(blogs)
+            try:
+                self._write(blogs)
+                break
+            except IntegrityError:
+                # Retry only if a concurrent writer took one of the slugs;
+                # assigning again moves those rows to the next suffix
+                taken = self.slugs.existing(b.slug for b in blogs)
+                if not taken or attempt == SLUG_RETRIES - 1:
+                    raise
+                for blog, slug in zip(blogs, requested):
+                    # An earlier INSERT of a split batch may have set ids
+                    blog.pk, blog.slug = None, slug
+                    blog._state.adding = True
+
+        self.touched_categories.update(b.category_id for b in blogs)
+        return len(blogs)
+
+    def _write(self, blogs):
+        # bulk_create skips signals, so apply their effects per batch
+        with transaction.atomic():
+            Blog.objects.bulk_create(blogs)
+
+            for category_id, n in Counter(b.category_id
+                                          for b in blogs).items():
+                Category.objects.filter(pk=category_id).update(
+                    blog_count=F("blog_count") + n)
+
+            index_blogs([(b.pk, *(getattr(b, f) for f in INDEXED_FIELDS))
+                         for b in blogs if b.pk is not None])
+
+    def _invalidate_caches(self):
+        # bulk_create sends no post_save, so do what the signals would,
+        # once, after the batches have committed
+        bump_list_version()
+        bump_feed_versions(*Category.objects.filter(
+            pk__in=self.touched_categories).values_list("slug", flat=True))
+
+    def _report(self, imported, started):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(f"{imported} blogs ({imported / elapsed:.0f} rows/s)")
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from blog.cache import bump_blog_version, bump_list_version
+from blog.models import Blog, Category, Comment
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized blog and category counters in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+
+        # Cached detail responses show the comment count
+        blogs = self._rebuild(Blog, Comment, "blog", "comment_count",
+                              chunk_size, on_fixed=self._bump_blogs)
+        categories = self._rebuild(Category, Blog, "category", "blog_count",
+                                   chunk_size)
+        if blogs or categories:
+            bump_list_version()  # List rows show the counters
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Fixed {blogs} blog and {categories} "
+                               "category counters."))
+
+    def _bump_blogs(self, slugs):
+        for slug in slugs:
+            bump_blog_version(slug)
+
+    def _rebuild(self, model, child_model, fk, field, chunk_size,
+                 on_fixed=None):
+        """
+        Walks the parent table in id order, counting children per chunk
+        and writing back only the rows that drifted. on_fixed gets the
+        slugs of each chunk's fixed rows once the chunk has committed.
+        """
+        fixed = 0
+        last_id = 0
+
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    model.objects.filter(id__gt=last_id).order_by(
+                        "id").select_for_update().values_list(
+                            "id", "slug", field)[:chunk_size])
+                if not rows:
+                    break
+
+                ids = [pk for pk, _, _ in rows]
+                actual = dict(
+                    child_model.objects.filter(**{
+                        f"{fk}_id__in": ids
+                    }).values_list(fk).annotate(n=Count("id")))
+
+                drifted = [(pk, slug) for pk, slug, stored in rows
+                           if stored != actual.get(pk, 0)]
+                model.objects.bulk_update([
+                    model(id=pk, **{field: actual.get(pk, 0)})
+                    for pk, _ in drifted
+                ], [field])
+
+            if on_fixed is not None and drifted:
+                on_fixed([slug for _, slug in drifted])
+            fixed += len(drifted)
+            last_id = ids[-1]
+
+        return fixed
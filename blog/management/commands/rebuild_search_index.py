@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from blog.models import Blog
+from blog.search import (INDEXED_FIELDS, clear_index, ensure_search_index,
+                         index_blogs, is_supported)
+
+
+class Command(BaseCommand):
+    help = "Rebuild the blog full-text search index in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        chunk_size = options["chunk_size"]
+
+        if not is_supported(connection):
+            self.stderr.write(
+                f"Full-text search is not supported on {connection.vendor}.")
+            return
+
+        ensure_search_index(connection)
+        clear_index(connection)
+
+        rows = Blog.objects.using(options["database"]).order_by(
+            "id").values_list("id", *INDEXED_FIELDS)
+
+        total = 0
+        chunk = []
+        for row in rows.iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                total += self._flush(chunk, connection)
+                chunk = []
+        total += self._flush(chunk, connection)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} blogs."))
+
+    def _flush(self, chunk, connection):
+        with transaction.atomic(using=connection.alias):
+            index_blogs(chunk, connection)
+        return len(chunk)
@@ -1,12 +1,21 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils.text import slugify
 
+from users.utils.images import srcset
+
+from .slugs import base_slug, next_free_slug
+
+# Attempts to allocate a slug when concurrent creates collide
+SLUG_RETRIES = 5
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     slug = models.SlugField(unique=True, blank=True)
+    # Maintained by signals; rebuild with `manage.py rebuild_counters`
+    blog_count = models.PositiveIntegerField(default=0, editable=False)
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -30,20 +39,34 @@ class Blog(models.Model):
                                limit_choices_to={'is_staff': True})
     body = models.TextField()
     image = models.ImageField(upload_to='blog_images/', null=True, blank=True)
+    # Resized copies of image; written by the derivative worker
+    image_variants = models.JSONField(default=dict, editable=False)
     category = models.ForeignKey('Category', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by signals; rebuild with `manage.py rebuild_counters`
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            unique_slug = base_slug
-            counter = 1
-            while Blog.objects.filter(slug=unique_slug).exists():
-                unique_slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = unique_slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        base = base_slug(Blog, self.title, fallback='blog')
+        for attempt in range(SLUG_RETRIES):
+            self.slug = next_free_slug(Blog, base)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                # Retry only if a concurrent create took the same slug
+                taken = Blog.objects.filter(slug=self.slug).exists()
+                self.slug = ''
+                if not taken or attempt == SLUG_RETRIES - 1:
+                    raise
+
+    @property
+    def image_srcset(self):
+        return srcset(self.image, self.image_variants)
 
     def __str__(self):
         return self.title
@@ -51,6 +74,11 @@ class Blog(models.Model):
     class Meta:
         verbose_name = 'Blog'
         verbose_name_plural = 'Blogs'
+        indexes = [
+            # Keyset pagination for the list and by-category routes
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['category', 'created_at', 'id']),
+        ]
 
 
 class Comment(models.Model):
@@ -67,3 +95,7 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of comments per blog
+            models.Index(fields=['blog', 'created_at', 'id']),
+        ]
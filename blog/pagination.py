@@ -0,0 +1,126 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.utils.urls import replace_query_param
+
+PAGE_SIZE = getattr(settings, "BLOG_PAGE_SIZE", 20)
+MAX_PAGE_SIZE = getattr(settings, "BLOG_MAX_PAGE_SIZE", 100)
+
+CURSOR_PARAM = "cursor"
+LIMIT_PARAM = "limit"
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+# CURSOR ENCODING
+def encode_cursor(created_at, pk):
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, pk = raw.rsplit("|", 1)
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise InvalidCursor("Invalid cursor.")
+
+    if created_at is None:
+        raise InvalidCursor("Invalid cursor.")
+
+    return created_at, pk
+
+
+def query_params(request):
+    """
+    DRF requests expose query_params; plain Django requests only GET.
+    """
+    return getattr(request, "query_params", request.GET)
+
+
+def get_page_size(request):
+    try:
+        size = int(query_params(request).get(LIMIT_PARAM, PAGE_SIZE))
+    except (TypeError, ValueError):
+        return PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+# KEYSET PAGINATION
+def _seek(queryset, cursor, page_size, fields):
+    queryset = queryset.order_by("-created_at", "-id")
+
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at)
+            | Q(created_at=created_at, id__lt=pk))
+
+    if fields:
+        queryset = queryset.values("id", "created_at", *fields)
+
+    return queryset[:page_size + 1]
+
+
+def _split_page(rows, page_size, fields):
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    if fields:
+        return rows, encode_cursor(last["created_at"], last["id"])
+    return rows, encode_cursor(last.created_at, last.pk)
+
+
+def keyset_page(queryset, cursor=None, page_size=PAGE_SIZE, fields=()):
+    """
+    Newest-first keyset page over (created_at, id).
+    - Seeks past the cursor instead of using OFFSET
+    - Fetches one extra row to detect the next page
+    Rows are values() dicts when fields are given, else model instances.
+    Returns (rows, next_cursor). Raises InvalidCursor on a bad cursor.
+    """
+    rows = list(_seek(queryset, cursor, page_size, fields))
+    return _split_page(rows, page_size, fields)
+
+
+async def akeyset_page(queryset, cursor=None, page_size=PAGE_SIZE, fields=()):
+    """
+    Async keyset_page using the async ORM.
+    """
+    rows = [row async for row in _seek(queryset, cursor, page_size, fields)]
+    return _split_page(rows, page_size, fields)
+
+
+def next_page_url(url, next_cursor):
+    if next_cursor is None:
+        return None
+    return replace_query_param(url, CURSOR_PARAM, next_cursor)
+
+
+def paginate_keyset(request, queryset, *fields):
+    """
+    Pages a queryset using the request's ?cursor= and ?limit=.
+    Returns (rows, next_url).
+    """
+    rows, next_cursor = keyset_page(queryset,
+                                    query_params(request).get(CURSOR_PARAM),
+                                    get_page_size(request), fields)
+    return rows, next_page_url(request.build_absolute_uri(), next_cursor)
+
+
+async def apaginate_keyset(request, queryset, *fields):
+    rows, next_cursor = await akeyset_page(
+        queryset,
+        query_params(request).get(CURSOR_PARAM), get_page_size(request),
+        fields)
+    return rows, next_page_url(request.build_absolute_uri(), next_cursor)
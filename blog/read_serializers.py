@@ -0,0 +1,143 @@
+from operator import attrgetter, itemgetter
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from ByteBlogger.metrics import serializing
+
+# Same format as CommentSerializer.created_at
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class DateTimeFormat:
+    """
+    Transform formatting datetimes like DRF's DateTimeField(format=...):
+    converted to the current time zone first. The zone is looked up once
+    per serialize call rather than per value.
+    """
+
+    def __init__(self, format):
+        self.format = format
+
+    def bind(self, zone):
+        format = self.format
+        # isoformat gives the same text as strftime(DATETIME_FORMAT) in
+        # half the time
+        iso = format == DATETIME_FORMAT
+
+        def to_string(value):
+            if value is None:
+                return None
+            value = value.astimezone(zone)
+            return value.isoformat(" ")[:19] if iso else value.strftime(format)
+
+        return to_string
+
+
+def file_url(value):
+    """
+    URL of a FileField value, or None. Accepts the FieldFile of an instance
+    or the stored name from a values() row.
+    """
+    if not value:
+        return None
+    return default_storage.url(str(value))
+
+
+class ReadSerializer:
+    """
+    Read-only serializer for hot GET paths. fields maps each output key to
+    a source, or to (source, transform). Sources use dots for relations
+    ("user.email") and are read as attributes on model instances or as
+    keys on values() rows ("user__email").
+
+    Getters are built once, when the subclass is defined, so serializing is
+    a single attrgetter/itemgetter call per object plus the transforms.
+    Writes keep using the DRF serializers for validation.
+    """
+
+    fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        sources, transforms = [], []
+        for name, spec in cls.fields.items():
+            source, transform = spec if isinstance(spec, tuple) else (spec,
+                                                                      None)
+            sources.append(source)
+            if transform is not None:
+                transforms.append((name, transform))
+
+        cls.names = tuple(cls.fields)
+        cls.row_fields = tuple(source.replace(".", "__") for source in sources)
+        cls.transforms = tuple(transforms)
+        # Both getters return a tuple even for a single field
+        cls._get_attributes = attrgetter(*sources, *sources[:1])
+        cls._get_items = itemgetter(*cls.row_fields, *cls.row_fields[:1])
+
+    @classmethod
+    def _bound_transforms(cls):
+        if not any(isinstance(t, DateTimeFormat) for _, t in cls.transforms):
+            return cls.transforms
+        zone = timezone.get_current_timezone()
+        return tuple(
+            (name, t.bind(zone) if isinstance(t, DateTimeFormat) else t)
+            for name, t in cls.transforms)
+
+    @classmethod
+    def _serialize(cls, objs):
+        if not objs:
+            return []
+        names = cls.names
+        get = (cls._get_items
+               if isinstance(objs[0], dict) else cls._get_attributes)
+        data = [dict(zip(names, get(obj))) for obj in objs]
+        for name, transform in cls._bound_transforms():
+            for item in data:
+                item[name] = transform(item[name])
+        return data
+
+    @classmethod
+    def many(cls, objs):
+        """
+        Serializes a list of instances or a list of values() rows.
+        """
+        with serializing():
+            return cls._serialize(list(objs))
+
+    @classmethod
+    def one(cls, obj):
+        with serializing():
+            return cls._serialize([obj])[0]
+
+
+class CommentReadSerializer(ReadSerializer):
+    """
+    Same output as CommentSerializer.
+    """
+
+    fields = {
+        "id": "id",
+        "user": "user.email",  # str(user)
+        "content": "content",
+        "created_at": ("created_at", DateTimeFormat(DATETIME_FORMAT)),
+        "blog": "blog_id",
+    }
+
+
+class BlogDetailReadSerializer(ReadSerializer):
+    """
+    Blog fields of the BlogDetailView payload; the view adds comments.
+    """
+
+    fields = {
+        "title": "title",
+        "short_description": "short_description",
+        "body": "body",
+        "category": "category.name",
+        "slug": "slug",
+        "comment_count": "comment_count",
+        "author": "author.username",
+        "image": ("image", file_url),
+        "image_srcset": "image_srcset",
+    }
@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import Blog
+
+SEARCH_TABLE = "blog_search"
+SEARCH_CONFIG = getattr(settings, "BLOG_SEARCH_CONFIG", "english")
+
+INDEXED_FIELDS = ("title", "short_description", "body")
+
+# Field weights: title > short description > body
+FTS5_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def _vendor(connection):
+    return connection.vendor if connection.vendor in ("postgresql",
+                                                      "sqlite") else None
+
+
+def is_supported(connection=default_connection):
+    return _vendor(connection) is not None
+
+
+# SCHEMA
+def ensure_search_index(connection=default_connection):
+    """
+    Creates the search shadow table if missing.
+    - PostgreSQL: weighted tsvector per blog with a GIN index
+    - SQLite: FTS5 virtual table keyed by the blog id as rowid
+    """
+    vendor = _vendor(connection)
+
+    with connection.cursor() as cursor:
+        if vendor == "postgresql":
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                f"blog_id bigint PRIMARY KEY REFERENCES {Blog._meta.db_table}"
+                f"(id) ON DELETE CASCADE, document tsvector NOT NULL)")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_gin "
+                f"ON {SEARCH_TABLE} USING gin (document)")
+        elif vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                f"USING fts5({', '.join(INDEXED_FIELDS)}, "
+                f"tokenize='porter unicode61')")
+
+
+# INDEXING
+def index_blogs(rows, connection=default_connection):
+    """
+    Upserts (id, title, short_description, body) rows into the index.
+    """
+    vendor = _vendor(connection)
+    if vendor is None:
+        return
+
+    rows = list(rows)
+    if not rows:
+        return
+
+    with connection.cursor() as cursor:
+        if vendor == "postgresql":
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (blog_id, document) VALUES (%s, "
+                "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'C')) "
+                "ON CONFLICT (blog_id) DO UPDATE SET document = "
+                "EXCLUDED.document",
+                [(pk, SEARCH_CONFIG, title, SEARCH_CONFIG, short,
+                  SEARCH_CONFIG, body) for pk, title, short, body in rows])
+        else:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {SEARCH_TABLE} "
+                f"(rowid, {', '.join(INDEXED_FIELDS)}) "
+                "VALUES (%s, %s, %s, %s)", rows)
+
+
+def index_blog(blog, connection=default_connection):
+    index_blogs([(blog.pk, blog.title, blog.short_description, blog.body)],
+                connection)
+
+
+def remove_blog(blog_id, connection=default_connection):
+    vendor = _vendor(connection)
+
+    with connection.cursor() as cursor:
+        if vendor == "postgresql":
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE blog_id = %s", [blog_id])
+        elif vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+                           [blog_id])
+
+
+def clear_index(connection=default_connection):
+    if is_supported(connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+
+# QUERYING
+def _fts5_query(query):
+    """
+    Quotes each term so user input cannot inject FTS5 query syntax.
+    """
+    terms = query.split()
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_blog_ids(query, limit, offset=0, connection=None):
+    """
+    Returns blog ids matching the query, best match first.
+    Falls back to an unranked icontains scan on other databases.
+    Reads from the alias the router picks for Blog, so searches are served
+    by a replica like other reads.
+    """
+    if connection is None:
+        connection = connections[router.db_for_read(Blog)]
+    vendor = _vendor(connection)
+
+    if vendor is None:
+        return list(
+            Blog.objects.using(connection.alias).filter(
+                Q(title__icontains=query)
+                | Q(short_description__icontains=query)
+                | Q(body__icontains=query)).order_by("-created_at").values_list(
+                    "id", flat=True)[offset:offset + limit])
+
+    with connection.cursor() as cursor:
+        if vendor == "postgresql":
+            cursor.execute(
+                f"SELECT s.blog_id FROM {SEARCH_TABLE} s, "
+                "websearch_to_tsquery(%s::regconfig, %s) q "
+                "WHERE s.document @@ q "
+                "ORDER BY ts_rank(s.document, q) DESC, s.blog_id DESC "
+                "LIMIT %s OFFSET %s", [SEARCH_CONFIG, query, limit, offset])
+        else:
+            fts_query = _fts5_query(query)
+            if not fts_query:
+                return []
+            weights = ", ".join(str(w) for w in FTS5_WEIGHTS)
+            cursor.execute(
+                f"SELECT rowid FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH %s "
+                f"ORDER BY bm25({SEARCH_TABLE}, {weights}), rowid DESC "
+                "LIMIT %s OFFSET %s", [fts_query, limit, offset])
+
+        return [row[0] for row in cursor.fetchall()]
@@ -1,15 +1,17 @@
 from rest_framework import serializers
+
+from ByteBlogger.metrics import TimedSerializerMixin
 from .models import Blog, Comment, Category
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Category
         fields = ['id', 'name', 'description', 'slug']
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField()
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", # type: ignore
                                            read_only=True)
@@ -19,7 +21,7 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'content', 'created_at', 'blog']
 
 
-class BlogSerializer(serializers.ModelSerializer):
+class BlogSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.StringRelatedField()
     category = CategorySerializer()
     comments = CommentSerializer(many=True, read_only=True)
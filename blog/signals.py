@@ -1,6 +1,15 @@
-from django.db.models.signals import post_migrate
+from django.db.models.signals import (post_migrate, pre_save, post_save,
+                                      pre_delete, post_delete)
 from django.contrib.auth.models import Group, Permission
 from django.apps import apps
+from django.db import connections, transaction
+
+from django.db.models import F
+
+from .models import Blog, Category, Comment
+from .cache import bump_blog_version, bump_feed_versions, bump_list_version
+from .search import ensure_search_index, index_blog, remove_blog
+from users.utils.images import schedule_derivatives
 
 
 def create_author_group(sender, **kwargs):
@@ -12,4 +21,177 @@ def create_author_group(sender, **kwargs):
         print("Author group ensured on migration.")
 
 
+def create_search_index(sender, using='default', **kwargs):
+    if sender == apps.get_app_config('blog'):
+        ensure_search_index(connections[using])
+
+
 post_migrate.connect(create_author_group)
+post_migrate.connect(create_search_index)
+
+
+def remember_old_state(sender, instance, **kwargs):
+    """
+    Records the stored slug and category so post_save can tell what moved.
+    """
+    if instance.pk:
+        old = Blog.objects.filter(pk=instance.pk).values(
+            'slug', 'category_id', 'category__slug').first()
+        if old:
+            instance._old_slug = old['slug']
+            instance._old_category_id = old['category_id']
+            instance._old_category_slug = old['category__slug']
+
+
+# CASCADES
+def remember_deleted_blog(sender, instance, origin=None, **kwargs):
+    """
+    Notes each blog a delete() call removes on the call's origin (the
+    instance or queryset delete() was called on), so comment receivers
+    can skip the per-comment work for comments deleted with their blog.
+    Blog's own post_delete receivers cover those blogs once.
+    """
+    if origin is not None:
+        if not hasattr(origin, '_deleted_blog_ids'):
+            origin._deleted_blog_ids = set()
+        origin._deleted_blog_ids.add(instance.pk)
+
+
+def deleted_with_blog(instance, origin):
+    return getattr(instance, 'blog_id', None) in getattr(
+        origin, '_deleted_blog_ids', ())
+
+
+# DETAIL CACHE INVALIDATION
+# Versions move once the write commits. Bumped earlier, a concurrent read
+# could cache the pre-commit state under the new version until it expires.
+
+
+def invalidate_blog(sender, instance, **kwargs):
+    slugs = {instance.slug, getattr(instance, '_old_slug', None)} - {None}
+    transaction.on_commit(
+        lambda: [bump_blog_version(slug) for slug in slugs])
+
+
+def invalidate_comment_blog(sender, instance, origin=None, **kwargs):
+    if deleted_with_blog(instance, origin):
+        return
+    slug = Blog.objects.filter(pk=instance.blog_id).values_list(
+        'slug', flat=True).first()
+    transaction.on_commit(lambda: bump_blog_version(slug))
+
+
+def invalidate_lists(sender, instance, origin=None, **kwargs):
+    # Titles, categories and counters all show up in list rows
+    if not deleted_with_blog(instance, origin):
+        transaction.on_commit(bump_list_version)
+
+
+# FEEDS
+def invalidate_feeds(sender, instance, **kwargs):
+    """
+    Orphans the site-wide feeds and those of the blog's category, and of
+    the category it moved out of, once the write commits. Feeds re-render
+    on their next request.
+    """
+    if Blog.category.is_cached(instance):
+        category_slug = instance.category.slug
+    else:
+        category_slug = Category.objects.filter(
+            pk=instance.category_id).values_list('slug', flat=True).first()
+    old_category_slug = getattr(instance, '_old_category_slug', None)
+    transaction.on_commit(
+        lambda: bump_feed_versions(category_slug, old_category_slug))
+
+
+def invalidate_category_feeds(sender, instance, **kwargs):
+    # Category names appear in feed titles and item tags
+    slug = instance.slug
+    transaction.on_commit(lambda: bump_feed_versions(slug))
+
+
+# SEARCH INDEX
+def update_search_index(sender, instance, using='default', **kwargs):
+    index_blog(instance, connections[using])
+
+
+def remove_from_search_index(sender, instance, using='default', **kwargs):
+    remove_blog(instance.pk, connections[using])
+
+
+# DENORMALIZED COUNTERS
+def count_blog(sender, instance, created, **kwargs):
+    old_category_id = getattr(instance, '_old_category_id', None)
+
+    if created:
+        Category.objects.filter(pk=instance.category_id).update(
+            blog_count=F('blog_count') + 1)
+    elif old_category_id and old_category_id != instance.category_id:
+        Category.objects.filter(pk=old_category_id).update(
+            blog_count=F('blog_count') - 1)
+        Category.objects.filter(pk=instance.category_id).update(
+            blog_count=F('blog_count') + 1)
+
+    instance._old_category_id = instance.category_id
+
+
+def uncount_blog(sender, instance, **kwargs):
+    Category.objects.filter(pk=instance.category_id,
+                            blog_count__gt=0).update(
+                                blog_count=F('blog_count') - 1)
+
+
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        Blog.objects.filter(pk=instance.blog_id).update(
+            comment_count=F('comment_count') + 1)
+
+
+def uncount_comment(sender, instance, origin=None, **kwargs):
+    if deleted_with_blog(instance, origin):
+        return
+    Blog.objects.filter(pk=instance.blog_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1)
+
+
+# IMAGE DERIVATIVES
+def resize_blog_image(sender, instance, created, **kwargs):
+    image = instance.image
+    if not image or instance.image_variants.get('source') == image.name:
+        return
+    pk, slug = instance.pk, instance.slug
+
+    def store_variants(variants):
+        # Filtered on the image so a late result can't land on a newer one
+        if Blog.objects.filter(pk=pk, image=variants['source']).update(
+                image_variants=variants):
+            bump_blog_version(slug)
+
+    schedule_derivatives(image, on_done=store_variants)
+
+
+# Counters are updated before cache invalidation so a re-cached detail
+# response never carries the old count under the new version.
+pre_save.connect(remember_old_state, sender=Blog)
+pre_delete.connect(remember_deleted_blog, sender=Blog)
+post_save.connect(count_blog, sender=Blog)
+post_delete.connect(uncount_blog, sender=Blog)
+post_save.connect(count_comment, sender=Comment)
+post_delete.connect(uncount_comment, sender=Comment)
+post_save.connect(invalidate_blog, sender=Blog)
+post_delete.connect(invalidate_blog, sender=Blog)
+post_save.connect(invalidate_comment_blog, sender=Comment)
+post_delete.connect(invalidate_comment_blog, sender=Comment)
+post_save.connect(invalidate_lists, sender=Blog)
+post_delete.connect(invalidate_lists, sender=Blog)
+post_save.connect(invalidate_lists, sender=Comment)
+post_delete.connect(invalidate_lists, sender=Comment)
+post_save.connect(invalidate_lists, sender=Category)
+post_delete.connect(invalidate_lists, sender=Category)
+post_save.connect(invalidate_feeds, sender=Blog)
+post_delete.connect(invalidate_feeds, sender=Blog)
+post_save.connect(invalidate_category_feeds, sender=Category)
+post_delete.connect(invalidate_category_feeds, sender=Category)
+post_save.connect(update_search_index, sender=Blog)
+post_delete.connect(remove_from_search_index, sender=Blog)
+post_save.connect(resize_blog_image, sender=Blog)
@@ -0,0 +1,104 @@
+from django.db.models import BigIntegerField, Max
+from django.db.models.functions import Cast, Substr
+from django.utils.text import slugify
+
+# Room left after the base slug for a "-<n>" suffix
+SUFFIX_ROOM = 10
+
+# Largest IN (...) list sent per query; SQLite caps bound parameters
+IN_BATCH_SIZE = 500
+
+
+def base_slug(model, text, fallback="item"):
+    """
+    Slugifies text, trimmed so a numeric suffix still fits the field.
+    """
+    max_length = model._meta.get_field("slug").max_length
+    base = slugify(text)[:max_length - SUFFIX_ROOM].rstrip("-")
+    return base or fallback
+
+
+def next_suffix(model, base):
+    """
+    Returns one past the highest n among "<base>-<n>" slugs, at least 1.
+    One query: the prefix filter can use the slug index, and the regex
+    only checks the suffixes of the rows it leaves, so non-numeric ones
+    ("<base>-world") never reach the cast.
+    """
+    prefix = f"{base}-"
+    highest = model.objects.filter(slug__startswith=prefix).annotate(
+        suffix=Substr("slug", len(prefix) + 1)).filter(
+            # 18 digits always fit a bigint
+            suffix__regex=r"^[0-9]{1,18}$").aggregate(
+                highest=Max(Cast("suffix", BigIntegerField())))["highest"]
+    return (highest or 0) + 1
+
+
+def next_free_slug(model, base):
+    """
+    Returns base if it is free (one indexed lookup, the common case), else
+    base with the next numeric suffix.
+    """
+    if not model.objects.filter(slug=base).exists():
+        return base
+    return f"{base}-{next_suffix(model, base)}"
+
+
+class SlugAllocator:
+    """
+    Assigns unique slugs to many unsaved instances in memory, for bulk
+    imports. Slugs the caller already set are treated as bases too, so
+    they are slugified and de-duplicated like generated ones.
+
+    State lasts one assign() call, so memory stays flat however long the
+    import runs. Save each batch before assigning the next: the database
+    is what remembers earlier batches, consulted once per batch for free
+    bases and once per duplicated base.
+    """
+
+    def __init__(self, model, source_field="title", fallback="item"):
+        self.model = model
+        self.source_field = source_field
+        self.fallback = fallback
+
+    def existing(self, slugs):
+        """
+        The given slugs that are already stored.
+        """
+        slugs = list(slugs)
+        existing = set()
+        for start in range(0, len(slugs), IN_BATCH_SIZE):
+            existing.update(
+                self.model.objects.filter(
+                    slug__in=slugs[start:start + IN_BATCH_SIZE]).values_list(
+                        "slug", flat=True))
+        return existing
+
+    def assign(self, instances):
+        """
+        Sets a unique slug on every instance. Returns the instances.
+        """
+        pending = [(obj,
+                    base_slug(self.model, obj.slug
+                              or getattr(obj, self.source_field),
+                              self.fallback)) for obj in instances]
+        bases = list(dict.fromkeys(base for _, base in pending))
+        existing = self.existing(bases)
+
+        next_n = {base: 0 for base in bases if base not in existing}
+        taken = set()
+        for obj, base in pending:
+            n = next_n.get(base)
+            if n is None:
+                # Base is used, in the database or earlier in this batch
+                n = next_suffix(self.model, base)
+            slug = base if n == 0 else f"{base}-{n}"
+            # Another base in this batch may already have produced the slug
+            while slug in taken:
+                n += 1
+                slug = f"{base}-{n}"
+            next_n[base] = None if n == 0 else n + 1
+            taken.add(slug)
+            obj.slug = slug
+
+        return instances
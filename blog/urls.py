@@ -1,14 +1,39 @@
+from django.conf import settings
 from django.urls import path
-from .views import BlogListView, BlogDetailView, BlogByCategoryView, CommentCreateView
+from .views import (BlogListView, BlogDetailView, BlogByCategoryView,
+                    BlogSearchView, BlogExportView, BlogCommentListView,
+                    CommentCreateView, BlogFeedView)
+
+if settings.ASYNC_READ_VIEWS:  # Native async GETs under ASGI
+    from .async_views import (blog_list, blog_detail, blog_by_category,
+                              blog_comments)
+else:
+    blog_list = BlogListView.as_view()
+    blog_detail = BlogDetailView.as_view()
+    blog_by_category = BlogByCategoryView.as_view()
+    blog_comments = BlogCommentListView.as_view()
 
 urlpatterns = [
-    path('blog/', BlogListView.as_view(), name='blog-list'
+    path('blog/', blog_list, name='blog-list'
          ),  # GET all blogs / POST new blog (only authors/admins)
-    path('blog/<slug:slug>/', BlogDetailView.as_view(),
-         name='blog-detail'),  # GET single blog
+    path('blog/search/', BlogSearchView.as_view(),
+         name='blog-search'),  # GET full-text search
+    path('blog/export/', BlogExportView.as_view(),
+         name='blog-export'),  # GET NDJSON dump (admins only)
+    path('blog/feed/<str:feed_format>/',
+         BlogFeedView.as_view(),
+         name='blog-feed'),  # GET RSS/Atom/JSON Feed of latest posts
+    path('blog/cat-<slug:category_slug>/feed/<str:feed_format>/',
+         BlogFeedView.as_view(),
+         name='category-feed'),  # GET feed of latest posts in category
     path('blog/cat-<slug:category_slug>/',
-         BlogByCategoryView.as_view(),
+         blog_by_category,
          name='blogs-by-category'),  # GET blogs in category
+    path('blog/<slug:slug>/', blog_detail,
+         name='blog-detail'),  # GET single blog
+    path('blog/<slug:slug>/comments/',
+         blog_comments,
+         name='blog-comments'),  # GET comments on a blog
     path('blog/<slug:slug>/comment/',
          CommentCreateView.as_view(),
          name='add-comment'),  # POST comment
@@ -4,13 +4,39 @@ from rest_framework.views import APIView
 from rest_framework import status, permissions
 from .models import Blog, Category, Comment
 from .serializers import BlogSerializer, CommentSerializer
-from django.contrib.auth.models import Group
+from .read_serializers import BlogDetailReadSerializer, CommentReadSerializer
+from .pagination import (paginate_keyset, keyset_page, next_page_url,
+                         get_page_size, InvalidCursor)
+from .search import search_blog_ids
+from rest_framework.utils.urls import replace_query_param
+from .cache import (get_blog_version, get_cached_detail, set_cached_detail,
+                    get_cached_validators, set_cached_validators,
+                    get_list_version, feed_scope, get_feed_version, get_cached_feed,
+                    set_cached_feed)
+from .conditional import (list_validators, blog_validators,
+                          not_modified, set_validators)
+from .export import EXPORT_TYPES, export_stream, parse_since
+from .feeds import FEED_FORMATS, build_feed, site_url
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views import View
+from django.urls import reverse
+from ByteBlogger.replicas import use_replica
+from users.utils.roles import has_role
+from users.throttles import CommentThrottle
+
+
+# Columns returned by the list routes
+LIST_FIELDS = ('title', 'short_description', 'category__name', 'slug',
+               'comment_count')
+CATEGORY_LIST_FIELDS = ('title', 'short_description', 'slug', 'comment_count')
+COMMENT_FIELDS = CommentReadSerializer.row_fields
 
 
 class BlogListView(APIView):
     """
     Route: /blog/
-    GET: Get all blogs (title, short description, category, and slug).
+    GET: Get blogs newest first (title, short description, category, and slug).
+         Paginated with ?cursor= and ?limit=. Supports conditional GET.
     POST: Create a new blog (only for authors & admins).
     """
 
@@ -18,19 +44,29 @@ class BlogListView(APIView):
                           ]  # Only logged-in users can post
 
     def get(self, request):
-        blogs = Blog.objects.all().values('title', 'short_description',
-                                          'category__name', 'slug')
-        return Response(blogs, status=status.HTTP_200_OK)
+        etag, last_modified = list_validators(request, get_list_version())
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        try:
+            blogs, next_url = paginate_keyset(request, Blog.objects.all(),
+                                              *LIST_FIELDS)
+        except InvalidCursor as exc:
+            return Response({'error': str(exc)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        response = Response({'results': blogs, 'next': next_url},
+                            status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
 
     def post(self, request):
         """
         Only users who are in the "Author" group or are admins can create blogs.
         """
         if not request.user.is_superuser:  # Admins can always create blogs
-            author_group = Group.objects.get(
-                name="Author")  # Fetch the "Author" group
-            if not author_group in request.user.groups.all(
-            ):  # Check user membership
+            if not has_role(request.user, "Author",
+                            request.auth):  # Cached group membership
                 return Response(
                     {'error': 'You do not have permission to create a blog.'},
                     status=status.HTTP_403_FORBIDDEN)
@@ -47,38 +83,233 @@ class BlogListView(APIView):
 class BlogDetailView(APIView):
     """
     Route: /blog/<blog_slug>/
-    Get details of a single blog, including comments.
+    Get details of a single blog, including the first page of comments.
+    Responses and validators are cached per blog version; see blog/cache.py.
+    Cache fills read the primary: a lagging replica would otherwise publish
+    stale data under the version a write just moved to, and the pinned
+    writer would read it back.
     """
 
     def get(self, request, slug):
-        blog = get_object_or_404(Blog, slug=slug)
-        comments = Comment.objects.filter(blog=blog)
-
-        blog_data = {
-            'title': blog.title,
-            'short_description': blog.short_description,
-            'body': blog.body,
-            'category': blog.category.name,
-            'slug': blog.slug,
-            'author': blog.author.username,
-            'image': blog.image.url if blog.image else None,
-            'comments': CommentSerializer(comments,
-                                          many=True).data  # Include comments
-        }
-        return Response(blog_data, status=status.HTTP_200_OK)
+        version = get_blog_version(slug)
+
+        validators = get_cached_validators(slug, version)
+        if validators is None:
+            with use_replica(False):
+                validators = blog_validators(Blog.objects.filter(slug=slug))
+            if validators is None:
+                raise Http404
+            set_cached_validators(slug, version, validators)
+
+        etag, last_modified = validators
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        blog_data = get_cached_detail(slug, version)
+        if blog_data is not None:
+            response = Response(blog_data, status=status.HTTP_200_OK)
+            return set_validators(response, etag, last_modified)
+
+        with use_replica(False):
+            blog = get_object_or_404(
+                Blog.objects.select_related('category', 'author'), slug=slug)
+            comments, next_cursor = keyset_page(comments_for_blog(blog.id),
+                                                fields=COMMENT_FIELDS)
+
+        blog_data = blog_detail_data(request, blog, comments, next_cursor)
+        set_cached_detail(slug, version, blog_data)
+        response = Response(blog_data, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
+
+
+def blog_detail_data(request, blog, comments, next_cursor):
+    """
+    Detail payload for a blog (category and author loaded) and its first
+    page of comments. Shared by the sync and async detail views.
+    """
+    comments_url = request.build_absolute_uri(
+        reverse('blog-comments', args=[blog.slug]))
+
+    blog_data = BlogDetailReadSerializer.one(blog)
+    blog_data['comments'] = CommentReadSerializer.many(comments)  # First page
+    blog_data['comments_next'] = next_page_url(comments_url, next_cursor)
+    return blog_data
 
 
 class BlogByCategoryView(APIView):
     """
     Route: /blog/cat-<category_slug>/
-    Get all blogs within a category with title, short description, and slug.
+    Get blogs within a category with title, short description, and slug.
+    Paginated with ?cursor= and ?limit=. Supports conditional GET.
     """
 
     def get(self, request, category_slug):
+        # Read before the category, so its count is never newer than the ETag
+        list_version = get_list_version()
         category = get_object_or_404(Category, slug=category_slug)
-        blogs = Blog.objects.filter(category=category).values(
-            'title', 'short_description', 'slug')
-        return Response(blogs, status=status.HTTP_200_OK)
+        etag, last_modified = list_validators(request, list_version)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        queryset = Blog.objects.filter(category=category)
+        try:
+            blogs, next_url = paginate_keyset(request, queryset,
+                                              *CATEGORY_LIST_FIELDS)
+        except InvalidCursor as exc:
+            return Response({'error': str(exc)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        response = Response(
+            {
+                'count': category.blog_count,
+                'results': blogs,
+                'next': next_url
+            },
+            status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
+
+
+class BlogSearchView(APIView):
+    """
+    Route: /blog/search/?q=<query>
+    Full-text search over title, short description, and body, best match
+    first. Paginated with ?page= and ?limit=.
+    """
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'Search query is required.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+        except ValueError:
+            page = 1
+        page_size = get_page_size(request)
+
+        blog_ids = search_blog_ids(query, page_size + 1,
+                                   (page - 1) * page_size)
+        has_next = len(blog_ids) > page_size
+        blog_ids = blog_ids[:page_size]
+
+        rows = Blog.objects.filter(id__in=blog_ids).values(
+            'id', 'title', 'short_description', 'category__name', 'slug',
+            'created_at')
+        by_id = {row['id']: row for row in rows}
+        results = [by_id[pk] for pk in blog_ids if pk in by_id]
+
+        next_url = None
+        if has_next:
+            next_url = replace_query_param(request.build_absolute_uri(),
+                                           'page', page + 1)
+
+        return Response({'results': results, 'next': next_url},
+                        status=status.HTTP_200_OK)
+
+
+class BlogExportView(APIView):
+    """
+    Route: /blog/export/
+    Stream all blogs and comments as NDJSON (admins only).
+    Query params: ?since=<ISO timestamp>, ?type=blog|comment, ?gzip=1.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        try:
+            since = parse_since(since) if since else None
+        except ValueError as exc:
+            return Response({'error': str(exc)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        types = [
+            t for t in request.query_params.getlist('type')
+            if t in EXPORT_TYPES
+        ] or EXPORT_TYPES
+        compress = request.query_params.get('gzip') in ('1', 'true')
+
+        response = StreamingHttpResponse(
+            export_stream(types, since, compress),
+            content_type='application/gzip'
+            if compress else 'application/x-ndjson')
+        filename = 'export.ndjson.gz' if compress else 'export.ndjson'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class BlogFeedView(View):
+    """
+    Route: /blog/feed/<format>/ and /blog/cat-<category_slug>/feed/<format>/
+    Latest posts site-wide or in one category, as RSS 2.0, Atom or JSON
+    Feed (format: rss, atom or json). Supports conditional GET.
+    A plain Django view: feeds are public, so no token is checked, and
+    polling costs one cache read until a post in the feed changes.
+    """
+
+    def get(self, request, feed_format, category_slug=None):
+        if feed_format not in FEED_FORMATS:
+            raise Http404
+
+        scope = feed_scope(category_slug)
+        version = get_feed_version(scope)
+        base_url = site_url(request)
+
+        feed = get_cached_feed(scope, version, feed_format, base_url)
+        if feed is None:
+            category = None
+            if category_slug is not None:
+                category = get_object_or_404(Category, slug=category_slug)
+            feed = build_feed(request, feed_format, category)
+            set_cached_feed(scope, version, feed_format, base_url, feed)
+
+        content, content_type, etag, last_modified = feed
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        response = HttpResponse(content, content_type=content_type)
+        return set_validators(response, etag, last_modified)
+
+
+def comments_for_blog(blog_id):
+    """
+    Comments of a blog. Page them with COMMENT_FIELDS: values() rows with
+    the author's email joined in, ready for CommentReadSerializer.
+    """
+    return Comment.objects.filter(blog_id=blog_id)
+
+
+class BlogCommentListView(APIView):
+    """
+    Route: /blog/<blog_slug>/comments/
+    Get comments on a blog, newest first. Paginated with ?cursor= and ?limit=.
+    """
+
+    def get(self, request, slug):
+        blog_id = Blog.objects.filter(slug=slug).values_list('id',
+                                                             flat=True).first()
+        if blog_id is None:
+            raise Http404
+
+        try:
+            comments, next_url = paginate_keyset(request,
+                                                 comments_for_blog(blog_id),
+                                                 *COMMENT_FIELDS)
+        except InvalidCursor as exc:
+            return Response({'error': str(exc)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                'results': CommentReadSerializer.many(comments),
+                'next': next_url
+            },
+            status=status.HTTP_200_OK)
 
 
 class CommentCreateView(APIView):
@@ -89,6 +320,7 @@ class CommentCreateView(APIView):
 
     permission_classes = [permissions.IsAuthenticated
                           ]  # Only logged-in users can comment
+    throttle_classes = [CommentThrottle]
 
     def post(self, request, slug):
         blog = get_object_or_404(Blog, slug=slug)
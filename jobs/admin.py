@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "status", "attempts", "run_at",
+                    "updated_at")
+    list_filter = ("status", "task")
+    search_fields = ("task", )
+    ordering = ("-created_at", )
+    readonly_fields = ("last_error", "created_at", "updated_at")
@@ -0,0 +1,80 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from jobs.queue import purge_finished_jobs, run_next_job
+
+
+class Command(BaseCommand):
+    help = "Run background job workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--poll-interval",
+                            type=float,
+                            default=1.0,
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--burst",
+                            action="store_true",
+                            help="Exit once the queue is empty.")
+        parser.add_argument("--purge-interval",
+                            type=float,
+                            default=3600,
+                            help="Seconds between purges of finished jobs "
+                            "(0 disables them).")
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+
+        threads = [
+            threading.Thread(target=self._work,
+                             args=(options["poll_interval"],
+                                   options["burst"]),
+                             name=f"job-worker-{n}",
+                             daemon=True)
+            for n in range(options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+
+        self.stdout.write(f"Started {len(threads)} job workers.")
+        purge_interval = options["purge_interval"]
+        next_purge = time.monotonic()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                # Finished jobs are purged here, so the table stays bounded
+                # without scheduling anything
+                if purge_interval and time.monotonic() >= next_purge:
+                    self._purge()
+                    next_purge = time.monotonic() + purge_interval
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+
+        self.stdout.write("Job workers stopped.")
+
+    def _purge(self):
+        try:
+            purge_finished_jobs()
+        except Exception as exc:  # Never take the workers down
+            self.stderr.write(f"Purging finished jobs failed: {exc}")
+        finally:
+            connection.close()
+
+    def _work(self, poll_interval, burst):
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                if run_next_job():
+                    continue
+                if burst:
+                    return
+                self.stopping.wait(poll_interval)
+        finally:
+            connection.close()
@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+
+
+# BACKGROUND JOB
+class Job(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    # Dotted path of a function decorated with jobs.queue.task
+    task = models.CharField(max_length=255)
+    kwargs = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=10,
+                              choices=STATUS_CHOICES,
+                              default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Worker polling: due pending jobs, stale running jobs
+            models.Index(fields=["status", "run_at"]),
+            models.Index(fields=["status", "locked_at"]),
+            # Retention purge of done and failed jobs
+            models.Index(fields=["status", "updated_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
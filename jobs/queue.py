@@ -0,0 +1,156 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_ATTEMPTS = getattr(settings, "JOB_MAX_ATTEMPTS", 5)
+JOB_RETRY_BASE_SECONDS = getattr(settings, "JOB_RETRY_BASE_SECONDS", 10)
+JOB_LOCK_TIMEOUT_SECONDS = getattr(settings, "JOB_LOCK_TIMEOUT_SECONDS", 300)
+JOB_RETENTION_DAYS = getattr(settings, "JOB_RETENTION_DAYS", 7)
+JOB_FAILED_RETENTION_DAYS = getattr(settings, "JOB_FAILED_RETENTION_DAYS", 30)
+JOB_PURGE_BATCH_SIZE = getattr(settings, "JOB_PURGE_BATCH_SIZE", 1000)
+
+
+class NotATask(Exception):
+    pass
+
+
+# TASK REGISTRATION
+def task(func):
+    """
+    Marks a function as runnable by workers and adds func.enqueue(**kwargs).
+    Arguments must be JSON-serializable keyword arguments.
+    """
+    func._is_job_task = True
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    def enqueue_task(run_at=None, **kwargs):
+        return enqueue(name, run_at=run_at, **kwargs)
+
+    func.enqueue = enqueue_task
+    return func
+
+
+def enqueue(task_name, max_attempts=JOB_MAX_ATTEMPTS, run_at=None, **kwargs):
+    """
+    Inserts a job once the current transaction commits, so workers never
+    see jobs for rolled-back work. Runs immediately outside a transaction.
+    run_at delays the job, e.g. for periodic tasks that reschedule
+    themselves.
+    """
+    transaction.on_commit(lambda: Job.objects.create(
+        task=task_name,
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+        run_at=run_at or timezone.now()))
+
+
+# CLAIMING
+def claim_job():
+    """
+    Claims one due job, or returns None.
+    The conditional UPDATE makes the claim atomic on every backend, so
+    concurrent workers never run the same job twice.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+
+    candidates = Job.objects.filter(
+        Q(status=Job.PENDING, run_at__lte=now)
+        | Q(status=Job.RUNNING, locked_at__lt=stale)).order_by(
+            "run_at").values_list("pk", "status", "locked_at")[:10]
+
+    for pk, job_status, locked_at in candidates:
+        claimed = Job.objects.filter(pk=pk,
+                                     status=job_status,
+                                     locked_at=locked_at).update(
+                                         status=Job.RUNNING, locked_at=now)
+        if claimed:
+            return Job.objects.get(pk=pk)
+
+    return None
+
+
+# EXECUTION
+def run_job(job):
+    """
+    Runs a claimed job, then marks it done or schedules a retry with
+    exponential backoff.
+    """
+    job.attempts += 1
+    try:
+        func = import_string(job.task)
+        if not getattr(func, "_is_job_task", False):
+            raise NotATask(f"{job.task} is not a registered task.")
+        func(**job.kwargs)
+    except Exception as exc:
+        job.last_error = traceback.format_exc()
+        # Unknown tasks will never succeed, so do not retry them
+        retryable = not isinstance(exc, (ImportError, NotATask))
+        if not retryable or job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            logger.error("Job %s (%s) failed permanently.", job.pk, job.task)
+        else:
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + timedelta(
+                seconds=JOB_RETRY_BASE_SECONDS * 2**(job.attempts - 1))
+            logger.warning("Job %s (%s) failed, retrying at %s.", job.pk,
+                           job.task, job.run_at)
+    else:
+        job.status = Job.DONE
+
+    job.locked_at = None
+    job.save(update_fields=[
+        "attempts", "status", "run_at", "locked_at", "last_error",
+        "updated_at"
+    ])
+    return job.status
+
+
+def run_next_job():
+    """
+    Claims and runs one job. Returns False when the queue is idle.
+    """
+    job = claim_job()
+    if job is None:
+        return False
+    run_job(job)
+    return True
+
+
+# RETENTION
+def purge_finished_jobs(batch_size=JOB_PURGE_BATCH_SIZE):
+    """
+    Deletes done jobs after JOB_RETENTION_DAYS and failed ones after
+    JOB_FAILED_RETENTION_DAYS, in bounded batches on the (status,
+    updated_at) index. Returns the number of jobs deleted.
+    """
+    now = timezone.now()
+    deleted = 0
+    for job_status, days in ((Job.DONE, JOB_RETENTION_DAYS),
+                             (Job.FAILED, JOB_FAILED_RETENTION_DAYS)):
+        cutoff = now - timedelta(days=days)
+        finished = Job.objects.filter(status=job_status,
+                                      updated_at__lt=cutoff)
+        while True:
+            batch = list(
+                finished.order_by("updated_at").values_list(
+                    "pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            deleted += Job.objects.filter(pk__in=batch).delete()[0]
+            if len(batch) < batch_size:
+                break
+
+    if deleted:
+        logger.info("Purged %s finished jobs.", deleted)
+    return deleted
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import Job
+from jobs.queue import (JOB_RETRY_BASE_SECONDS, claim_job,
+                        purge_finished_jobs, run_job, task)
+
+CALLS = []
+
+
+@task
+def record_call(value):
+    CALLS.append(value)
+
+
+@task
+def always_fails():
+    raise RuntimeError("SMTP down")
+
+
+def not_a_task():
+    pass
+
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        CALLS.clear()
+
+    def enqueue(self, func, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            func.enqueue(**kwargs)
+        return Job.objects.latest("pk")
+
+    def test_enqueue_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            record_call.enqueue(value=1)
+            self.assertFalse(Job.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+
+    def test_claimed_job_runs_once(self):
+        job = self.enqueue(record_call, value="hello")
+
+        claimed = claim_job()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertIsNone(claim_job())  # Already running
+
+        self.assertEqual(run_job(claimed), Job.DONE)
+        self.assertEqual(CALLS, ["hello"])
+
+    def test_failures_retry_with_exponential_backoff(self):
+        job = self.enqueue(always_fails)
+
+        for attempt in (1, 2):
+            before = timezone.now()
+            self.assertEqual(run_job(job), Job.PENDING)
+            delay = JOB_RETRY_BASE_SECONDS * 2**(attempt - 1)
+            self.assertGreaterEqual(job.run_at,
+                                    before + timedelta(seconds=delay))
+            self.assertIn("SMTP down", job.last_error)
+
+    def test_gives_up_after_max_attempts(self):
+        job = self.enqueue(always_fails)
+        job.max_attempts = 2
+        run_job(job)
+        self.assertEqual(run_job(job), Job.FAILED)
+        self.assertEqual(Job.objects.get(pk=job.pk).attempts, 2)
+
+    def test_unregistered_functions_fail_without_retry(self):
+        job = Job.objects.create(task=f"{__name__}.not_a_task")
+        self.assertEqual(run_job(job), Job.FAILED)
+        self.assertEqual(job.attempts, 1)
+
+
+class JobRetentionTests(TestCase):
+
+    def job(self, status, age_days):
+        job = Job.objects.create(task="jobs.tests.record_call", status=status)
+        Job.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(days=age_days))
+        return job
+
+    def test_purges_only_old_finished_jobs(self):
+        old_done = self.job(Job.DONE, queue.JOB_RETENTION_DAYS + 1)
+        recent_done = self.job(Job.DONE, 1)
+        old_failed = self.job(Job.FAILED, queue.JOB_FAILED_RETENTION_DAYS + 1)
+        kept_failed = self.job(Job.FAILED, queue.JOB_RETENTION_DAYS + 1)
+        old_pending = self.job(Job.PENDING, 365)
+
+        self.assertEqual(purge_finished_jobs(batch_size=1), 2)
+        self.assertEqual(
+            set(Job.objects.values_list("pk", flat=True)),
+            {recent_done.pk, kept_failed.pk, old_pending.pk})
+        self.assertFalse(
+            Job.objects.filter(pk__in=[old_done.pk, old_failed.pk]).exists())
@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from ByteBlogger.replicas import PRIMARY, use_replica
+from users.utils.user_cache import (aget_cached_user, aset_cached_user,
+                                   get_cached_user, set_cached_user,
+                                   token_version)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves users from a short-TTL cache keyed by
+    the user_id claim and the token's password version (see user_cache).
+    Entries are dropped on User post_save/post_delete, so deactivation,
+    password changes and verification apply immediately.
+
+    Misses read the primary even on replica-routed requests: a lagging
+    replica could otherwise put a stale user back into the cache.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = token_version(validated_token)
+        user = (get_cached_user(user_id, version)
+                if user_id is not None else None)
+
+        if user is None:
+            # Falls through to the DB, raising for unknown/inactive users
+            with use_replica(False):
+                user = super().get_user(validated_token)
+            set_cached_user(user, version)
+            return user
+
+        # The key already matched the password version, and the password
+        # itself is not cached
+        return self.check_user(user, validated_token, check_password=False)
+
+    def check_user(self, user, validated_token, check_password=True):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"),
+                                       code="user_inactive")
+
+        if not check_password or not api_settings.CHECK_REVOKE_TOKEN:
+            return user
+
+        if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(
+                    user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code="password_changed")
+
+        return user
+
+    # ASYNC
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"))
+
+        version = token_version(validated_token)
+        user = await aget_cached_user(user_id, version)
+        if user is None:
+            try:
+                user = await get_user_model().objects.using(PRIMARY).aget(
+                    **{api_settings.USER_ID_FIELD: user_id})
+            except get_user_model().DoesNotExist:
+                raise AuthenticationFailed(_("User not found"),
+                                           code="user_not_found")
+            self.check_user(user, validated_token)
+            await aset_cached_user(user, version)
+            return user
+
+        return self.check_user(user, validated_token, check_password=False)
+
+    async def aauthenticate(self, request):
+        """
+        Async authenticate() for plain Django async views.
+        Token parsing is CPU-only; only the user lookup awaits.
+        Returns (user, token) or None, raising AuthenticationFailed.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
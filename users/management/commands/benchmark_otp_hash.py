@@ -0,0 +1,37 @@
+import timeit
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+
+from users.utils.otp import generate_otp
+from users.utils.otp_hash import check_otp, hash_otp
+
+
+class Command(BaseCommand):
+    help = ("Compare per-call cost of the password hasher and the HMAC OTP "
+            "hasher.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        n = options["iterations"]
+        raw = generate_otp()
+        legacy = make_password(raw)
+        fast = hash_otp(raw)
+
+        cases = [
+            ("make_password", lambda: make_password(raw)),
+            ("check_password", lambda: check_password(raw, legacy)),
+            ("hash_otp", lambda: hash_otp(raw)),
+            ("check_otp", lambda: check_otp(raw, fast)),
+        ]
+
+        results = {}
+        for name, func in cases:
+            results[name] = timeit.timeit(func, number=n) / n
+            self.stdout.write(f"{name:<16}{results[name] * 1e6:>12.1f} us/call")
+
+        speedup = results["check_password"] / results["check_otp"]
+        self.stdout.write(
+            self.style.SUCCESS(f"check_otp is {speedup:,.0f}x faster."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from users.utils.otp import (OTP_PURGE_BATCH_SIZE, OTP_PURGE_PAUSE_SECONDS,
+                             purge_expired_otps)
+
+
+class Command(BaseCommand):
+    help = ("Delete OTP requests past expiry plus the 24h rate-limit window, "
+            "in batches.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size",
+                            type=int,
+                            default=OTP_PURGE_BATCH_SIZE)
+        parser.add_argument("--pause",
+                            type=float,
+                            default=OTP_PURGE_PAUSE_SECONDS,
+                            help="Seconds to sleep between batches.")
+        parser.add_argument("--schedule",
+                            type=int,
+                            metavar="SECONDS",
+                            help="Enqueue a background job that repeats "
+                            "every SECONDS instead of purging now.")
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            purge_expired_otps.enqueue(batch_size=options["batch_size"],
+                                       pause=options["pause"],
+                                       repeat_every=options["schedule"])
+            self.stdout.write(
+                self.style.SUCCESS("Scheduled OTP purge every "
+                                   f"{options['schedule']}s."))
+            return
+
+        deleted, elapsed = purge_expired_otps(options["batch_size"],
+                                              options["pause"])
+        rate = deleted / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {deleted} OTP requests in "
+                               f"{elapsed:.1f}s ({rate:.0f} rows/s)."))
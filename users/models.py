@@ -1,7 +1,7 @@
-from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db import models, transaction
+from django.contrib.auth.models import AbstractUser, Group
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.core.validators import EmailValidator
 from django.db.models import UniqueConstraint
@@ -9,6 +9,10 @@ from django.db.models.functions import Lower
 from datetime import timedelta
 import uuid
 
+from .utils.roles import invalidate_user_roles, invalidate_all_roles
+from .utils.images import schedule_derivatives
+from .utils.user_cache import invalidate_cached_user, password_version
+
 OTP_EXPIRY_MINUTES = 5
 
 
@@ -42,6 +46,15 @@ class User(AbstractUser):
             UniqueConstraint(Lower("email"), name="unique_lower_email")
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        if "password" in user.__dict__:
+            # Version as loaded, so the auth cache entry for the previous
+            # password can be dropped after a change
+            user._password_version = password_version(user.password)
+        return user
+
     def save(self, *args, **kwargs):
         # Normalize email before saving
         if self.email:
@@ -62,6 +75,8 @@ class UserProfile(models.Model):
                                null=True,
                                blank=True,
                                default="profile_avatars/default.png")
+    # Resized copies of avatar; written by the derivative worker
+    avatar_variants = models.JSONField(default=dict, editable=False)
 
     full_name = models.CharField(max_length=255, null=True, blank=True)
     topic_interests = models.TextField(null=True, blank=True)
@@ -76,6 +91,63 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
 
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_auth_cache(sender, instance, **kwargs):
+    # Drop the cached user used by CachedJWTAuthentication, for the
+    # password version as loaded and as saved. A deferred password was not
+    # changed and would cost a query to read.
+    versions = {getattr(instance, "_password_version", None)}
+    if "password" in instance.__dict__:
+        versions.add(password_version(instance.password))
+    versions.discard(None)
+    # After commit, so a concurrent request can't re-cache the old row
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(pk, *versions))
+
+
+@receiver(post_save, sender=UserProfile)
+def resize_avatar(sender, instance, **kwargs):
+    avatar = instance.avatar
+    if not avatar or instance.avatar_variants.get("source") == avatar.name:
+        return
+    pk = instance.pk
+
+    def store_variants(variants):
+        # Filtered on the avatar so a late result can't land on a newer one
+        UserProfile.objects.filter(pk=pk, avatar=variants["source"]).update(
+            avatar_variants=variants)
+
+    schedule_derivatives(avatar, on_done=store_variants)
+
+
+# ROLE CACHE INVALIDATION
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_group_change(sender, instance, action, reverse,
+                                     pk_set, **kwargs):
+    if not reverse:
+        # user.groups.add/remove/clear, once the rows have changed
+        if action not in ("post_add", "post_remove", "post_clear"):
+            return
+        user_ids = [instance.pk]
+    elif action == "pre_clear":
+        # group.user_set.clear(): collect members before they are removed
+        user_ids = list(instance.user_set.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove") and pk_set:
+        # group.user_set.add/remove
+        user_ids = list(pk_set)
+    else:
+        return
+    # After commit, so a concurrent request can't re-cache the old roles
+    transaction.on_commit(lambda: invalidate_user_roles(*user_ids))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_roles_on_group_save(sender, **kwargs):
+    transaction.on_commit(invalidate_all_roles)
+
+
 # OTP REQUEST (HARDENED)
 class OTPRequest(models.Model):
     user = models.ForeignKey(User,
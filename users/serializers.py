@@ -2,11 +2,13 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core.validators import FileExtensionValidator
 from django.utils.translation import gettext_lazy as _
+from ByteBlogger.metrics import TimedSerializerMixin
 from .models import User, UserProfile
+from .utils.images import srcset
 
 
 # USER SERIALIZER 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True,
                                      required=True,
                                      validators=[validate_password],
@@ -59,7 +61,8 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 # USER PROFILE SERIALIZER 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedSerializerMixin,
+                            serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
 
     avatar = serializers.ImageField(
@@ -70,11 +73,22 @@ class UserProfileSerializer(serializers.ModelSerializer):
                 allowed_extensions=["jpg", "jpeg", "png", "webp"])
         ])
 
+    avatar_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = UserProfile
-        fields = ['id', 'user', 'avatar', 'full_name', 'topic_interests']
+        fields = [
+            'id', 'user', 'avatar', 'avatar_srcset', 'full_name',
+            'topic_interests'
+        ]
         read_only_fields = ['id', 'user']
 
+    def get_avatar_srcset(self, obj):
+        """
+        Resized WebP/JPEG variants by width, once generated.
+        """
+        return srcset(obj.avatar, obj.avatar_variants)
+
     def validate_avatar(self, value):
         """
         Validate file size and ensure safe upload.
@@ -1,10 +1,11 @@
 from django.contrib.auth import authenticate
 from django.db import transaction
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from users.models import User
+from users.tokens import RefreshToken
 from users.serializers import UserSerializer
 from users.utils.otp import create_otp_request
+from users.utils.roles import add_roles_claim
 
 
 @transaction.atomic
@@ -36,7 +37,7 @@ def login_user(email, password):
         create_otp_request(user)
         return False, {"error": "Account not verified."}, 403
 
-    refresh = RefreshToken.for_user(user)
+    refresh = add_roles_claim(RefreshToken.for_user(user), user.pk)
 
     return True, {
         "access_token": str(refresh.access_token),
@@ -1,5 +1,8 @@
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from users.tokens import RefreshToken
+from users.utils.roles import add_roles_claim
 
 
 def refresh_tokens(refresh_token):
@@ -8,6 +11,9 @@ def refresh_tokens(refresh_token):
 
     try:
         refresh = RefreshToken(refresh_token)
+        # Roles come from the role cache by the token's user id, so a
+        # refresh does not load the user
+        add_roles_claim(refresh, refresh[api_settings.USER_ID_CLAIM])
 
         return True, {
             "access_token": str(refresh.access_token),
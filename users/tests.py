@@ -1,3 +1,500 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import CachedJWTAuthentication
+from users.models import OTPRequest
+from users.services.token_service import refresh_tokens
+from users.tokens import RefreshToken
+from users.utils import roles, token_blacklist
+from users.utils.images import (derivative_name, generate_derivatives,
+                                srcset)
+from users.utils.otp import (create_otp_request, otp_cooldown, otp_daily_limit,
+                             purge_expired_otps, validate_otp)
+from users.utils.otp_hash import check_otp, hash_otp
+from users.utils.ratelimit import SlidingWindowLimiter
+from users.utils.roles import get_user_roles, has_role
+from users.utils.token_blacklist import (REBUILD_REQUESTED_KEY, BloomFilter,
+                                         is_blacklisted, rebuild_filter)
+
+User = get_user_model()
+
+
+@mock.patch.object(token_blacklist, "FAST_NEGATIVES", True)
+class TokenBlacklistTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        token_blacklist._local.update(generation=None,
+                                      filter=None,
+                                      version=None,
+                                      checked=None)
+        self.user = User.objects.create_user(username="reader",
+                                             email="reader@example.com",
+                                             password="pass12345")
+
+    def refresh_filter(self):
+        token_blacklist._local["checked"] = None
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        jtis = [f"jti-{n}" for n in range(1000)]
+        for jti in jtis:
+            bloom.add(jti)
+        self.assertTrue(all(jti in bloom for jti in jtis))
+        misses = sum(f"other-{n}" in bloom for n in range(1000))
+        self.assertLess(misses, 50)
+
+    def test_without_filter_falls_back_to_db_and_requests_rebuild(self):
+        with self.assertNumQueries(1):
+            self.assertFalse(is_blacklisted("unknown"))
+        self.assertTrue(cache.get(REBUILD_REQUESTED_KEY))
+
+    def blacklist(self, token):
+        with self.captureOnCommitCallbacks(execute=True):
+            token.blacklist()
+
+    def test_filter_miss_skips_the_db(self):
+        rebuild_filter()
+        with self.assertNumQueries(0):
+            self.assertFalse(is_blacklisted("unknown"))
+
+    def test_new_blacklist_entries_are_found_without_rewriting_filter(self):
+        rebuild_filter()
+        filter_blob = cache.get(token_blacklist.FILTER_KEY)
+
+        token = RefreshToken.for_user(self.user)
+        self.blacklist(token)
+
+        self.assertEqual(cache.get(token_blacklist.FILTER_KEY), filter_blob)
+        with self.assertNumQueries(0):
+            self.assertTrue(is_blacklisted(token["jti"]))
+
+    def test_filter_hit_is_confirmed_by_db(self):
+        token = RefreshToken.for_user(self.user)
+        self.blacklist(token)
+        cache.delete(token_blacklist._recent_key(token["jti"]))
+        rebuild_filter()
+        self.refresh_filter()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(is_blacklisted(token["jti"]))
+
+    def test_stale_filter_misses_go_to_the_db(self):
+        rebuild_filter()
+        self.refresh_filter()
+        is_blacklisted("unknown")
+
+        # Blacklisted after the build, with its recent key evicted
+        token = RefreshToken.for_user(self.user)
+        self.blacklist(token)
+        cache.delete(token_blacklist._recent_key(token["jti"]))
+
+        with self.assertNumQueries(1):
+            self.assertTrue(is_blacklisted(token["jti"]))
+        with self.assertNumQueries(1):
+            self.assertFalse(is_blacklisted("unknown"))
+
+        cache.delete(REBUILD_REQUESTED_KEY)
+        rebuild_filter()
+        self.refresh_filter()
+        with self.assertNumQueries(0):
+            self.assertFalse(is_blacklisted("unknown"))
+
+    def test_evicted_version_is_never_current(self):
+        rebuild_filter()
+        cache.delete(token_blacklist.VERSION_KEY)
+
+        with self.assertNumQueries(1):
+            self.assertFalse(is_blacklisted("unknown"))
+
+
+class CachedUserTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader",
+                                             email="reader@example.com",
+                                             password="pass12345")
+        self.auth = CachedJWTAuthentication()
+
+    def authenticate(self, token):
+        return self.auth.get_user(self.auth.get_validated_token(str(token)))
+
+    def test_cache_holds_auth_fields_only(self):
+        token = AccessToken.for_user(self.user)
+        self.authenticate(token)
+
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.email, "reader@example.com")
+        self.assertTrue(user.is_authenticated)
+
+        entry = cache.get(f"auth:user:{self.user.pk}:")
+        self.assertNotIn("password", entry)
+        self.assertNotIn(self.user.password, str(entry))
+
+    def test_saving_the_user_drops_the_entry(self):
+        token = AccessToken.for_user(self.user)
+        self.authenticate(token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    # override_settings(SIMPLE_JWT=...) rebinds simplejwt's api_settings,
+    # which the importing modules never see
+    @mock.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True)
+    def test_password_change_revokes_cached_tokens(self):
+        old_token = AccessToken.for_user(self.user)
+        self.authenticate(old_token)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password("changed123")
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(old_token)
+
+        new_token = AccessToken.for_user(user)
+        self.authenticate(new_token)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate(new_token).pk, user.pk)
+
+
+class SlidingWindowLimiterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.limiter = SlidingWindowLimiter("test", 3, 60)
+
+    def test_enforces_limit_within_window(self):
+        now = 6000.0
+        self.assertEqual([self.limiter.hit("a", now) for _ in range(4)],
+                         [True, True, True, False])
+        self.assertTrue(self.limiter.hit("b", now))  # Separate ident
+
+    def test_rejected_hits_are_not_counted(self):
+        now = 6000.0
+        for _ in range(10):
+            self.limiter.hit("a", now)
+        # Half into the next window the 3 allowed hits weigh 1.5. Had the
+        # 7 rejected ones counted too, this would weigh 5 and be refused.
+        self.assertTrue(self.limiter.hit("a", now + 90))
+        self.assertFalse(self.limiter.hit("a", now + 90))
+
+    def test_previous_window_slides_out(self):
+        now = 6000.0
+        for _ in range(3):
+            self.limiter.hit("a", now)
+        self.assertFalse(self.limiter.peek("a", now + 30))
+        self.assertTrue(self.limiter.peek("a", now + 61))
+        self.assertEqual(self.limiter.retry_after(now + 15), 45)
+
+    def test_reset(self):
+        now = 6000.0
+        for _ in range(3):
+            self.limiter.hit("a", now)
+        self.limiter.reset("a", now)
+        self.assertTrue(self.limiter.peek("a", now))
+
+
+class OTPRateLimitTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader",
+                                             email="reader@example.com",
+                                             password="pass12345")
+
+    def test_send_is_counted_before_commit(self):
+        # Counted in the same cache operation as the check, so a concurrent
+        # request is refused while the first is still in its transaction
+        with self.captureOnCommitCallbacks():
+            self.assertTrue(create_otp_request(self.user)[0])
+            self.assertFalse(otp_cooldown.peek(self.user.pk))
+            self.assertEqual(
+                create_otp_request(self.user),
+                (False, "Please wait before requesting another OTP."))
+
+    def test_daily_limit(self):
+        for _ in range(otp_daily_limit.limit):
+            self.assertTrue(create_otp_request(self.user)[0])
+            otp_cooldown.reset(self.user.pk)
+
+        self.assertEqual(
+            create_otp_request(self.user),
+            (False, "OTP request limit reached. Try again later."))
+        self.assertTrue(otp_cooldown.peek(self.user.pk))
+
+    def test_failed_send_is_given_back(self):
+        with mock.patch.object(OTPRequest.objects, "create",
+                               side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                create_otp_request(self.user)
+
+        self.assertTrue(otp_cooldown.peek(self.user.pk))
+        self.assertTrue(create_otp_request(self.user)[0])
+        self.assertEqual(
+            cache.get(otp_daily_limit._key(self.user.pk,
+                                           int(time.time() //
+                                               otp_daily_limit.window))), 1)
+
+
+class OTPHashTests(TestCase):
+
+    def test_round_trip(self):
+        encoded = hash_otp("123456")
+        self.assertTrue(encoded.startswith("hmac-sha256$"))
+        self.assertTrue(check_otp("123456", encoded))
+        self.assertFalse(check_otp("123457", encoded))
+        self.assertFalse(check_otp(None, encoded))
+        self.assertFalse(check_otp("123456", ""))
+
+    def test_salted_per_row(self):
+        self.assertNotEqual(hash_otp("123456"), hash_otp("123456"))
+
+    def test_depends_on_server_key(self):
+        with override_settings(OTP_HMAC_KEY="first"):
+            encoded = hash_otp("123456")
+        with override_settings(OTP_HMAC_KEY="second"):
+            self.assertFalse(check_otp("123456", encoded))
+
+    def test_password_hasher_rows_still_verify(self):
+        encoded = make_password("123456")
+        self.assertTrue(check_otp("123456", encoded))
+        self.assertFalse(check_otp("654321", encoded))
+
+    def test_validate_otp_rejects_wrong_codes_and_replays(self):
+        user = User.objects.create_user(username="reader",
+                                        email="reader@example.com",
+                                        password="pass12345")
+        OTPRequest.objects.create(user=user, otp_hash=hash_otp("123456"))
+
+        self.assertFalse(validate_otp(user, "000000")[0])
+        self.assertTrue(validate_otp(user, "123456")[0])
+        self.assertFalse(validate_otp(user, "123456")[0])
+
+
+def image_bytes(size, fmt="PNG", **save_kwargs):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, fmt, **save_kwargs)
+    return buffer.getvalue()
+
+
+class ImageDerivativeTests(TestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_sources_with_different_extensions_dont_collide(self):
+        self.assertEqual(derivative_name("blog_images/cat.png", 640, "webp"),
+                         "blog_images/derived/cat-png-640.webp")
+        self.assertNotEqual(
+            derivative_name("blog_images/cat.png", 640, "jpeg"),
+            derivative_name("blog_images/cat.jpg", 640, "jpeg"))
+
+    def test_exif_orientation_is_applied_before_resizing(self):
+        from PIL import Image
+
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        path = os.path.join(self.media_root, "photo.jpg")
+        with open(path, "wb") as f:
+            f.write(image_bytes((800, 400), "JPEG", exif=exif))
+
+        variants = generate_derivatives(path, (320, 640), ("jpeg", ), 80)
+
+        self.assertEqual(variants, {"jpeg": [320]})
+        with Image.open(derivative_name(path, 320, "jpeg")) as derived:
+            self.assertEqual(derived.size, (320, 640))
+
+    def test_variants_are_stored_and_srcset_skips_storage(self):
+        user = User.objects.create_user(username="pictured",
+                                        email="pictured@example.com",
+                                        password="pass12345")
+        profile = user.profile
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.avatar.save("cat.png",
+                                ContentFile(image_bytes((700, 350))))
+
+        profile.refresh_from_db()
+        name = profile.avatar.name
+        self.assertEqual(profile.avatar_variants, {
+            "source": name,
+            "formats": {
+                "webp": [320, 640],
+                "jpeg": [320, 640]
+            }
+        })
+
+        with mock.patch("django.core.files.storage.FileSystemStorage.exists"
+                        ) as exists:
+            urls = srcset(profile.avatar, profile.avatar_variants)
+        exists.assert_not_called()
+        self.assertEqual(sorted(urls["webp"]), [320, 640])
+        self.assertTrue(urls["jpeg"][640].endswith(
+            derivative_name(os.path.basename(name), 640, "jpeg")))
+
+        # Variants of a previous image are never served for a new one
+        self.assertEqual(srcset("profile_avatars/other.png",
+                                profile.avatar_variants), {})
+
+
+class RoleCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer",
+                                             email="writer@example.com",
+                                             password="pass12345")
+        self.author = Group.objects.get_or_create(name="Author")[0]
+
+    def change(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            action()
+
+    def test_roles_are_cached(self):
+        self.change(lambda: self.user.groups.add(self.author))
+        self.assertEqual(get_user_roles(self.user), {"Author"})
+        with self.assertNumQueries(0):
+            self.assertTrue(has_role(self.user, "Author"))
+
+    def test_membership_changes_invalidate(self):
+        other = User.objects.create_user(username="other",
+                                         email="other@example.com",
+                                         password="pass12345")
+        get_user_roles(self.user)
+        get_user_roles(other)
+
+        self.change(lambda: self.user.groups.add(self.author))
+        self.assertEqual(get_user_roles(self.user), {"Author"})
+
+        self.change(lambda: self.author.user_set.add(other))
+        self.assertEqual(get_user_roles(other), {"Author"})
+
+        self.change(self.author.user_set.clear)
+        self.assertEqual(get_user_roles(self.user), set())
+        self.assertEqual(get_user_roles(other), set())
+
+    def test_forward_clear_invalidates_after_the_rows_are_gone(self):
+        self.change(lambda: self.user.groups.add(self.author))
+        get_user_roles(self.user)
+
+        # Scheduled from post_clear, once the rows are deleted
+        memberships_when_scheduled = []
+        on_commit = transaction.on_commit
+
+        def spy(func):
+            memberships_when_scheduled.append(self.user.groups.exists())
+            on_commit(func)
+
+        with mock.patch("users.models.transaction.on_commit", spy):
+            self.change(self.user.groups.clear)
+
+        self.assertEqual(memberships_when_scheduled, [False])
+        self.assertEqual(get_user_roles(self.user), set())
+
+    def test_group_rename_invalidates_everyone(self):
+        self.change(lambda: self.user.groups.add(self.author))
+        get_user_roles(self.user)
+
+        self.author.name = "Editor"
+        self.change(self.author.save)
+        self.assertEqual(get_user_roles(self.user), {"Editor"})
+
+    @mock.patch.object(roles, "ROLES_IN_TOKEN", True)
+    def test_token_claim_is_used_and_refresh_skips_the_user(self):
+        self.change(lambda: self.user.groups.add(self.author))
+        refresh = roles.add_roles_claim(RefreshToken.for_user(self.user),
+                                        self.user.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            success, data, _ = refresh_tokens(str(refresh))
+        self.assertTrue(success)
+        self.assertFalse(
+            [q["sql"] for q in queries if '"users_user"' in q["sql"]])
+
+        access = AccessToken(data["access_token"])
+        self.assertEqual(access["roles"], ["Author"])
+        with self.assertNumQueries(0):
+            self.assertTrue(has_role(self.user, "Author", access))
+            self.assertFalse(has_role(self.user, "Admin", access))
+
+
+class OTPPurgeTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader",
+                                             email="reader@example.com",
+                                             password="pass12345")
+
+    def otp(self, expired_ago, is_used=False):
+        return OTPRequest.objects.create(
+            user=self.user,
+            otp_hash=hash_otp("123456"),
+            expiration_time=timezone.now() - expired_ago,
+            is_used=is_used).pk
+
+    def otps(self):
+        return set(OTPRequest.objects.values_list("pk", flat=True))
+
+    def test_purges_past_the_window_in_batches(self):
+        past = timedelta(hours=25)
+        purged = {
+            self.otp(past),
+            self.otp(past, is_used=True),
+            self.otp(past * 2, is_used=True),
+        }
+        kept = {
+            self.otp(timedelta(minutes=-5)),  # Live
+            self.otp(timedelta(minutes=-5), is_used=True),
+            # Expired, but still inside the 24h rate-limit window
+            self.otp(timedelta(hours=1)),
+        }
+
+        with mock.patch("users.utils.otp.time.sleep") as sleep:
+            deleted, _ = purge_expired_otps(batch_size=2, pause=0.5)
+
+        self.assertEqual(deleted, len(purged))
+        self.assertEqual(self.otps(), kept)
+        sleep.assert_called_once_with(0.5)
+
+    def test_command_reports_rows_removed(self):
+        self.otp(timedelta(days=2))
+        live = self.otp(timedelta(minutes=-5))
+        out = StringIO()
+
+        call_command("purge_otps", pause=0, stdout=out)
+
+        self.assertIn("Purged 1 OTP requests", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+        self.assertEqual(self.otps(), {live})
@@ -0,0 +1,46 @@
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from users.utils.ratelimit import SlidingWindowLimiter
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    DRF throttle backed by the cache-based sliding window limiter.
+    Keys on the user id when authenticated, else the client IP.
+    """
+    scope = None
+
+    def __init__(self):
+        # Read per request so override_settings applies
+        limit, window = settings.RATE_LIMITS[self.scope]
+        self.limiter = SlidingWindowLimiter(self.scope, limit, window)
+        self.ident = None
+
+    def get_cache_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        self.ident = self.get_cache_ident(request)
+        return self.limiter.hit(self.ident)
+
+    def wait(self):
+        return self.limiter.retry_after()
+
+
+class LoginThrottle(SlidingWindowThrottle):
+    scope = "login"
+
+
+class OTPVerifyThrottle(SlidingWindowThrottle):
+    scope = "otp-verify"
+
+
+class ResendOTPThrottle(SlidingWindowThrottle):
+    scope = "otp-resend"
+
+
+class CommentThrottle(SlidingWindowThrottle):
+    scope = "comment"
@@ -0,0 +1,22 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from users.utils.token_blacklist import is_blacklisted, record_blacklisted
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Refresh token whose blacklist checks go through the in-memory filter
+    in users/utils/token_blacklist.py before touching the database.
+    """
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        record_blacklisted(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     UserRegisterView,
@@ -7,8 +8,12 @@ from .views import (
     TokenRefreshView,
     LogoutView,
     ResendOTPView,
+    async_profile,
 )
 
+profile_view = (async_profile
+                if settings.ASYNC_READ_VIEWS else UserProfileView.as_view())
+
 urlpatterns = [
     # User registration
     path('register', UserRegisterView.as_view(), name='user-register'),
@@ -23,7 +28,7 @@ urlpatterns = [
     path('resend-otp', ResendOTPView.as_view(), name='resend-otp'),
 
     # User profile (GET and PUT)
-    path('profile', UserProfileView.as_view(), name='user-profile'),
+    path('profile', profile_view, name='user-profile'),
 
     # Refresh access token
     path('token/refresh', TokenRefreshView.as_view(), name='token-refresh'),
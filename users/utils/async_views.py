@@ -0,0 +1,85 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+
+from ByteBlogger.renderers import json_dumps
+from users.authentication import CachedJWTAuthentication
+
+READ_METHODS = ("GET", "HEAD")
+
+
+# RESPONSES
+def json_response(data, status=status.HTTP_200_OK):
+    """
+    JSON rendered the way the DRF views render it.
+    """
+    return HttpResponse(json_dumps(data),
+                        status=status,
+                        content_type="application/json")
+
+
+def not_found():
+    return json_response({"detail": exceptions.NotFound.default_detail},
+                         status=status.HTTP_404_NOT_FOUND)
+
+
+def _unauthorized(authenticator, request, detail):
+    data = detail if isinstance(detail, dict) else {"detail": detail}
+    response = json_response(data, status=status.HTTP_401_UNAUTHORIZED)
+    response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+    return response
+
+
+# AUTHENTICATION
+def async_authenticated(required=False):
+    """
+    Decorator for plain async views: resolves the JWT and sets request.user
+    and request.auth. Bad tokens get DRF's 401 body and header; so do
+    anonymous requests when required is set.
+    """
+
+    def decorator(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            authenticator = CachedJWTAuthentication()
+            try:
+                result = await authenticator.aauthenticate(request)
+            except exceptions.AuthenticationFailed as exc:
+                return _unauthorized(authenticator, request, exc.detail)
+
+            if result is None:
+                if required:
+                    return _unauthorized(
+                        authenticator, request,
+                        exceptions.NotAuthenticated.default_detail)
+                result = AnonymousUser(), None
+
+            request.user, request.auth = result
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# DISPATCH
+def async_read_view(async_get, sync_view):
+    """
+    Serves GET/HEAD from an async view and hands every other method to the
+    sync DRF view in a thread, so writes keep their serializers, throttles
+    and permissions.
+    """
+    sync_view = sync_to_async(sync_view)
+
+    @csrf_exempt  # JWT only, like APIView.as_view()
+    async def view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await async_get(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    return view
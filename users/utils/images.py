@@ -0,0 +1,156 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_WIDTHS = getattr(settings, "IMAGE_DERIVATIVE_WIDTHS",
+                            (320, 640, 1280))
+DERIVATIVE_FORMATS = getattr(settings, "IMAGE_DERIVATIVE_FORMATS",
+                             ("webp", "jpeg"))
+DERIVATIVE_QUALITY = getattr(settings, "IMAGE_DERIVATIVE_QUALITY", 80)
+
+# 0 runs the resize inline (tests, dev); otherwise size of the process pool
+IMAGE_WORKERS = getattr(settings, "IMAGE_WORKERS", 2)
+
+FORMAT_EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+_executor = None
+
+
+# NAMING
+def derivative_name(name, width, fmt):
+    """
+    blog_images/cat.png -> blog_images/derived/cat-png-640.webp
+
+    The source extension is kept so cat.png and cat.jpg don't share
+    derivatives. Works on storage names and filesystem paths alike.
+    """
+    folder, filename = os.path.split(name)
+    stem, ext = os.path.splitext(filename)
+    parts = [stem, ext.lstrip("."), str(width)]
+    return os.path.join(folder, "derived",
+                        "-".join(filter(None, parts)) + "." +
+                        FORMAT_EXTENSIONS[fmt])
+
+
+def srcset(image, variants):
+    """
+    Returns {format: {width: url}} for the derivatives recorded in variants
+    by schedule_derivatives. image is an ImageField value or its stored
+    name; variants recorded for another image are ignored. Builds URLs
+    only, without asking storage what exists.
+    """
+    name = getattr(image, "name", image)
+    if not name or not variants or variants.get("source") != name:
+        return {}
+
+    return {
+        fmt: {
+            width: default_storage.url(derivative_name(name, width, fmt))
+            for width in widths
+        }
+        for fmt, widths in variants["formats"].items() if widths
+    }
+
+
+# RESIZING (runs in worker processes)
+def generate_derivatives(path, widths, formats, quality):
+    """
+    Writes resized copies of the image at path, skipping existing files and
+    widths at or above the original, and returns {format: [widths]} of the
+    derivatives now on disk. Only touches Pillow and the filesystem, so it
+    is safe to run outside Django.
+    """
+    from PIL import Image, ImageOps
+
+    os.makedirs(os.path.join(os.path.dirname(path), "derived"),
+                exist_ok=True)
+
+    variants = {fmt: [] for fmt in formats}
+    with Image.open(path) as source:
+        # Apply the EXIF orientation so phone photos aren't stored sideways
+        original = ImageOps.exif_transpose(source)
+        for width in widths:
+            if width >= original.width:
+                continue
+
+            targets = {}
+            for fmt in formats:
+                target = derivative_name(path, width, fmt)
+                variants[fmt].append(width)
+                if not os.path.exists(target):
+                    targets[fmt] = target
+            if not targets:
+                continue
+
+            height = round(original.height * width / original.width)
+            resized = original.resize((width, height), Image.LANCZOS)
+
+            for fmt, target in targets.items():
+                image = resized
+                if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+                    image = image.convert("RGB")
+                image.save(target, fmt.upper(), quality=quality, optimize=True)
+
+    return variants
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return _executor
+
+
+def _finish(name, formats, on_done):
+    if on_done is not None:
+        on_done({"source": name, "formats": formats})
+
+
+def _submit(name, path, on_done):
+    if not os.path.exists(path):
+        return
+
+    args = (path, DERIVATIVE_WIDTHS, DERIVATIVE_FORMATS, DERIVATIVE_QUALITY)
+
+    if IMAGE_WORKERS <= 0:
+        try:
+            _finish(name, generate_derivatives(*args), on_done)
+        except Exception:
+            logger.exception("Image derivative generation failed.")
+        return
+
+    def callback(future):
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Image derivative generation failed: %s", exc)
+            return
+        _finish(name, future.result(), on_done)
+
+    _get_executor().submit(generate_derivatives, *args).add_done_callback(
+        callback)
+
+
+def schedule_derivatives(image, on_done=None):
+    """
+    Queues derivative generation for an uploaded image once the current
+    transaction commits, off the request thread. on_done runs in this
+    process afterwards with the variants to store next to the image, as
+    {"source": name, "formats": {format: [widths]}}; srcset reads them.
+    """
+    if not image:
+        return
+
+    try:
+        path = image.path
+    except NotImplementedError:
+        # Remote storage: no local path to resize from
+        return
+
+    name = image.name
+    transaction.on_commit(lambda: _submit(name, path, on_done))
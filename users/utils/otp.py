@@ -1,5 +1,6 @@
 import secrets
 import logging
+import time
 from datetime import timedelta
 
 from django.conf import settings
@@ -7,42 +8,53 @@ from django.core.mail import send_mail
 from django.utils import timezone
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
-from django.contrib.auth.hashers import make_password, check_password
 from django.db import transaction
 
+from jobs.queue import task
 from users.models import OTPRequest
+from users.utils.ratelimit import Cooldown, SlidingWindowLimiter
+from users.utils.otp_hash import hash_otp, check_otp
 
 logger = logging.getLogger(__name__)
 
 OTP_LIMIT = getattr(settings, "OTP_MAX_REQUESTS", 4)
 OTP_EXPIRY_MINUTES = getattr(settings, "OTP_EXPIRY_MINUTES", 5)
 OTP_COOLDOWN_SECONDS = 60
+OTP_PURGE_BATCH_SIZE = getattr(settings, "OTP_PURGE_BATCH_SIZE", 1000)
+OTP_PURGE_PAUSE_SECONDS = getattr(settings, "OTP_PURGE_PAUSE_SECONDS", 0.1)
+
+otp_cooldown = Cooldown("otp", OTP_COOLDOWN_SECONDS)
+otp_daily_limit = SlidingWindowLimiter("otp-daily", OTP_LIMIT, 24 * 60 * 60)
 
 
 # RATE LIMITING
 def can_send_otp(user):
     """
     Enforce strict per-user OTP limits.
+    Counts live in the cache, so no OTPRequest queries are needed.
+    Checking and counting are one atomic cache operation each (add for the
+    cooldown, incr for the daily limit), so concurrent requests cannot
+    both pass. An allowed call has used up its send.
     """
-    now = timezone.now()
-    last_24_hours = now - timedelta(hours=24)
-    cooldown_window = now - timedelta(seconds=OTP_COOLDOWN_SECONDS)
-
-    request_count = OTPRequest.objects.filter(
-        user=user, created_at__gte=last_24_hours).count()
-
-    cooldown_active = OTPRequest.objects.filter(
-        user=user, created_at__gte=cooldown_window).exists()
-
-    if cooldown_active:
+    if not otp_cooldown.hit(user.pk):
         return False, "Please wait before requesting another OTP."
 
-    if request_count >= OTP_LIMIT:
+    if not otp_daily_limit.hit(user.pk):
+        # Keep the limit message for the next attempt
+        otp_cooldown.reset(user.pk)
         return False, "OTP request limit reached. Try again later."
 
     return True, None
 
 
+def release_otp_send(user_id):
+    """
+    Gives back a send counted by can_send_otp that was never made.
+    """
+    otp_cooldown.reset(user_id)
+    otp_daily_limit.release(user_id)
+
+
 # OTP GENERATION
 def generate_otp():
     """
@@ -75,6 +87,32 @@ def send_otp_email(email, otp):
         return False
 
 
+# Placeholder hash until the delivery job sets the real one; never matches
+UNDELIVERED_OTP_HASH = "!"
+
+
+# OTP DELIVERY (background job)
+@task
+def deliver_otp(otp_request_id):
+    """
+    Generates the code and emails it, off the request path.
+    The raw OTP only exists here, so it is never stored in the job table.
+    Raises on send failure so the queue retries with backoff.
+    """
+    otp_request = OTPRequest.objects.select_related("user").filter(
+        pk=otp_request_id).first()
+
+    if not otp_request or otp_request.is_used or otp_request.is_expired():
+        return
+
+    raw_otp = generate_otp()
+    OTPRequest.objects.filter(pk=otp_request.pk).update(
+        otp_hash=hash_otp(raw_otp))
+
+    if not send_otp_email(otp_request.user.email, raw_otp):
+        raise RuntimeError("Failed to send OTP email.")
+
+
 # CREATE OTP REQUEST
 @transaction.atomic
 def create_otp_request(user):
@@ -83,31 +121,31 @@ def create_otp_request(user):
     - Enforces single active OTP
     - Enforces rate limit
     - Stores only hashed OTP
+    - Email is sent by a background job after commit
     """
 
     allowed, message = can_send_otp(user)
     if not allowed:
         return False, message
 
-    # Invalidate previous unused OTPs
-    OTPRequest.objects.filter(
-        user=user, is_used=False,
-        expiration_time__gte=timezone.now()).update(is_used=True)
-
-    raw_otp = generate_otp()
-    hashed_otp = make_password(raw_otp)
+    try:
+        # Invalidate previous unused OTPs
+        OTPRequest.objects.filter(
+            user=user, is_used=False,
+            expiration_time__gte=timezone.now()).update(is_used=True)
 
-    otp_request = OTPRequest.objects.create(
-        user=user,
-        otp_hash=hashed_otp,
-        expiration_time=timezone.now() + timedelta(minutes=OTP_EXPIRY_MINUTES))
+        otp_request = OTPRequest.objects.create(
+            user=user,
+            otp_hash=UNDELIVERED_OTP_HASH,
+            expiration_time=timezone.now() +
+            timedelta(minutes=OTP_EXPIRY_MINUTES))
 
-    if send_otp_email(user.email, raw_otp):
-        return True, "OTP sent successfully."
+        deliver_otp.enqueue(otp_request_id=otp_request.pk)
+    except Exception:
+        release_otp_send(user.pk)
+        raise
 
-    # Rollback on email failure
-    otp_request.delete()
-    return False, "Failed to send OTP."
+    return True, "OTP sent successfully."
 
 
 # VALIDATE OTP
@@ -130,10 +168,52 @@ def validate_otp(user, otp_input):
         otp_request.save(update_fields=["is_used"])
         return False, "Invalid or expired OTP."
 
-    if not check_password(otp_input, otp_request.otp_hash):
+    if not check_otp(otp_input, otp_request.otp_hash):
         return False, "Invalid or expired OTP."
 
     # Mark as used to prevent replay
     otp_request.mark_used()
 
     return True, "OTP verified successfully."
+
+
+# PURGE EXPIRED OTPS
+@task
+def purge_expired_otps(batch_size=OTP_PURGE_BATCH_SIZE,
+                       pause=OTP_PURGE_PAUSE_SECONDS,
+                       repeat_every=None):
+    """
+    Deletes OTP rows past expiry plus the 24h rate-limit window.
+    - Walks the expiration_time index in bounded batches
+    - Sleeps between batches so locks are never held for long
+    - Re-enqueues itself when repeat_every (seconds) is set
+    Returns (rows deleted, seconds elapsed).
+    """
+    cutoff = timezone.now() - timedelta(hours=24)
+    started = time.monotonic()
+    deleted = 0
+
+    while True:
+        batch = list(
+            OTPRequest.objects.filter(expiration_time__lt=cutoff).order_by(
+                "expiration_time").values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            break
+
+        deleted += OTPRequest.objects.filter(pk__in=batch).delete()[0]
+
+        if len(batch) < batch_size:
+            break
+        time.sleep(pause)
+
+    elapsed = time.monotonic() - started
+    logger.info("Purged %s expired OTP requests in %.1fs.", deleted, elapsed)
+
+    if repeat_every:
+        purge_expired_otps.enqueue(
+            run_at=timezone.now() + timedelta(seconds=repeat_every),
+            batch_size=batch_size,
+            pause=pause,
+            repeat_every=repeat_every)
+
+    return deleted, elapsed
@@ -0,0 +1,49 @@
+import hashlib
+import hmac
+import secrets
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.utils.crypto import constant_time_compare
+
+OTP_HASH_ALGORITHM = "hmac-sha256"
+
+
+def _otp_key():
+    """
+    Server secret for OTP hashing, derived from SECRET_KEY unless set.
+    """
+    secret = getattr(settings, "OTP_HMAC_KEY", None) or settings.SECRET_KEY
+    return hashlib.sha256(f"users.otp:{secret}".encode()).digest()
+
+
+def _digest(salt, raw_otp):
+    return hmac.new(_otp_key(), f"{salt}${raw_otp}".encode(),
+                    hashlib.sha256).hexdigest()
+
+
+def hash_otp(raw_otp):
+    """
+    Keyed HMAC-SHA256 with a per-row salt: "hmac-sha256$<salt>$<digest>".
+    A 6-digit code that lives for minutes cannot be brute-forced offline
+    without the server key, so a slow password hasher buys nothing.
+    """
+    salt = secrets.token_hex(8)
+    return f"{OTP_HASH_ALGORITHM}${salt}${_digest(salt, raw_otp)}"
+
+
+def check_otp(raw_otp, encoded):
+    """
+    Constant-time check of a raw OTP against a stored hash.
+    Rows written by Django's password hashers before the switch still
+    verify; they expire within minutes, so no rewrite is needed.
+    """
+    if raw_otp is None or not encoded:
+        return False
+
+    algorithm, _, rest = encoded.partition("$")
+    if algorithm != OTP_HASH_ALGORITHM:
+        return check_password(raw_otp, encoded)
+
+    salt, _, digest = rest.partition("$")
+    return constant_time_compare(digest, _digest(salt, str(raw_otp)))
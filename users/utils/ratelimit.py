@@ -0,0 +1,108 @@
+import time
+
+from django.core.cache import cache
+
+
+class SlidingWindowLimiter:
+    """
+    Approximate sliding-window counter stored in Django's cache.
+    Keeps one atomic counter per fixed window and weights the previous
+    window by how much of it still overlaps the sliding window, so limits
+    are enforced without touching the database.
+    """
+
+    def __init__(self, scope, limit, window):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+
+    def _key(self, ident, index):
+        return f"ratelimit:{self.scope}:{ident}:{index}"
+
+    def _counts(self, ident, now):
+        index = int(now // self.window)
+        current_key = self._key(ident, index)
+        counts = cache.get_many([current_key, self._key(ident, index - 1)])
+        return index, current_key, counts.get(current_key, 0), counts.get(
+            self._key(ident, index - 1), 0)
+
+    def _estimate(self, now, current, previous):
+        elapsed = (now % self.window) / self.window
+        return previous * (1 - elapsed) + current
+
+    def peek(self, ident, now=None):
+        """
+        Returns True if a hit would currently be allowed, without recording.
+        """
+        now = time.time() if now is None else now
+        _, _, current, previous = self._counts(ident, now)
+        return self._estimate(now, current, previous) < self.limit
+
+    def hit(self, ident, now=None):
+        """
+        Records a hit if it fits the limit. Returns True if allowed.
+        Rejected hits are rolled back so they do not extend the penalty.
+        """
+        now = time.time() if now is None else now
+        index, current_key, _, previous = self._counts(ident, now)
+
+        # Two windows of TTL so the previous window is still readable
+        cache.add(current_key, 0, timeout=self.window * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Evicted between add and incr
+            cache.set(current_key, 1, timeout=self.window * 2)
+            current = 1
+
+        if self._estimate(now, current, previous) > self.limit:
+            cache.decr(current_key)
+            return False
+        return True
+
+    def release(self, ident, now=None):
+        """
+        Takes back a hit recorded in the current window.
+        """
+        now = time.time() if now is None else now
+        try:
+            cache.decr(self._key(ident, int(now // self.window)))
+        except ValueError:
+            pass  # Expired or evicted: nothing to give back
+
+    def retry_after(self, now=None):
+        """
+        Seconds until the oldest weight in the window has slid out.
+        """
+        now = time.time() if now is None else now
+        return self.window - (now % self.window)
+
+    def reset(self, ident, now=None):
+        now = time.time() if now is None else now
+        index = int(now // self.window)
+        cache.delete_many(
+            [self._key(ident, index),
+             self._key(ident, index - 1)])
+
+
+class Cooldown:
+    """
+    Allows one hit per period. cache.add is atomic, so exactly one of
+    several concurrent callers wins.
+    """
+
+    def __init__(self, scope, seconds):
+        self.scope = scope
+        self.seconds = seconds
+
+    def _key(self, ident):
+        return f"cooldown:{self.scope}:{ident}"
+
+    def peek(self, ident):
+        return cache.get(self._key(ident)) is None
+
+    def hit(self, ident):
+        return cache.add(self._key(ident), 1, timeout=self.seconds)
+
+    def reset(self, ident):
+        cache.delete(self._key(ident))
@@ -0,0 +1,86 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+
+ROLES_CACHE_TIMEOUT = getattr(settings, "ROLES_CACHE_TIMEOUT", 60 * 60)
+ROLES_CLAIM = "roles"
+ROLES_IN_TOKEN = getattr(settings, "JWT_ROLES_CLAIM", False)
+
+ROLES_VERSION_KEY = "user:roles:version"
+
+
+# CACHE KEYS
+def _roles_version():
+    """
+    Global version, rotated when any group is renamed or deleted.
+    """
+    version = cache.get(ROLES_VERSION_KEY)
+    if version is None:
+        cache.add(ROLES_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(ROLES_VERSION_KEY)
+    return version
+
+
+def _roles_key(user_id):
+    return f"user:roles:{_roles_version()}:{user_id}"
+
+
+# ROLE LOOKUP
+def get_user_roles(user):
+    """
+    Returns the set of group names for a user, cached per user.
+    """
+    return get_roles_by_id(user.pk)
+
+
+def get_roles_by_id(user_id):
+    """
+    get_user_roles for callers holding only the id, e.g. from a token.
+    """
+    key = _roles_key(user_id)
+    roles = cache.get(key)
+    if roles is None:
+        roles = frozenset(
+            Group.objects.filter(user=user_id).values_list("name",
+                                                           flat=True))
+        cache.set(key, roles, ROLES_CACHE_TIMEOUT)
+    return roles
+
+
+def has_role(user, role, token=None):
+    """
+    Checks group membership without hitting the database on the hot path.
+    - Uses the token's roles claim when embedded (see JWT_ROLES_CLAIM)
+    - Falls back to the per-user role cache
+    """
+    if not user or not user.is_authenticated:
+        return False
+
+    if token is not None and ROLES_IN_TOKEN:
+        claim = token.get(ROLES_CLAIM)
+        if claim is not None:
+            return role in claim
+
+    return role in get_user_roles(user)
+
+
+def add_roles_claim(token, user_id):
+    """
+    Embeds the user's roles in a token when JWT_ROLES_CLAIM is enabled.
+    Claims are stamped again on every refresh, from the role cache, so they
+    lag group changes by at most one access token lifetime.
+    """
+    if ROLES_IN_TOKEN:
+        token[ROLES_CLAIM] = sorted(get_roles_by_id(user_id))
+    return token
+
+
+# INVALIDATION
+def invalidate_user_roles(*user_ids):
+    cache.delete_many([_roles_key(user_id) for user_id in user_ids])
+
+
+def invalidate_all_roles():
+    cache.set(ROLES_VERSION_KEY, uuid.uuid4().hex, timeout=None)
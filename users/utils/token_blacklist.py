@@ -0,0 +1,242 @@
+import hashlib
+import logging
+import math
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (BlacklistedToken,
+                                                             OutstandingToken)
+
+from jobs.queue import task
+
+logger = logging.getLogger(__name__)
+
+# Negative lookups skip the DB only when every process shares the cache
+FAST_NEGATIVES = getattr(settings, "TOKEN_BLACKLIST_FAST_NEGATIVES", False)
+BLOOM_CAPACITY = getattr(settings, "TOKEN_BLACKLIST_BLOOM_CAPACITY", 100_000)
+BLOOM_ERROR_RATE = getattr(settings, "TOKEN_BLACKLIST_BLOOM_ERROR_RATE", 0.01)
+
+TOKEN_PURGE_BATCH_SIZE = getattr(settings, "TOKEN_PURGE_BATCH_SIZE", 1000)
+TOKEN_PURGE_PAUSE_SECONDS = getattr(settings, "TOKEN_PURGE_PAUSE_SECONDS",
+                                    0.1)
+
+FILTER_REFRESH_SECONDS = getattr(settings,
+                                 "TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS", 30)
+LOCK_TIMEOUT_SECONDS = 300
+
+FILTER_KEY = "jwt:blacklist:filter"
+LOCK_KEY = "jwt:blacklist:lock"
+REBUILD_REQUESTED_KEY = "jwt:blacklist:rebuild-requested"
+RECENT_KEY_PREFIX = "jwt:blacklist:recent:"
+VERSION_KEY = "jwt:blacklist:version"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter: no false negatives, error_rate false positives
+    at capacity. Positions come from double hashing one SHA-256 digest.
+    """
+
+    def __init__(self, capacity, error_rate, bits=None):
+        self.size = math.ceil(-capacity * math.log(error_rate) /
+                              math.log(2)**2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray(
+            (self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in self._positions(item))
+
+
+# SHARED FILTER
+# rebuild_filter (a background job) stores the filter built from the
+# database, tagged with the blacklist version it was built at. Every
+# blacklisting moves the version, so a filter miss only proves a token is
+# clean while the version still matches; otherwise the lookup goes to the
+# DB until the next build. A missing (evicted) version never matches.
+# Each process keeps its own copy and refetches the blob at most once per
+# FILTER_REFRESH_SECONDS. JTIs blacklisted after a build are also recorded
+# as small per-JTI cache keys, so they are rejected without a query.
+_local = {"generation": None, "filter": None, "version": None,
+          "checked": None}
+
+
+def _recent_key(jti):
+    return f"{RECENT_KEY_PREFIX}{jti}"
+
+
+def _recent_timeout():
+    # A blacklisted token is rejected as expired once its lifetime is over
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def _local_filter():
+    """
+    This process's copy of the shared filter, or None if none is stored.
+    """
+    now = time.monotonic()
+    if (_local["checked"] is not None
+            and now - _local["checked"] < FILTER_REFRESH_SECONDS):
+        return _local["filter"]
+    _local["checked"] = now
+
+    blob = cache.get(FILTER_KEY)
+    if blob is None:
+        _local.update(generation=None, filter=None, version=None)
+        _request_rebuild()
+    elif blob[0] != _local["generation"]:
+        generation, bits, version = blob
+        _local.update(generation=generation,
+                      filter=BloomFilter(BLOOM_CAPACITY, BLOOM_ERROR_RATE,
+                                         bytearray(bits)),
+                      version=version)
+    return _local["filter"]
+
+
+def _bump_version():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def _request_rebuild():
+    # One process per refresh interval enqueues the rebuild
+    if cache.add(REBUILD_REQUESTED_KEY, 1, timeout=FILTER_REFRESH_SECONDS):
+        rebuild_blacklist_filter.enqueue()
+
+
+def _acquire_lock():
+    return cache.add(LOCK_KEY, 1, timeout=LOCK_TIMEOUT_SECONDS)
+
+
+def _release_lock():
+    cache.delete(LOCK_KEY)
+
+
+def rebuild_filter():
+    """
+    Rebuilds the shared filter from live blacklisted tokens in the
+    database. Runs in workers and commands, never in a request. The
+    version is read before the query: a JTI blacklisted during the build
+    moves it, so the new filter is not trusted for negatives.
+    """
+    if not _acquire_lock():
+        return False  # Another process is rebuilding
+    try:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+        bloom = BloomFilter(BLOOM_CAPACITY, BLOOM_ERROR_RATE)
+        jtis = BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()).values_list("token__jti",
+                                                              flat=True)
+        for jti in jtis.iterator(chunk_size=5000):
+            bloom.add(jti)
+        cache.set(FILTER_KEY, (uuid.uuid4().hex, bytes(bloom.bits), version),
+                  timeout=None)
+        return True
+    finally:
+        _release_lock()
+
+
+@task
+def rebuild_blacklist_filter():
+    rebuild_filter()
+
+
+# LOOKUPS
+def is_blacklisted(jti):
+    """
+    A filter miss proves the token is not blacklisted while the filter is
+    current (its version matches the shared one), so most refreshes cost a
+    cache read instead of the blacklist query. Filter hits, and lookups
+    while no current filter is stored, go to the DB.
+    """
+    if FAST_NEGATIVES:
+        bloom = _local_filter()
+        recent_key = _recent_key(jti)
+        found = cache.get_many([recent_key, VERSION_KEY])
+        if found.get(recent_key):
+            return True
+        version = found.get(VERSION_KEY)
+        if bloom is not None:
+            if version is None or version != _local["version"]:
+                _request_rebuild()
+            elif jti not in bloom:
+                return False
+
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def record_blacklisted(jti):
+    """
+    Marks a newly blacklisted JTI once it has committed, and moves the
+    version so filters built before it stop answering negatives.
+    """
+    if FAST_NEGATIVES:
+
+        def record():
+            cache.set(_recent_key(jti), 1, timeout=_recent_timeout())
+            _bump_version()
+            _request_rebuild()
+
+        transaction.on_commit(record)
+
+
+# PURGE EXPIRED TOKENS
+@task
+def purge_expired_tokens(batch_size=TOKEN_PURGE_BATCH_SIZE,
+                         pause=TOKEN_PURGE_PAUSE_SECONDS,
+                         repeat_every=None):
+    """
+    Deletes expired outstanding tokens (and their blacklist rows, by
+    cascade) in bounded batches, then rebuilds the filter.
+    Re-enqueues itself when repeat_every (seconds) is set.
+    Returns (outstanding tokens deleted, seconds elapsed).
+    """
+    now = timezone.now()
+    started = time.monotonic()
+    deleted = 0
+
+    while True:
+        batch = list(
+            OutstandingToken.objects.filter(expires_at__lt=now).order_by(
+                "expires_at").values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            break
+
+        BlacklistedToken.objects.filter(token_id__in=batch).delete()
+        deleted += OutstandingToken.objects.filter(pk__in=batch).delete()[0]
+
+        if len(batch) < batch_size:
+            break
+        time.sleep(pause)
+
+    if FAST_NEGATIVES:
+        rebuild_filter()
+
+    elapsed = time.monotonic() - started
+    logger.info("Purged %s expired tokens in %.1fs.", deleted, elapsed)
+
+    if repeat_every:
+        purge_expired_tokens.enqueue(
+            run_at=timezone.now() + timedelta(seconds=repeat_every),
+            batch_size=batch_size,
+            pause=pause,
+            repeat_every=repeat_every)
+
+    return deleted, elapsed
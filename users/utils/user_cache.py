@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from ByteBlogger.replicas import PRIMARY
+
+USER_CACHE_TIMEOUT = getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60)
+
+# What authentication, permissions and the views read from request.user.
+# Everything else, the password hash included, is left out of the cache
+# and loads from the primary on first access like any deferred field.
+CACHED_FIELDS = ("id", "username", "email", "first_name", "last_name",
+                 "is_active", "is_staff", "is_superuser", "is_verified")
+
+
+# CACHE KEYS
+def token_version(validated_token):
+    """
+    Password version carried by the token: the revoke claim when
+    CHECK_REVOKE_TOKEN is on, else "". Tokens issued before a password
+    change therefore never match an entry cached after it.
+    """
+    if not api_settings.CHECK_REVOKE_TOKEN:
+        return ""
+    return validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) or ""
+
+
+def password_version(password):
+    """
+    The token_version of tokens valid for this password hash.
+    """
+    if not api_settings.CHECK_REVOKE_TOKEN:
+        return ""
+    return get_md5_hash_password(password)
+
+
+def _user_key(user_id, version):
+    return f"auth:user:{user_id}:{version}"
+
+
+# CACHE ACCESS
+def _rebuild_user(values, version):
+    User = get_user_model()
+    names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    user = User.from_db(PRIMARY, names, [values[name] for name in names])
+    user._password_version = version
+    return user
+
+
+def get_cached_user(user_id, version=""):
+    """
+    Rebuilds the user from the cached fields, or returns None.
+    """
+    values = cache.get(_user_key(user_id, version))
+    return None if values is None else _rebuild_user(values, version)
+
+
+async def aget_cached_user(user_id, version=""):
+    values = await cache.aget(_user_key(user_id, version))
+    return None if values is None else _rebuild_user(values, version)
+
+
+def _cached_fields(user):
+    return {name: getattr(user, name) for name in CACHED_FIELDS}
+
+
+def set_cached_user(user, version=""):
+    cache.set(_user_key(user.pk, version), _cached_fields(user),
+              USER_CACHE_TIMEOUT)
+
+
+async def aset_cached_user(user, version=""):
+    await cache.aset(_user_key(user.pk, version), _cached_fields(user),
+                     USER_CACHE_TIMEOUT)
+
+
+def invalidate_cached_user(user_id, *versions):
+    """
+    Drops the entries for the given password versions (current and, after
+    a change, previous), or the unversioned entry.
+    """
+    cache.delete_many([_user_key(user_id, v) for v in versions or ("", )])
@@ -1,6 +1,6 @@
 from .auth_views import UserRegisterView, UserLoginView
 from .otp_views import OTPVerifyView, ResendOTPView
-from .profile_views import UserProfileView
+from .profile_views import UserProfileView, async_profile
 from .token_views import TokenRefreshView, LogoutView
 
 __all__ = [
@@ -9,6 +9,7 @@ __all__ = [
     "OTPVerifyView",
     "ResendOTPView",
     "UserProfileView",
+    "async_profile",
     "TokenRefreshView",
     "LogoutView",
 ]
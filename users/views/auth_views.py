@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
 from users.services.auth_service import register_user, login_user
+from users.throttles import LoginThrottle
 
 
 class UserRegisterView(APIView):
@@ -15,6 +16,7 @@ class UserRegisterView(APIView):
 
 class UserLoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginThrottle]
 
     def post(self, request):
         success, response, status_code = login_user(
@@ -3,10 +3,12 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
 from users.services.otp_service import verify_otp, resend_otp
+from users.throttles import OTPVerifyThrottle, ResendOTPThrottle
 
 
 class OTPVerifyView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [OTPVerifyThrottle]
 
     def post(self, request):
         success, response, status_code = verify_otp(
@@ -18,6 +20,7 @@ class OTPVerifyView(APIView):
 
 class ResendOTPView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [ResendOTPThrottle]
 
     def post(self, request):
         success, response, status_code = resend_otp(
@@ -1,9 +1,13 @@
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from users.models import UserProfile
 from users.services.profile_service import get_profile, update_profile
 from users.serializers import UserProfileSerializer
+from users.utils.async_views import (async_authenticated, async_read_view,
+                                     json_response, not_found)
 
 
 class UserProfileView(APIView):
@@ -22,4 +26,24 @@ class UserProfileView(APIView):
             request.data,
             UserProfileSerializer
         )
-        return Response(response, status=status_code)
\ No newline at end of file
+        return Response(response, status=status_code)
+
+
+@async_authenticated(required=True)
+async def profile_get(request):
+    try:
+        profile = await UserProfile.objects.aget(user=request.user)
+    except UserProfile.DoesNotExist:
+        return not_found()
+    # Off the event loop: the avatar URLs come from storage, which may
+    # block on remote backends
+    data = await sync_to_async(profile_data)(profile)
+    return json_response(data)
+
+
+def profile_data(profile):
+    return UserProfileSerializer(profile).data
+
+
+# Served instead of UserProfileView when ASYNC_READ_VIEWS is on
+async_profile = async_read_view(profile_get, UserProfileView.as_view())